@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Пакет модулей программы "Бухгалтерия"
+"""
+
+from application.log import is_quiet, set_console_output, set_quiet
+
+__all__ = ['is_quiet', 'set_console_output', 'set_quiet']
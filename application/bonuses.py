@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Политики премий: процент по умолчанию, по должностям и по сотрудникам
+
+Процент сотрудника берется из персональной таблицы, иначе - из таблицы
+должностей (без учета регистра), иначе - процент по умолчанию. При
+создании политика компилируется: проценты приводятся к целым числителям с
+общим знаменателем, таблица должностей - к словарю ключ должности ->
+числитель. Для пакета сотрудников числители выбираются через map по
+словарям, премии считаются в целых копейках; количество правил на
+скорость расчета не влияет.
+"""
+
+import math
+from array import array
+from itertools import repeat
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+from application.db.records import MAX_BONUS_PERCENT, position_key
+from application.money import Amount, apply_ratio, apply_ratio_array, rate_ratio
+
+# Процент премии по умолчанию
+DEFAULT_BONUS_PERCENT = 10
+
+
+def _percent_ratio(percent: Amount) -> Tuple[int, int]:
+    """Процент в виде доли (числитель, знаменатель)"""
+    if isinstance(percent, bool):
+        raise TypeError("Процент премии должен быть числом")
+    numerator, denominator = rate_ratio(percent)
+    if numerator < 0:
+        raise ValueError("Процент премии должен быть неотрицательным")
+    if numerator > MAX_BONUS_PERCENT * denominator:
+        raise ValueError(f"Процент премии не должен превышать {MAX_BONUS_PERCENT}")
+    return numerator, denominator * 100
+
+
+class BonusPolicy:
+    """
+    Скомпилированная политика премий
+
+    Проценты - от 0 до MAX_BONUS_PERCENT: с ними выплата любого
+    допустимого оклада (см. MAX_SALARY) помещается в копейки.
+
+    Args:
+        default_percent: Процент премии по умолчанию
+        positions: Должность -> процент премии
+        employees: ID сотрудника -> процент премии (важнее должности)
+
+    Пример:
+        BonusPolicy(10, positions={'Программист': 15}, employees={2: 20})
+    """
+
+    __slots__ = ('default_percent', 'positions', 'employees', '_percents', '_denominator', '_default',
+                 '_by_position', '_by_employee')
+
+    def __init__(self, default_percent: Amount = DEFAULT_BONUS_PERCENT,
+                 positions: Optional[Mapping[str, Amount]] = None,
+                 employees: Optional[Mapping[int, Amount]] = None):
+        self.default_percent = default_percent
+        self.positions = dict(positions or {})
+        self.employees = dict(employees or {})
+
+        # Ключ должности -> процент
+        self._percents: Dict[str, Amount] = {}
+        for position, percent in self.positions.items():
+            key = position_key(position)
+            if self._percents.get(key, percent) != percent:
+                raise ValueError(f"Для должности '{position}' заданы разные проценты премии")
+            self._percents[key] = percent
+
+        ratios = {
+            percent: _percent_ratio(percent)
+            for percent in (default_percent, *self.positions.values(), *self.employees.values())
+        }
+        # Проценты приводятся к общему знаменателю: премия считается в целых числах
+        denominator = math.lcm(*(ratio_denominator for _, ratio_denominator in ratios.values()))
+        numerators = {
+            percent: numerator * (denominator // ratio_denominator)
+            for percent, (numerator, ratio_denominator) in ratios.items()
+        }
+
+        self._denominator = denominator
+        self._default = numerators[default_percent]
+        self._by_position: Dict[str, int] = {
+            key: numerators[percent] for key, percent in self._percents.items()
+        }
+        self._by_employee: Dict[int, int] = {
+            employee_id: numerators[percent] for employee_id, percent in self.employees.items()
+        }
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}({self.default_percent!r}, positions={self.positions!r}, "
+                f"employees={self.employees!r})")
+
+    @property
+    def uses_positions(self) -> bool:
+        """Зависит ли премия от должности"""
+        return bool(self._by_position)
+
+    @property
+    def uses_employees(self) -> bool:
+        """Есть ли персональные проценты"""
+        return bool(self._by_employee)
+
+    def percent(self, employee_id: Optional[int] = None, position: Optional[str] = None) -> Amount:
+        """Процент премии сотрудника"""
+        if employee_id in self.employees:
+            return self.employees[employee_id]
+        if position is not None:
+            return self._percents.get(position_key(position), self.default_percent)
+        return self.default_percent
+
+    def bonus(self, base: int, employee_id: Optional[int] = None, position: Optional[str] = None) -> int:
+        """Премия в копейках с неотрицательного оклада в копейках (половина копейки - вверх)"""
+        numerator = self._by_employee.get(employee_id)
+        if numerator is None:
+            numerator = self._default if position is None else self._by_position.get(
+                position_key(position), self._default
+            )
+        return apply_ratio(base, numerator, self._denominator)
+
+    def numerators(self, ids: Optional[Sequence[int]] = None,
+                   positions: Optional[Sequence[str]] = None) -> Optional[array]:
+        """
+        Числители процентов для пакета сотрудников, array('q')
+
+        Колонки, от которых политика не зависит, можно не передавать.
+        Для политики с единым процентом возвращает None.
+        """
+        if not self._by_position and not self._by_employee:
+            return None
+        if self._by_employee and ids is None:
+            raise ValueError("В политике премий есть персональные проценты: нужна колонка ID")
+
+        if self._by_position:
+            if positions is None:
+                raise ValueError("Политика премий зависит от должности: нужна колонка должностей")
+            values = map(self._by_position.get, map(position_key, positions), repeat(self._default))
+        else:
+            values = repeat(self._default, len(ids))
+
+        if self._by_employee:
+            values = map(self._by_employee.get, ids, values)
+        return array('q', values)
+
+    def bonus_array(self, base: Sequence[int], numerators: Optional[Sequence[int]] = None) -> array:
+        """
+        Премии в копейках для пакета неотрицательных окладов в копейках
+
+        Args:
+            base: Оклады в копейках
+            numerators: Результат numerators() для тех же сотрудников
+        """
+        return apply_ratio_array(base, self._default if numerators is None else numerators, self._denominator)
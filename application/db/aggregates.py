@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Итоги по выплатам, которые обновляются при каждом изменении сотрудников
+
+Количество сотрудников, суммы окладов, премий и выплат (оклад + премия),
+средняя выплата и подытоги по должностям читаются без обхода хранилища.
+Премии считаются по политике премий так же, как в calculate_salary: для
+каждого сотрудника с округлением до копейки. Суммы хранятся в целых
+копейках, поэтому многократные прибавления и вычитания дают тот же
+результат, что и пересчет с нуля.
+"""
+
+from itertools import groupby
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from application.bonuses import DEFAULT_BONUS_PERCENT, BonusPolicy
+from application.db.records import position_key
+from application.money import KOPECKS_PER_RUBLE, to_kopecks, to_kopecks_array, to_rubles
+
+# Подытоги пакета по должностям: (должность, количество, оклады, премии в копейках)
+TotalsDelta = List[Tuple[str, int, int, int]]
+
+
+def _summary(count: int, base: int, bonus: int) -> Dict:
+    """Итоги группы сотрудников по суммам в копейках"""
+    total = base + bonus
+    return {
+        'total_base_salary': to_rubles(base),
+        'total_bonus': to_rubles(bonus),
+        'total_salary': to_rubles(total),
+        'average_salary': total / (KOPECKS_PER_RUBLE * count) if count else 0
+    }
+
+
+class SalaryTotals:
+    """
+    Суммы окладов, премий и выплат по всем сотрудникам и по должностям
+
+    Args:
+        policy: Политика премий (по умолчанию DEFAULT_BONUS_PERCENT для всех)
+    """
+
+    def __init__(self, policy: Optional[BonusPolicy] = None):
+        self.policy = BonusPolicy(DEFAULT_BONUS_PERCENT) if policy is None else policy
+        self.reset()
+
+    def reset(self) -> None:
+        """Обнулить итоги (пустая база)"""
+        self._count = 0
+        self._base = 0
+        self._bonus = 0
+        # Ключ должности -> [название, количество, сумма окладов, сумма премий (в копейках)]
+        self._positions: Dict[str, List] = {}
+
+    def rebuild(self, ids: Sequence[int], positions: Sequence[str], salaries: Sequence[float],
+                policy: Optional[BonusPolicy] = None) -> None:
+        """Пересчитать итоги по колонкам сотрудников (policy - заменить политику премий)"""
+        if policy is not None:
+            self.policy = policy
+        self.reset()
+        self.add_many(ids, positions, salaries)
+
+    def add(self, employee_id: int, position: str, salary: float) -> None:
+        """Учесть нового сотрудника"""
+        base = to_kopecks(salary)
+        self._apply(position, 1, base, self.policy.bonus(base, employee_id, position))
+
+    def remove(self, employee_id: int, position: str, salary: float) -> None:
+        """Исключить сотрудника"""
+        base = to_kopecks(salary)
+        self._apply(position, -1, -base, -self.policy.bonus(base, employee_id, position))
+
+    def add_many(self, ids: Sequence[int], positions: Sequence[str], salaries: Sequence[float]) -> None:
+        """Учесть пакет новых сотрудников по колонкам"""
+        self.apply(self.delta(ids, positions, salaries))
+
+    def remove_many(self, ids: Sequence[int], positions: Sequence[str], salaries: Sequence[float]) -> None:
+        """Исключить пакет сотрудников по колонкам"""
+        self.apply(self.delta(ids, positions, salaries), -1)
+
+    def _apply(self, position: str, count: int, base: int, bonus: int) -> None:
+        """Прибавить к итогам должности и общим итогам (count < 0 - вычесть)"""
+        key = position_key(position)
+        group = self._positions.get(key)
+        if group is None:
+            group = self._positions[key] = [position, 0, 0, 0]
+        group[1] += count
+        group[2] += base
+        group[3] += bonus
+        if not group[1]:
+            del self._positions[key]
+        self._count += count
+        self._base += base
+        self._bonus += bonus
+
+    def delta(self, ids: Sequence[int], positions: Sequence[str], salaries: Sequence[float]) -> TotalsDelta:
+        """
+        Подытоги пакета сотрудников по должностям, без изменения итогов
+
+        Все ошибки расчета (оклад или премия не помещаются в array('q')
+        копеек) возникают здесь, поэтому изменение можно проверить до записи
+        в хранилище, а apply() уже не завершится ошибкой.
+        """
+        if not len(salaries):
+            return []
+        base = to_kopecks_array(salaries)
+        bonuses = self.policy.bonus_array(base, self.policy.numerators(ids, positions))
+
+        # Сотрудники группируются по должности сортировкой позиций (устойчивой,
+        # поэтому первой в группе остается первая встреченная запись должности)
+        keys = list(map(position_key, positions))
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        delta = []
+        for key, group in groupby(order, keys.__getitem__):
+            members = list(group)
+            delta.append((positions[members[0]], len(members), sum(map(base.__getitem__, members)),
+                          sum(map(bonuses.__getitem__, members))))
+        return delta
+
+    def apply(self, delta: TotalsDelta, sign: int = 1) -> None:
+        """Прибавить (sign=1) или вычесть (sign=-1) подытоги, полученные из delta()"""
+        for position, count, base, bonus in delta:
+            self._apply(position, sign * count, sign * base, sign * bonus)
+
+    def as_dict(self) -> Dict:
+        """Итоги в виде словаря"""
+        positions = {
+            position: {'employees': count, **_summary(count, base, bonus)}
+            for position, count, base, bonus in self._positions.values()
+        }
+        return {'total_employees': self._count, **_summary(self._count, self._base, self._bonus),
+                'by_position': positions}
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Колоночное хранилище сотрудников на типизированных массивах
+
+Каждое поле хранится в отдельном массиве array, строки (имена и должности)
+интернируются в общую таблицу строк, дата приема хранится порядковым номером
+дня. Словари записей создаются только по запросу вызывающего кода.
+"""
+
+from array import array
+from bisect import bisect_left, insort
+from copy import copy
+from datetime import date
+from itertools import compress, repeat
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from application.db.records import position_key
+from application.db.store import EmployeeStore
+
+
+# Атрибуты-колонки; строки в них выровнены по номеру
+_COLUMNS = ('_ids', '_names', '_positions', '_position_keys', '_salaries', '_hire_days')
+
+
+class ColumnarEmployeeStore(EmployeeStore):
+    """
+    Хранилище сотрудников в колонках array
+
+    Занимает десятки байт на сотрудника вместо сотен у словаря. ID хранятся
+    в возрастающем порядке, поэтому поиск по ID - двоичный поиск без
+    отдельного индекса. Индекс код должности -> упорядоченный массив ID
+    позволяет выбирать сотрудников по должности за время, пропорциональное
+    размеру результата. Удаление помечает строку удаленной; массивы
+    уплотняются, когда удаленных строк становится больше половины.
+    Чтение не изменяет массивы и пропускает удаленные строки, поэтому
+    несколько потоков могут читать одновременно.
+
+    У строк таблицы есть счетчики ссылок. Строки, на которые больше не
+    ссылается ни одна запись, освобождаются при уплотнении; оно выполняется
+    и тогда, когда таких строк становится больше половины таблицы, поэтому
+    переименования не накапливают мертвые строки.
+
+    snapshot() создается за O(1) и разделяет массивы с хранилищем; первая
+    запись после снимка копирует массивы (copy-on-write). Таблица строк
+    хранилищем только пополняется, а при уплотнении создается заново,
+    поэтому остается общей со снимком. Индекс по должностям снимок строит
+    заново при первом поиске по должности.
+    """
+
+    def __init__(self, rows: Iterable[Dict] = (), next_id: int = 1):
+        self._reset_columns()
+        self._next_id = next_id
+        self.load(rows, next_id)
+
+    def _reset_columns(self) -> None:
+        """Создать пустые колонки и таблицу строк"""
+        self._ids = array('q')
+        self._names = array('i')
+        self._positions = array('i')
+        self._position_keys = array('i')
+        self._salaries = array('d')
+        self._hire_days = array('i')
+        self._alive = bytearray()
+        self._dead = 0
+        self._strings: List[str] = []
+        self._string_codes: Dict[str, int] = {}
+        # Количество ссылок из колонок на каждую строку таблицы
+        self._string_refs = array('q')
+        self._free_strings = 0
+        # Код ключа должности -> возрастающие ID (None - индекс еще не построен)
+        self._position_ids: Optional[Dict[int, array]] = {}
+        # True, если массивы разделены со снимком и их нельзя менять
+        self._shared = False
+        # True у снимка: таблицу строк пополняет хранилище, с которого он снят
+        self._strings_shared = False
+
+    def _own(self) -> None:
+        """Перед изменением отделить массивы от снимков (copy-on-write)"""
+        if self._shared:
+            for attr in _COLUMNS:
+                setattr(self, attr, getattr(self, attr)[:])
+            self._alive = bytearray(self._alive)
+            self._string_refs = self._string_refs[:]
+            self._shared = False
+        if self._strings_shared:
+            # Снимок меняют: забираем себе копию таблицы. Строки, добавленные
+            # хранилищем после снимка, в колонках снимка не используются
+            self._strings = self._strings[:]
+            self._string_codes = dict(self._string_codes)
+            missing = len(self._strings) - len(self._string_refs)
+            self._string_refs.extend(repeat(0, missing))
+            self._free_strings += missing
+            self._strings_shared = False
+
+    def _intern(self, value: str) -> int:
+        """Код строки в таблице строк; у строки становится на одну ссылку больше"""
+        code = self._string_codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._strings.append(value)
+            self._string_codes[value] = code
+            self._string_refs.append(1)
+            return code
+        if not self._string_refs[code]:
+            self._free_strings -= 1
+        self._string_refs[code] += 1
+        return code
+
+    def _release(self, code: int) -> None:
+        """Убрать ссылку на строку таблицы"""
+        self._string_refs[code] -= 1
+        if not self._string_refs[code]:
+            self._free_strings += 1
+
+    def _index(self) -> Dict[int, array]:
+        """Индекс по должностям; у снимка строится при первом обращении"""
+        if self._position_ids is None:
+            index: Dict[int, array] = {}
+            for employee_id, key, alive in zip(self._ids, self._position_keys, self._alive):
+                if alive:
+                    index.setdefault(key, array('q')).append(employee_id)
+            self._position_ids = index
+        return self._position_ids
+
+    def _index_position(self, key: int, employee_id: int) -> None:
+        """Добавить ID в индекс должности (массив остается упорядоченным)"""
+        ids = self._index().get(key)
+        if ids is None:
+            self._position_ids[key] = array('q', (employee_id,))
+        elif not ids or ids[-1] < employee_id:
+            ids.append(employee_id)
+        else:
+            insort(ids, employee_id)
+
+    def _unindex_position(self, key: int, employee_id: int) -> None:
+        """Убрать ID из индекса должности"""
+        index = self._index()
+        ids = index[key]
+        del ids[bisect_left(ids, employee_id)]
+        if not ids:
+            del index[key]
+
+    def _slot(self, employee_id: int) -> Optional[int]:
+        """Номер строки сотрудника в колонках или None"""
+        i = bisect_left(self._ids, employee_id)
+        if i < len(self._ids) and self._ids[i] == employee_id and self._alive[i]:
+            return i
+        return None
+
+    def _materialize(self, i: int) -> Dict:
+        """Собрать словарь записи из колонок"""
+        return {
+            'id': self._ids[i],
+            'name': self._strings[self._names[i]],
+            'position': self._strings[self._positions[i]],
+            'salary': self._salaries[i],
+            'hire_date': date.fromordinal(self._hire_days[i]).isoformat()
+        }
+
+    def _compact(self) -> None:
+        """Физически убрать удаленные строки и освободить строки таблицы без ссылок"""
+        if self._dead:
+            alive = self._alive
+            for attr in _COLUMNS:
+                column = getattr(self, attr)
+                setattr(self, attr, array(column.typecode, compress(column, alive)))
+            self._alive = bytearray(b'\x01' * len(self._ids))
+            self._dead = 0
+
+        if self._free_strings:
+            # Новая таблица из строк со ссылками; коды в колонках перекодируются
+            refs = self._string_refs
+            strings = list(compress(self._strings, refs))
+            codes = array('i', repeat(-1, len(refs)))
+            for new_code, old_code in enumerate(compress(range(len(refs)), refs)):
+                codes[old_code] = new_code
+            for attr in ('_names', '_positions', '_position_keys'):
+                setattr(self, attr, array('i', map(codes.__getitem__, getattr(self, attr))))
+            if self._position_ids is not None:
+                self._position_ids = {codes[key]: ids for key, ids in self._position_ids.items()}
+            self._strings = strings
+            self._string_codes = {value: code for code, value in enumerate(strings)}
+            self._string_refs = array('q', compress(refs, refs))
+            self._free_strings = 0
+            self._strings_shared = False
+
+    def _maybe_compact(self) -> None:
+        """Уплотнить, если удаленные строки или строки таблицы без ссылок составляют больше половины"""
+        if self._dead * 2 > len(self._ids) or self._free_strings * 2 > len(self._strings):
+            self._compact()
+
+    def __len__(self) -> int:
+        return len(self._ids) - self._dead
+
+    def get(self, employee_id: int) -> Optional[Dict]:
+        i = self._slot(employee_id)
+        return self._materialize(i) if i is not None else None
+
+    def all(self) -> List[Dict]:
+        alive = self._alive
+        return [self._materialize(i) for i in range(len(self._ids)) if alive[i]]
+
+    def by_position(self, position: str) -> List[Dict]:
+        code = self._string_codes.get(position_key(position))
+        ids = self._index().get(code, ())
+        return [self._materialize(bisect_left(self._ids, employee_id)) for employee_id in ids]
+
+    def _columns_slice(self, fields: Sequence[str], start: int, stop: int) -> Dict[str, Sequence]:
+        """Колонки полей для живых строк из диапазона [start, stop)"""
+        alive = self._alive[start:stop] if self._dead else None
+
+        def live(column: array) -> array:
+            part = column[start:stop]
+            return part if alive is None else array(part.typecode, compress(part, alive))
+
+        strings = self._strings
+        result = {}
+        for field in fields:
+            if field == 'id':
+                result[field] = live(self._ids)
+            elif field == 'salary':
+                result[field] = live(self._salaries)
+            elif field == 'name':
+                result[field] = [strings[code] for code in live(self._names)]
+            elif field == 'position':
+                result[field] = [strings[code] for code in live(self._positions)]
+            elif field == 'hire_date':
+                result[field] = [date.fromordinal(day).isoformat() for day in live(self._hire_days)]
+            else:
+                raise KeyError(field)
+        return result
+
+    def columns(self, *fields: str) -> Dict[str, Sequence]:
+        return self._columns_slice(fields, 0, len(self._ids))
+
+    def snapshot(self) -> 'ColumnarEmployeeStore':
+        self._shared = True
+        snapshot = copy(self)
+        # Индекс хранилище меняет на месте, поэтому снимок построит свой
+        snapshot._position_ids = None
+        snapshot._strings_shared = True
+        return snapshot
+
+    def column_chunks(self, fields: Sequence[str], chunk_size: int) -> Iterator[Dict[str, Sequence]]:
+        start = 0
+        while start < len(self._ids):
+            stop = start + chunk_size
+            # Порции из одних удаленных строк пропускаем
+            if not self._dead or 1 in self._alive[start:stop]:
+                yield self._columns_slice(fields, start, stop)
+            start = stop
+
+    def _append(self, employee_id: int, name: str, position: str, salary: float, hire_date: str) -> None:
+        """Дописать строку в конец колонок"""
+        self._own()
+        key = self._intern(position_key(position))
+        self._ids.append(employee_id)
+        self._names.append(self._intern(name))
+        self._positions.append(self._intern(position))
+        self._position_keys.append(key)
+        self._salaries.append(salary)
+        self._hire_days.append(date.fromisoformat(hire_date).toordinal())
+        self._alive.append(1)
+        self._index_position(key, employee_id)
+
+    def next_id(self) -> int:
+        return self._next_id
+
+    def insert(self, name: str, position: str, salary: float, hire_date: str) -> Dict:
+        employee_id = self._next_id
+        self._append(employee_id, name, position, salary, hire_date)
+        self._next_id += 1
+        return self._materialize(len(self._ids) - 1)
+
+    def insert_many(self, rows: Sequence[Tuple[str, str, float]], hire_date: str) -> range:
+        self._own()
+        ids = range(self._next_id, self._next_id + len(rows))
+        intern = self._intern
+        hire_day = date.fromisoformat(hire_date).toordinal()
+
+        # Сначала готовим новые колонки целиком, затем дописываем их разом
+        names = array('i', [intern(name) for name, _, _ in rows])
+        positions = array('i', [intern(position) for _, position, _ in rows])
+        position_keys = array('i', [intern(position_key(position)) for _, position, _ in rows])
+        salaries = array('d', [salary for _, _, salary in rows])
+
+        self._ids.extend(array('q', ids))
+        self._names.extend(names)
+        self._positions.extend(positions)
+        self._position_keys.extend(position_keys)
+        self._salaries.extend(salaries)
+        self._hire_days.extend(array('i', [hire_day]) * len(rows))
+        self._alive.extend(b'\x01' * len(rows))
+        # Новые ID больше всех прежних, поэтому массивы индекса остаются упорядоченными
+        index = self._index()
+        for employee_id, key in zip(ids, position_keys):
+            index.setdefault(key, array('q')).append(employee_id)
+        self._next_id = ids.stop
+        return ids
+
+    def _update_slot(self, i: int, fields: Dict) -> None:
+        """Записать поля в строку i"""
+        self._own()
+        if 'name' in fields:
+            self._release(self._names[i])
+            self._names[i] = self._intern(fields['name'])
+        if 'position' in fields:
+            key = self._intern(position_key(fields['position']))
+            self._release(self._positions[i])
+            self._release(self._position_keys[i])
+            if key != self._position_keys[i]:
+                self._unindex_position(self._position_keys[i], self._ids[i])
+                self._index_position(key, self._ids[i])
+            self._positions[i] = self._intern(fields['position'])
+            self._position_keys[i] = key
+        if 'salary' in fields:
+            self._salaries[i] = fields['salary']
+
+    def _delete_slot(self, i: int) -> None:
+        """Пометить строку i удаленной и освободить ее строки"""
+        self._alive[i] = 0
+        self._dead += 1
+        self._release(self._names[i])
+        self._release(self._positions[i])
+        self._release(self._position_keys[i])
+        self._unindex_position(self._position_keys[i], self._ids[i])
+
+    def update(self, employee_id: int, fields: Dict) -> Optional[Dict]:
+        i = self._slot(employee_id)
+        if i is None:
+            return None
+
+        self._update_slot(i, fields)
+        employee = self._materialize(i)
+        self._maybe_compact()
+        return employee
+
+    def update_many(self, updates: Dict[int, Dict]) -> List[int]:
+        updated_ids = []
+        for employee_id, fields in updates.items():
+            i = self._slot(employee_id)
+            if i is not None:
+                self._update_slot(i, fields)
+                updated_ids.append(employee_id)
+
+        # Уплотняем один раз на весь пакет: номера строк до конца обхода не меняются
+        self._maybe_compact()
+        return updated_ids
+
+    def delete(self, employee_id: int) -> Optional[Dict]:
+        i = self._slot(employee_id)
+        if i is None:
+            return None
+
+        employee = self._materialize(i)
+        self._own()
+        self._delete_slot(i)
+        self._maybe_compact()
+        return employee
+
+    def delete_many(self, employee_ids: Iterable[int]) -> List[int]:
+        self._own()
+        removed_ids = []
+        for employee_id in employee_ids:
+            i = self._slot(employee_id)
+            if i is not None:
+                self._delete_slot(i)
+                removed_ids.append(employee_id)
+
+        # Уплотняем массивы один раз на весь пакет
+        self._maybe_compact()
+        return removed_ids
+
+    def clear(self) -> None:
+        self._reset_columns()
+        self._next_id = 1
+
+    def load(self, rows: Iterable[Dict], next_id: int) -> None:
+        self._reset_columns()
+        for row in sorted(rows, key=lambda row: row['id']):
+            self._append(row['id'], row['name'], row['position'], row['salary'], row['hire_date'])
+        # ID должны возрастать, чтобы работал двоичный поиск
+        last_id = self._ids[-1] if self._ids else 0
+        self._next_id = max(next_id, last_id + 1)
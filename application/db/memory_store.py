@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Хранилище сотрудников в памяти (словари записей по страницам)
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Mapping as MappingABC
+from copy import copy
+from itertools import chain, islice
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from application.db.records import position_key
+from application.db.store import EmployeeStore, EmployeesView
+
+# Наибольшее количество записей на странице
+PAGE_SIZE = 1024
+
+
+class _PagedRows(MappingABC):
+    """
+    Словарь id -> запись только для чтения поверх страниц хранилища
+
+    Args:
+        pages: Страницы - словари id -> запись с возрастающими ID
+        starts: Наименьший ID, который может лежать на каждой странице
+        count: Количество записей на всех страницах
+    """
+
+    __slots__ = ('_pages', '_starts', '_count')
+
+    def __init__(self, pages: List[Dict[int, Mapping]], starts: List[int], count: int):
+        self._pages = pages
+        self._starts = starts
+        self._count = count
+
+    def get(self, employee_id, default=None):
+        i = bisect_right(self._starts, employee_id) - 1
+        return self._pages[i].get(employee_id, default) if i >= 0 else default
+
+    def __getitem__(self, employee_id) -> Mapping:
+        row = self.get(employee_id)
+        if row is None:
+            raise KeyError(employee_id)
+        return row
+
+    def __iter__(self) -> Iterator[int]:
+        return chain.from_iterable(self._pages)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def values(self) -> Iterator[Mapping]:
+        return chain.from_iterable(map(dict.values, self._pages))
+
+
+class MemoryEmployeeStore(EmployeeStore):
+    """
+    Хранилище по умолчанию: страницы словарей id -> запись
+
+    Записи лежат на страницах не больше PAGE_SIZE штук в порядке
+    возрастания ID, и этот порядок совпадает с порядком добавления.
+    Страница записи находится двоичным поиском по первым ID страниц, дальше
+    поиск, изменение и удаление выполняются в словаре страницы. Индекс
+    должность -> ID позволяет выбирать сотрудников по должности за время,
+    пропорциональное размеру результата.
+
+    Записи хранятся как MappingProxyType над словарями, которые после
+    публикации не изменяются: обновление заменяет запись новой. Снимки
+    (view() и snapshot()) создаются за O(1) и разделяют страницы с
+    хранилищем. Первая запись после снимка копирует список страниц
+    (n / PAGE_SIZE ссылок), а каждая страница копируется при первом
+    изменении в ней, поэтому запись после снимка стоит O(n / PAGE_SIZE +
+    PAGE_SIZE), а не O(n). Страницы старой версии освобождаются, когда на
+    снимок не остается ссылок. Индекс по должностям хранилище меняет на
+    месте, поэтому снимок строит свой при первом поиске по должности.
+    """
+
+    def __init__(self, rows: Iterable[Dict] = (), next_id: int = 1):
+        self._pages: List[Dict[int, Mapping]] = []
+        # Наименьший ID каждой страницы
+        self._starts: List[int] = []
+        # 1 - страница создана или скопирована после последнего снимка и ее можно менять
+        self._owned = bytearray()
+        self._count = 0
+        # Индекс должность (без учета регистра) -> возрастающий список ID
+        self._position_index: Optional[Dict[str, List[int]]] = {}
+        self._next_id = next_id
+        # True, если список страниц разделен со снимком и его нельзя менять
+        self._shared = False
+        self.load(rows, next_id)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _own(self) -> None:
+        """Перед изменением отделить список страниц от снимков (copy-on-write)"""
+        if self._shared:
+            self._pages = self._pages[:]
+            self._starts = self._starts[:]
+            self._owned = bytearray(len(self._pages))
+            self._shared = False
+
+    def _page(self, i: int) -> Dict[int, Mapping]:
+        """Страница i, которую можно менять: разделенная со снимком копируется"""
+        page = self._pages[i]
+        if not self._owned[i]:
+            page = self._pages[i] = dict(page)
+            self._owned[i] = 1
+        return page
+
+    def _find(self, employee_id: int) -> int:
+        """Номер страницы сотрудника или -1"""
+        i = bisect_right(self._starts, employee_id) - 1
+        return i if i >= 0 and employee_id in self._pages[i] else -1
+
+    def _append(self, rows: Sequence[Mapping]) -> None:
+        """Дописать записи с ID больше всех имеющихся, заполняя последнюю страницу"""
+        start = 0
+        if self._pages and len(self._pages[-1]) < PAGE_SIZE:
+            start = PAGE_SIZE - len(self._pages[-1])
+            page = self._page(len(self._pages) - 1)
+            page.update((row['id'], row) for row in rows[:start])
+
+        for offset in range(start, len(rows), PAGE_SIZE):
+            chunk = rows[offset:offset + PAGE_SIZE]
+            self._pages.append({row['id']: row for row in chunk})
+            self._starts.append(chunk[0]['id'])
+            self._owned.append(1)
+        self._count += len(rows)
+
+    def _values(self) -> Iterator[Mapping]:
+        """Записи текущей версии в порядке ID"""
+        return chain.from_iterable(map(dict.values, self._pages))
+
+    def _positions(self) -> Dict[str, List[int]]:
+        """Индекс по должностям; у снимка строится при первом обращении"""
+        if self._position_index is None:
+            self._position_index = {}
+            for employee in self._values():
+                self._index_position(employee)
+        return self._position_index
+
+    def _index_position(self, employee: Mapping) -> None:
+        """Добавить сотрудника в индекс по должности, сохраняя порядок ID"""
+        key = position_key(employee['position'])
+        insort(self._positions().setdefault(key, []), employee['id'])
+
+    def _unindex_position(self, employee: Mapping) -> None:
+        """Убрать сотрудника из индекса по должности"""
+        index = self._positions()
+        key = position_key(employee['position'])
+        ids = index.get(key)
+        if ids is not None:
+            i = bisect_left(ids, employee['id'])
+            if i < len(ids) and ids[i] == employee['id']:
+                del ids[i]
+            if not ids:
+                del index[key]
+
+    def _replace(self, i: int, employee_id: int, fields: Dict) -> Mapping:
+        """Заменить запись на странице i новой версией с измененными полями"""
+        page = self._page(i)
+        employee = page[employee_id]
+        updated = MappingProxyType({**employee, **fields})
+        page[employee_id] = updated
+        if 'position' in fields:
+            self._unindex_position(employee)
+            self._index_position(updated)
+        return updated
+
+    def _remove(self, i: int, employee_id: int) -> Mapping:
+        """Удалить запись со страницы i; пустая страница удаляется"""
+        page = self._page(i)
+        employee = page.pop(employee_id)
+        if not page:
+            del self._pages[i], self._starts[i], self._owned[i]
+        self._count -= 1
+        self._unindex_position(employee)
+        return employee
+
+    def get(self, employee_id: int) -> Optional[Dict]:
+        i = bisect_right(self._starts, employee_id) - 1
+        employee = self._pages[i].get(employee_id) if i >= 0 else None
+        return dict(employee) if employee is not None else None
+
+    def all(self) -> List[Dict]:
+        return [dict(employee) for employee in self._values()]
+
+    def rows(self) -> List[Mapping]:
+        return list(self._values())
+
+    def view(self) -> EmployeesView:
+        self._shared = True
+        return EmployeesView(_PagedRows(self._pages, self._starts, self._count))
+
+    def snapshot(self) -> 'MemoryEmployeeStore':
+        self._shared = True
+        snapshot = copy(self)
+        snapshot._position_index = None
+        return snapshot
+
+    def by_position(self, position: str) -> List[Dict]:
+        ids = self._positions().get(position_key(position), ())
+        return [self.get(employee_id) for employee_id in ids]
+
+    def columns(self, *fields: str) -> Dict[str, Sequence]:
+        rows = self.rows()
+        return {field: [row[field] for row in rows] for field in fields}
+
+    def column_chunks(self, fields: Sequence[str], chunk_size: int) -> Iterator[Dict[str, Sequence]]:
+        # Закрепляем текущую версию: изменения между порциями копируют страницы, а не мешают обходу
+        self._shared = True
+        rows = self._values()
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield {field: [row[field] for row in chunk] for field in fields}
+
+    def next_id(self) -> int:
+        return self._next_id
+
+    def insert(self, name: str, position: str, salary: float, hire_date: str) -> Dict:
+        self._own()
+        employee = {
+            'id': self._next_id,
+            'name': name,
+            'position': position,
+            'salary': salary,
+            'hire_date': hire_date
+        }
+        row = MappingProxyType(employee)
+        self._append((row,))
+        self._index_position(row)
+        self._next_id += 1
+        return dict(employee)
+
+    def insert_many(self, rows: Sequence[Tuple[str, str, float]], hire_date: str) -> range:
+        self._own()
+        ids = range(self._next_id, self._next_id + len(rows))
+        self._append([
+            MappingProxyType({
+                'id': employee_id,
+                'name': name,
+                'position': position,
+                'salary': salary,
+                'hire_date': hire_date
+            })
+            for employee_id, (name, position, salary) in zip(ids, rows)
+        ])
+
+        # Новые ID больше всех имеющихся: списки индекса остаются упорядоченными
+        index = self._positions()
+        for employee_id, key in zip(ids, map(position_key, [position for _, position, _ in rows])):
+            index.setdefault(key, []).append(employee_id)
+        self._next_id = ids.stop
+        return ids
+
+    def update(self, employee_id: int, fields: Dict) -> Optional[Dict]:
+        i = self._find(employee_id)
+        if i < 0:
+            return None
+
+        self._own()
+        return dict(self._replace(i, employee_id, fields))
+
+    def update_many(self, updates: Dict[int, Dict]) -> List[int]:
+        self._own()
+        updated_ids = []
+        for employee_id, fields in updates.items():
+            i = self._find(employee_id)
+            if i >= 0:
+                self._replace(i, employee_id, fields)
+                updated_ids.append(employee_id)
+        return updated_ids
+
+    def delete(self, employee_id: int) -> Optional[Dict]:
+        i = self._find(employee_id)
+        if i < 0:
+            return None
+
+        self._own()
+        return dict(self._remove(i, employee_id))
+
+    def delete_many(self, employee_ids: Iterable[int]) -> List[int]:
+        self._own()
+        removed_ids = []
+        for employee_id in employee_ids:
+            i = self._find(employee_id)
+            if i >= 0:
+                self._remove(i, employee_id)
+                removed_ids.append(employee_id)
+        return removed_ids
+
+    def clear(self) -> None:
+        self._pages = []
+        self._starts = []
+        self._owned = bytearray()
+        self._count = 0
+        self._position_index = {}
+        self._shared = False
+        self._next_id = 1
+
+    def load(self, rows: Iterable[Dict], next_id: int) -> None:
+        self.clear()
+        # Записи раскладываются по страницам в порядке ID
+        self._append([MappingProxyType(dict(row)) for row in sorted(rows, key=lambda row: row['id'])])
+        for employee in self._values():
+            self._index_position(employee)
+        last_id = next(reversed(self._pages[-1])) if self._pages else 0
+        self._next_id = max(next_id, last_id + 1)
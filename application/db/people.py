@@ -4,35 +4,187 @@
 Модуль для работы с данными сотрудников (адаптированный для тестирования)
 """
 
+import logging
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Union
-
-# Имитируем базу данных сотрудников
-_employees_db = [
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+from application.bonuses import BonusPolicy
+from application.db.aggregates import SalaryTotals
+from application.db.memory_store import MemoryEmployeeStore
+from application.db.records import (
+    DEFAULT_SALARY, FIELD_CHECKS, Employee, InvalidEmployeeDataError, validate_employee_columns
+)
+from application.db.rwlock import ReadWriteLock
+from application.db.store import UPDATABLE_FIELDS, EmployeeStore, EmployeesSnapshot, EmployeesView
+logger = logging.getLogger(__name__)
+
+# Начальное содержимое базы данных сотрудников
+_INITIAL_EMPLOYEES = (
     {"id": 1, "name": "Иванов И.И.", "position": "Менеджер", "salary": 120000.0, "hire_date": "2023-01-15"},
     {"id": 2, "name": "Петров П.П.", "position": "Программист", "salary": 180000.0, "hire_date": "2023-02-20"},
     {"id": 3, "name": "Сидоров С.С.", "position": "Аналитик", "salary": 150000.0, "hire_date": "2023-03-10"}
-]
+)
+
+_INITIAL_NEXT_ID = 4
+
+# Имитируем базу данных сотрудников
+_store: EmployeeStore = MemoryEmployeeStore(_INITIAL_EMPLOYEES, _INITIAL_NEXT_ID)
 
-_next_employee_id = 4
+# Чтения выполняются параллельно, изменения и выделение ID - монопольно
+_lock = ReadWriteLock()
 
+# Номер версии данных: увеличивается при каждом изменении
+_version = 0
 
-def get_employees() -> List[Dict]:
+# Итоги по выплатам, которые поддерживаются при каждом изменении
+_totals = SalaryTotals()
+_totals.rebuild(*([row[field] for row in _INITIAL_EMPLOYEES] for field in ('id', 'position', 'salary')))
+
+
+def get_employee_store() -> EmployeeStore:
+    """
+    Получить текущее хранилище сотрудников
+
+    Returns:
+        EmployeeStore: Используемое хранилище
+    """
+    return _store
+
+
+def set_employee_store(store: EmployeeStore) -> EmployeeStore:
+    """
+    Заменить хранилище сотрудников (например, на ColumnarEmployeeStore)
+
+    Args:
+        store: Новое хранилище
+
+    Returns:
+        EmployeeStore: Предыдущее хранилище
+    """
+    global _store
+
+    if not isinstance(store, EmployeeStore):
+        raise TypeError("Хранилище должно наследоваться от EmployeeStore")
+
+    with _writing():
+        previous, _store = _store, store
+        _rebuild_totals()
+    return previous
+
+
+def _rebuild_totals(policy: Optional[BonusPolicy] = None) -> None:
+    """Пересчитать итоги по выплатам по содержимому хранилища"""
+    columns = _store.columns('id', 'position', 'salary')
+    _totals.rebuild(columns['id'], columns['position'], columns['salary'], policy)
+
+
+def set_totals_bonus_policy(policy: BonusPolicy) -> None:
+    """
+    Пересчитать итоги по выплатам (get_salary_totals) по новой политике премий
+
+    Вызывается из application.salary.set_bonus_policy.
+
+    Args:
+        policy: Действующая политика премий
+    """
+    with _lock.write():
+        _rebuild_totals(policy)
+
+
+@contextmanager
+def _writing() -> Iterator[None]:
+    """Блокировка записи; по завершении изменения увеличивает номер версии"""
+    global _version
+
+    with _lock.write():
+        try:
+            yield
+        finally:
+            _version += 1
+
+
+@contextmanager
+def employees_transaction() -> Iterator[None]:
+    """
+    Выполнить несколько операций с сотрудниками без вмешательства других потоков
+
+    Внутри блока доступны все функции модуля; другие потоки ждут его
+    завершения. Подходит для изменений вида "прочитать - изменить - записать".
+
+    Пример:
+        with employees_transaction():
+            employee = get_employee_by_id(1)
+            update_employee_data(1, salary=employee['salary'] + 1000)
+    """
+    with _lock.write():
+        yield
+
+
+def get_employees(copy: bool = False) -> List[Mapping]:
     """
     Функция для получения списка сотрудников
 
+    Возвращает новый список, но записи в нем не копируются: это записи
+    только для чтения (MappingProxyType). Изменяемые независимые копии
+    записей возвращаются при copy=True.
+
+    Args:
+        copy: Вернуть копии записей (словари), которые можно изменять
+
     Returns:
         list: Список всех сотрудников
     """
-    print("👥 Загружаем список сотрудников из базы данных...")
-    print("   - Подключение к базе данных")
-    print("   - Выборка активных сотрудников")
-    print("   - Проверка актуальности данных")
+    with _lock.read():
+        employees = _store.all() if copy else _store.rows()
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("👥 Загружаем список сотрудников из базы данных...")
+        logger.info("   - Подключение к базе данных")
+        logger.info("   - Выборка активных сотрудников")
+        logger.info("   - Проверка актуальности данных")
+
+        logger.info("✅ Загружено %d сотрудников", len(employees))
+        logger.info("   Время загрузки: %s", datetime.now().strftime('%H:%M:%S'))
+
+    return employees
+
+
+def get_employees_view() -> EmployeesView:
+    """
+    Получить сотрудников только для чтения, без копирования записей
+
+    Returns:
+        EmployeesView: Последовательность записей (MappingProxyType)
+    """
+    with _lock.read():
+        return _store.view()
+
+
+def get_employees_snapshot() -> EmployeesSnapshot:
+    """
+    Закрепить согласованный снимок сотрудников
+
+    Снимок не меняется при последующих изменениях, а запись в хранилище
+    не ждет, пока снимок используется. В хранилищах в памяти снимок
+    создается за O(1) (copy-on-write); старая версия освобождается, когда
+    на снимок не остается ссылок.
+
+    Returns:
+        EmployeesSnapshot: Снимок с номером версии данных
+    """
+    with _lock.read():
+        return EmployeesSnapshot(_store.snapshot(), _version)
 
-    print(f"✅ Загружено {len(_employees_db)} сотрудников")
-    print(f"   Время загрузки: {datetime.now().strftime('%H:%M:%S')}")
 
-    return _employees_db.copy()
+def get_employees_version() -> int:
+    """
+    Получить номер текущей версии данных сотрудников
+
+    Returns:
+        int: Номер, который увеличивается при каждом изменении
+    """
+    return _version
 
 
 def get_employee_by_id(employee_id: int) -> Optional[Dict]:
@@ -48,16 +200,17 @@ def get_employee_by_id(employee_id: int) -> Optional[Dict]:
     if not isinstance(employee_id, int):
         raise TypeError("ID сотрудника должен быть целым числом")
 
-    for employee in _employees_db:
-        if employee['id'] == employee_id:
-            print(f"🔍 Найден сотрудник: {employee['name']}")
-            return employee.copy()
+    with _lock.read():
+        employee = _store.get(employee_id)
+    if employee is not None:
+        logger.info("🔍 Найден сотрудник: %s", employee['name'])
+        return employee
 
-    print(f"❌ Сотрудник с ID {employee_id} не найден")
+    logger.info("❌ Сотрудник с ID %s не найден", employee_id)
     return None
 
 
-def add_employee(name: str, position: str, salary: float = 100000.0) -> Dict:
+def add_employee(name: str, position: str, salary: float = DEFAULT_SALARY) -> Dict:
     """
     Добавить нового сотрудника
 
@@ -72,30 +225,70 @@ def add_employee(name: str, position: str, salary: float = 100000.0) -> Dict:
     Raises:
         ValueError: При некорректных данных
     """
-    global _next_employee_id
+    return add_employee_record(Employee(name, position, salary))
+
+
+def add_employee_record(employee: Employee) -> Dict:
+    """
+    Добавить сотрудника из готовой записи Employee
+
+    Запись уже проверена при создании и повторно не проверяется;
+    ее поле id не используется.
+
+    Args:
+        employee: Запись сотрудника
+
+    Returns:
+        dict: Данные добавленного сотрудника
+
+    Raises:
+        TypeError: Если передана не запись Employee
+    """
+    if not isinstance(employee, Employee):
+        raise TypeError("Ожидается запись Employee")
+
+    with _writing():
+        new_employee = _store.insert(
+            employee.name, employee.position, employee.salary, datetime.now().strftime('%Y-%m-%d')
+        )
+        _totals.add(new_employee['id'], new_employee['position'], new_employee['salary'])
+
+    logger.info("➕ Добавлен новый сотрудник: %s - %s", employee.name, employee.position)
+    return new_employee
 
-    if not isinstance(name, str) or not name.strip():
-        raise ValueError("Имя сотрудника должно быть непустой строкой")
 
-    if not isinstance(position, str) or not position.strip():
-        raise ValueError("Должность должна быть непустой строкой")
+def add_employees_bulk(employees: Iterable[Union[Dict, Employee]]) -> range:
+    """
+    Добавить пакет сотрудников одной операцией
 
-    if not isinstance(salary, (int, float)) or salary <= 0:
-        raise ValueError("Зарплата должна быть положительным числом")
+    Все записи проверяются по колонкам (см. validate_employee_columns); при
+    любой ошибке не добавляется ни одна запись. Записи Employee повторно
+    не проверяются, их поле id не используется. ID выделяются непрерывным
+    диапазоном. Итоги по выплатам для пакета считаются до записи в
+    хранилище, поэтому ошибка расчета не оставляет следов в базе.
 
-    new_employee = {
-        'id': _next_employee_id,
-        'name': name.strip(),
-        'position': position.strip(),
-        'salary': float(salary),
-        'hire_date': datetime.now().strftime('%Y-%m-%d')
-    }
+    Args:
+        employees: Словари с ключами 'name', 'position' и необязательным 'salary'
+            или записи Employee
 
-    _employees_db.append(new_employee)
-    _next_employee_id += 1
+    Returns:
+        range: ID добавленных сотрудников
 
-    print(f"➕ Добавлен новый сотрудник: {name} - {position}")
-    return new_employee.copy()
+    Raises:
+        InvalidEmployeeDataError: Со списком всех ошибок во всех записях
+    """
+    names, positions, salaries = validate_employee_columns(employees)
+
+    with _writing():
+        # Премии по персональным процентам зависят от ID: итоги считаются
+        # по диапазону, который выделит вставка (запись под блокировкой)
+        first_id = _store.next_id()
+        delta = _totals.delta(range(first_id, first_id + len(names)), positions, salaries)
+        ids = _store.insert_many(list(zip(names, positions, salaries)), datetime.now().strftime('%Y-%m-%d'))
+        _totals.apply(delta)
+
+    logger.info("➕ Добавлено сотрудников: %d", len(ids))
+    return ids
 
 
 def remove_employee(employee_id: int) -> bool:
@@ -114,16 +307,55 @@ def remove_employee(employee_id: int) -> bool:
     if not isinstance(employee_id, int):
         raise TypeError("ID сотрудника должен быть целым числом")
 
-    for i, employee in enumerate(_employees_db):
-        if employee['id'] == employee_id:
-            removed_employee = _employees_db.pop(i)
-            print(f"🗑️ Удален сотрудник: {removed_employee['name']}")
-            return True
+    with _writing():
+        removed_employee = _store.delete(employee_id)
+        if removed_employee is not None:
+            _totals.remove(employee_id, removed_employee['position'], removed_employee['salary'])
+    if removed_employee is not None:
+        logger.info("🗑️ Удален сотрудник: %s", removed_employee['name'])
+        return True
 
-    print(f"❌ Сотрудник с ID {employee_id} не найден для удаления")
+    logger.info("❌ Сотрудник с ID %s не найден для удаления", employee_id)
     return False
 
 
+def remove_employees_bulk(employee_ids: Iterable[int]) -> List[int]:
+    """
+    Удалить пакет сотрудников за один проход по хранилищу
+
+    Args:
+        employee_ids: ID сотрудников для удаления
+
+    Returns:
+        list: ID сотрудников, которые были найдены и удалены
+
+    Raises:
+        TypeError: При некорректном типе любого из ID
+    """
+    employee_ids = list(employee_ids)
+    if not all(isinstance(employee_id, int) for employee_id in employee_ids):
+        raise TypeError("ID сотрудника должен быть целым числом")
+
+    with _writing():
+        # Повторяющиеся ID удаляются один раз
+        removed = [employee for employee in map(_store.get, dict.fromkeys(employee_ids)) if employee is not None]
+        removed_ids = _store.delete_many(employee_ids)
+        _totals.remove_many(*([employee[field] for employee in removed] for field in ('id', 'position', 'salary')))
+
+    logger.info("🗑️ Удалено сотрудников: %d", len(removed_ids))
+    return removed_ids
+
+
+def _validate_update_fields(kwargs: Dict) -> Dict:
+    """
+    Проверить поля для обновления и оставить только разрешенные
+
+    Raises:
+        ValueError: При некорректном значении поля
+    """
+    return {field: FIELD_CHECKS[field](value) for field, value in kwargs.items() if field in UPDATABLE_FIELDS}
+
+
 def update_employee_data(employee_id: int, **kwargs) -> Optional[Dict]:
     """
     Обновить данные сотрудника
@@ -138,33 +370,82 @@ def update_employee_data(employee_id: int, **kwargs) -> Optional[Dict]:
     if not isinstance(employee_id, int):
         raise TypeError("ID сотрудника должен быть целым числом")
 
-    for employee in _employees_db:
-        if employee['id'] == employee_id:
-            # Обновляем только разрешенные поля
-            allowed_fields = ['name', 'position', 'salary']
-            updated_fields = []
-
-            for field, value in kwargs.items():
-                if field in allowed_fields:
-                    if field == 'name' and (not isinstance(value, str) or not value.strip()):
-                        raise ValueError("Имя должно быть непустой строкой")
-                    if field == 'position' and (not isinstance(value, str) or not value.strip()):
-                        raise ValueError("Должность должна быть непустой строкой")
-                    if field == 'salary' and (not isinstance(value, (int, float)) or value <= 0):
-                        raise ValueError("Зарплата должна быть положительным числом")
-
-                    employee[field] = value
-                    updated_fields.append(field)
-
-            if updated_fields:
-                print(f"🔄 Обновлены поля {updated_fields} для сотрудника {employee['name']}")
-                return employee.copy()
-            else:
-                print("❌ Нет полей для обновления")
-                return employee.copy()
-
-    print(f"❌ Сотрудник с ID {employee_id} не найден")
-    return None
+    fields = _validate_update_fields(kwargs)
+
+    with _writing():
+        # Прежние оклад и должность нужны, чтобы поправить итоги
+        previous = _store.get(employee_id) if 'salary' in fields or 'position' in fields else None
+        employee = _store.update(employee_id, fields)
+        if previous is not None:
+            _totals.remove(employee_id, previous['position'], previous['salary'])
+            _totals.add(employee_id, employee['position'], employee['salary'])
+    if employee is None:
+        logger.info("❌ Сотрудник с ID %s не найден", employee_id)
+        return None
+
+    if fields:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🔄 Обновлены поля %s для сотрудника %s", list(fields), employee['name'])
+    else:
+        logger.info("❌ Нет полей для обновления")
+    return employee
+
+
+def update_employees_bulk(updates: Dict[int, Dict]) -> List[int]:
+    """
+    Обновить данные пакета сотрудников
+
+    Правила для полей те же, что в update_employee_data. Все изменения
+    проверяются до записи, итоги по выплатам для новых значений тоже
+    считаются до записи: при любой ошибке не изменяется ни одна запись.
+
+    Args:
+        updates: Словарь ID -> словарь полей для обновления
+
+    Returns:
+        list: ID сотрудников, которые были найдены и обновлены
+
+    Raises:
+        TypeError: При некорректном типе ID
+        InvalidEmployeeDataError: Со списком пар (ID, сообщение) для всех ошибок
+    """
+    prepared = {}
+    errors = []
+
+    for employee_id, kwargs in updates.items():
+        if not isinstance(employee_id, int):
+            raise TypeError("ID сотрудника должен быть целым числом")
+        try:
+            fields = _validate_update_fields(kwargs)
+        except ValueError as error:
+            errors.append((employee_id, str(error)))
+            continue
+        if fields:
+            prepared[employee_id] = fields
+
+    if errors:
+        raise InvalidEmployeeDataError(errors)
+
+    with _writing():
+        previous = [
+            employee for employee_id, fields in prepared.items()
+            if 'salary' in fields or 'position' in fields
+            for employee in (_store.get(employee_id),) if employee is not None
+        ]
+        ids = [employee['id'] for employee in previous]
+        updated = [{**employee, **prepared[employee['id']]} for employee in previous]
+        # Итоги считаются до записи: если новые значения не считаются в копейках,
+        # хранилище остается прежним
+        removed_delta = _totals.delta(ids, [employee['position'] for employee in previous],
+                                      [employee['salary'] for employee in previous])
+        added_delta = _totals.delta(ids, [employee['position'] for employee in updated],
+                                    [employee['salary'] for employee in updated])
+        updated_ids = _store.update_many(prepared)
+        _totals.apply(removed_delta, -1)
+        _totals.apply(added_delta)
+
+    logger.info("🔄 Обновлено сотрудников: %d", len(updated_ids))
+    return updated_ids
 
 
 def get_employees_by_position(position: str) -> List[Dict]:
@@ -180,12 +461,10 @@ def get_employees_by_position(position: str) -> List[Dict]:
     if not isinstance(position, str):
         raise TypeError("Должность должна быть строкой")
 
-    filtered_employees = [
-        emp.copy() for emp in _employees_db
-        if emp['position'].lower() == position.lower()
-    ]
+    with _lock.read():
+        filtered_employees = _store.by_position(position)
 
-    print(f"🎯 Найдено {len(filtered_employees)} сотрудников с должностью '{position}'")
+    logger.info("🎯 Найдено %d сотрудников с должностью '%s'", len(filtered_employees), position)
     return filtered_employees
 
 
@@ -196,28 +475,89 @@ def get_employees_count() -> int:
     Returns:
         int: Количество сотрудников в базе
     """
-    return len(_employees_db)
+    with _lock.read():
+        return len(_store)
+
+
+def get_salary_totals() -> Dict:
+    """
+    Получить итоги по выплатам без обхода базы
+
+    Итоги поддерживаются при каждом добавлении, изменении и удалении
+    сотрудника, поэтому чтение не зависит от количества сотрудников.
+    Премии считаются по действующей политике премий, поэтому total_salary
+    и average_salary совпадают с результатом calculate_salary().
+
+    Returns:
+        dict: total_employees, total_base_salary (оклады), total_bonus (премии),
+            total_salary (оклады + премии), average_salary (средняя выплата)
+            и by_position - те же подытоги по должностям (с полем employees)
+    """
+    with _lock.read():
+        return _totals.as_dict()
+
+
+def get_employee_columns(*fields: str) -> Dict[str, Sequence]:
+    """
+    Получить значения полей всех сотрудников в виде колонок
+
+    Args:
+        *fields: Имена полей ('id', 'name', 'position', 'salary', 'hire_date')
+
+    Returns:
+        dict: Поле -> последовательность значений в порядке сотрудников
+    """
+    with _lock.read():
+        return _store.columns(*fields)
+
+
+def iter_employee_column_chunks(*fields: str, chunk_size: int = 10000) -> Iterator[Dict[str, Sequence]]:
+    """
+    Получить колонки полей сотрудников порциями ограниченного размера
+
+    Args:
+        *fields: Имена полей
+        chunk_size: Максимальное количество сотрудников в порции
+
+    Каждая порция читается под блокировкой чтения, между порциями другие
+    потоки могут изменять данные.
+
+    Returns:
+        iterator: Порции вида поле -> последовательность значений
+    """
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("Размер порции должен быть положительным целым числом")
+
+    with _lock.read():
+        chunks = _store.column_chunks(fields, chunk_size)
+    return _locked_chunks(chunks)
+
+
+def _locked_chunks(chunks: Iterator[Dict[str, Sequence]]) -> Iterator[Dict[str, Sequence]]:
+    """Выдавать порции, читая каждую под блокировкой чтения"""
+    while True:
+        with _lock.read():
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
 
 
 def clear_employees_db() -> None:
     """
     Очистить базу данных сотрудников (для тестирования)
     """
-    global _employees_db, _next_employee_id
-    _employees_db.clear()
-    _next_employee_id = 1
-    print("🧹 База данных сотрудников очищена")
+    with _writing():
+        _store.clear()
+        _totals.reset()
+    logger.info("🧹 База данных сотрудников очищена")
 
 
 def reset_employees_db() -> None:
     """
     Сбросить базу данных к начальному состоянию (для тестирования)
     """
-    global _employees_db, _next_employee_id
-    _employees_db = [
-        {"id": 1, "name": "Иванов И.И.", "position": "Менеджер", "salary": 120000.0, "hire_date": "2023-01-15"},
-        {"id": 2, "name": "Петров П.П.", "position": "Программист", "salary": 180000.0, "hire_date": "2023-02-20"},
-        {"id": 3, "name": "Сидоров С.С.", "position": "Аналитик", "salary": 150000.0, "hire_date": "2023-03-10"}
-    ]
-    _next_employee_id = 4
-    print("🔄 База данных сотрудников сброшена к начальному состоянию")
\ No newline at end of file
+    with _writing():
+        _store.load(_INITIAL_EMPLOYEES, _INITIAL_NEXT_ID)
+        _rebuild_totals()
+    logger.info("🔄 База данных сотрудников сброшена к начальному состоянию")
\ No newline at end of file
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Проверенные записи сотрудников
+
+Правила для полей описаны здесь один раз и используются при добавлении,
+обновлении и валидации данных. Запись Employee проверяется при создании и
+дальше не меняется, поэтому функции, принимающие Employee, не проверяют
+ее повторно.
+"""
+
+import math
+from collections.abc import Mapping
+from itertools import repeat
+from operator import is_not
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from application.money import KOPECKS_PER_RUBLE, MAX_KOPECKS
+
+# Оклад сотрудника, если он не указан
+DEFAULT_SALARY = 100000.0
+
+# Наибольший процент премии в политике премий
+MAX_BONUS_PERCENT = 1000
+
+# Наибольший оклад: оклад и выплата с наибольшей премией (с округлением)
+# в копейках должны помещаться в array('q'), иначе один сотрудник сделает
+# невозможным расчет зарплаты для всей базы
+MAX_SALARY = MAX_KOPECKS // (KOPECKS_PER_RUBLE * (100 + MAX_BONUS_PERCENT) // 100) - 1
+
+# Ключ поиска по должности (без учета регистра). Это встроенный метод, а не
+# Python-функция: map(position_key, ...) нормализует пакет на уровне C
+position_key = str.casefold
+
+
+class InvalidEmployeeDataError(ValueError):
+    """Ошибки в пакете записей сотрудников; errors - список пар (позиция, сообщение)"""
+
+    def __init__(self, errors: List[Tuple[int, str]]):
+        preview = '; '.join(f"#{index}: {message}" for index, message in errors[:10])
+        more = '...' if len(errors) > 10 else ''
+        super().__init__(f"Некорректные данные сотрудников ({len(errors)}): {preview}{more}")
+        self.errors = errors
+
+
+def check_employee_id(value) -> int:
+    """Проверить ID сотрудника (положительное целое число)"""
+    if not isinstance(value, int) or value <= 0:
+        raise ValueError("ID должен быть положительным числом")
+    return value
+
+
+def check_name(value) -> str:
+    """Проверить имя и вернуть его без пробелов по краям"""
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError("Имя сотрудника должно быть непустой строкой")
+    return value.strip()
+
+
+def check_position(value) -> str:
+    """Проверить должность и вернуть ее без пробелов по краям"""
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError("Должность должна быть непустой строкой")
+    return value.strip()
+
+
+def check_salary(value) -> float:
+    """Проверить оклад (положительное число не больше MAX_SALARY) и вернуть его как float"""
+    if not isinstance(value, (int, float)) or not 0 < value < math.inf:
+        raise ValueError("Зарплата должна быть положительным числом")
+    # Границу проверяем у float: именно он хранится и переводится в копейки
+    if value > MAX_SALARY or float(value) > MAX_SALARY:
+        raise ValueError(f"Зарплата не должна превышать {MAX_SALARY}")
+    return float(value)
+
+
+# Проверки полей, которые можно изменять у существующего сотрудника
+FIELD_CHECKS: Dict[str, Callable] = {
+    'name': check_name,
+    'position': check_position,
+    'salary': check_salary
+}
+
+
+class Employee:
+    """
+    Проверенная неизменяемая запись сотрудника
+
+    Args:
+        name: Имя сотрудника
+        position: Должность
+        salary: Оклад (по умолчанию DEFAULT_SALARY)
+        id: ID сотрудника, если он уже известен
+
+    Raises:
+        ValueError: При некорректном значении поля
+    """
+
+    __slots__ = ('id', 'name', 'position', 'salary')
+
+    id: Optional[int]
+    name: str
+    position: str
+    salary: float
+
+    def __init__(self, name: str, position: str, salary: float = DEFAULT_SALARY, id: Optional[int] = None):
+        _set = object.__setattr__
+        _set(self, 'id', None if id is None else check_employee_id(id))
+        _set(self, 'name', check_name(name))
+        _set(self, 'position', check_position(position))
+        _set(self, 'salary', check_salary(salary))
+
+    @classmethod
+    def _trusted(cls, name: str, position: str, salary: float, id: Optional[int] = None) -> 'Employee':
+        """Создать запись из уже проверенных и нормализованных значений"""
+        employee = cls.__new__(cls)
+        _set = object.__setattr__
+        _set(employee, 'id', id)
+        _set(employee, 'name', name)
+        _set(employee, 'position', position)
+        _set(employee, 'salary', salary)
+        return employee
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> 'Employee':
+        """
+        Запись из словаря с ключами 'name', 'position' и необязательными 'salary', 'id'
+
+        Raises:
+            InvalidEmployeeDataError: Со всеми ошибками записи
+        """
+        return validate_employees([data])[0]
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Запись сотрудника неизменяема")
+
+    def __delattr__(self, name):
+        raise AttributeError("Запись сотрудника неизменяема")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Employee):
+            return NotImplemented
+        return ((self.id, self.name, self.position, self.salary)
+                == (other.id, other.name, other.position, other.salary))
+
+    def __hash__(self) -> int:
+        return hash((self.id, self.name, self.position, self.salary))
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}({self.name!r}, {self.position!r}, {self.salary!r}"
+                f"{'' if self.id is None else f', id={self.id!r}'})")
+
+    def as_dict(self) -> Dict:
+        """Поля записи в виде словаря"""
+        data = {'name': self.name, 'position': self.position, 'salary': self.salary}
+        if self.id is not None:
+            data['id'] = self.id
+        return data
+
+
+# Поля строки пакета: (поле, проверка, значение по умолчанию) в порядке аргументов Employee
+_ROW_FIELDS = (
+    ('name', check_name, None),
+    ('position', check_position, None),
+    ('salary', check_salary, DEFAULT_SALARY),
+    ('id', check_employee_id, None)
+)
+
+
+def validate_employees(rows: Iterable[Union[Mapping, Employee]]) -> List[Employee]:
+    """
+    Проверить пакет записей за один проход и собрать все ошибки
+
+    Готовые записи Employee повторно не проверяются. Для словарей
+    проверяются все поля, поэтому у одной строки может быть несколько ошибок.
+
+    Args:
+        rows: Словари с ключами 'name', 'position' и необязательными 'salary', 'id'
+            или записи Employee
+
+    Returns:
+        list: Записи Employee в том же порядке
+
+    Raises:
+        InvalidEmployeeDataError: Со списком пар (позиция, сообщение) для всех ошибок
+    """
+    records = []
+    errors = []
+    trusted = Employee._trusted
+
+    for index, row in enumerate(rows):
+        if isinstance(row, Employee):
+            records.append(row)
+            continue
+        if not isinstance(row, Mapping):
+            errors.append((index, "Данные сотрудника должны быть словарем"))
+            continue
+
+        row_errors = len(errors)
+        values = []
+        for field, check, default in _ROW_FIELDS:
+            value = row.get(field, default)
+            if value is None and field == 'id':
+                values.append(None)
+                continue
+            try:
+                values.append(check(value))
+            except ValueError as error:
+                errors.append((index, str(error)))
+
+        if len(errors) == row_errors:
+            records.append(trusted(*values))
+
+    if errors:
+        raise InvalidEmployeeDataError(errors)
+    return records
+
+
+def validate_employee_columns(rows: Iterable[Union[Mapping, Employee]]) -> Tuple[List[str], List[str], List[float]]:
+    """
+    Проверить пакет записей и вернуть колонки имен, должностей и окладов
+
+    Правила те же, что в validate_employees. Пакет словарей без поля 'id'
+    проверяется по колонкам: значения выбираются через map, а типы, пустые
+    строки и границы окладов проверяются встроенными функциями на уровне C,
+    без вызова Python-функции на каждую строку. Пакеты с записями Employee,
+    другими отображениями, полем 'id' или ошибками проверяет validate_employees.
+
+    Args:
+        rows: Словари с ключами 'name', 'position' и необязательными 'salary', 'id'
+            или записи Employee
+
+    Returns:
+        tuple: Списки имен и должностей (без пробелов по краям) и окладов (float)
+
+    Raises:
+        InvalidEmployeeDataError: Со списком пар (позиция, сообщение) для всех ошибок
+    """
+    rows = rows if isinstance(rows, list) else list(rows)
+    plain = all(map(isinstance, rows, repeat(dict)))
+    if plain and not any(map(is_not, map(dict.get, rows, repeat('id')), repeat(None))):
+        names = list(map(dict.get, rows, repeat('name')))
+        positions = list(map(dict.get, rows, repeat('position')))
+        salaries = list(map(dict.get, rows, repeat('salary'), repeat(DEFAULT_SALARY)))
+        if (all(map(isinstance, names, repeat(str))) and all(map(isinstance, positions, repeat(str)))
+                and all(map(isinstance, salaries, repeat((int, float))))):
+            names = list(map(str.strip, names))
+            positions = list(map(str.strip, positions))
+            try:
+                salaries = list(map(float, salaries))
+            except OverflowError:
+                salaries = None
+            if (salaries is not None and all(names) and all(positions)
+                    and all(map(math.isfinite, salaries))
+                    and (not salaries or (min(salaries) > 0 and max(salaries) <= MAX_SALARY))):
+                return names, positions, salaries
+
+    records = validate_employees(rows)
+    return ([record.name for record in records], [record.position for record in records],
+            [record.salary for record in records])
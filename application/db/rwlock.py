@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Блокировка чтения/записи для хранилища сотрудников
+
+Читать могут несколько потоков одновременно, запись выполняется
+монопольно. Ожидающий писатель получает приоритет перед новыми читателями,
+поэтому поток обновлений не голодает под постоянной нагрузкой расчетов.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class ReadWriteLock:
+    """
+    Блокировка "много читателей / один писатель"
+
+    Поток, владеющий блокировкой записи, может повторно брать блокировки
+    записи и чтения. Поток, уже владеющий блокировкой чтения, берет ее
+    повторно без ожидания, даже если своей очереди ждет писатель: иначе
+    писатель ждал бы этот поток, а поток - писателя. Повысить блокировку
+    чтения до записи нельзя: такой вызов ждал бы сам себя.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+        # Сколько раз текущий поток взял блокировку чтения
+        self._local = threading.local()
+
+    def acquire_read(self) -> None:
+        """Взять блокировку чтения"""
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            depth = getattr(self._local, 'reads', 0)
+            if not depth:
+                while self._writer is not None or self._writers_waiting:
+                    self._condition.wait()
+            self._readers += 1
+            self._local.reads = depth + 1
+
+    def release_read(self) -> None:
+        """Освободить блокировку чтения"""
+        with self._condition:
+            if self._writer == threading.get_ident():
+                self._release_write()
+                return
+            self._local.reads -= 1
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """Взять блокировку записи"""
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self) -> None:
+        """Освободить блокировку записи"""
+        with self._condition:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("Блокировка записи не принадлежит текущему потоку")
+            self._release_write()
+
+    def _release_write(self) -> None:
+        self._write_depth -= 1
+        if not self._write_depth:
+            self._writer = None
+            self._condition.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Контекст блокировки чтения"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Контекст блокировки записи"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Хранилище сотрудников в файле SQLite
+
+Данные сохраняются между запусками программы. ID является первичным
+ключом таблицы, для поиска по должности построен индекс. Запросы
+используют постоянный текст с параметрами, поэтому sqlite3 кэширует
+подготовленные выражения; пакетные записи выполняются одной транзакцией.
+База в файле работает в режиме WAL: снимки читают зафиксированную версию
+данных, не копируя ее и не мешая записи.
+"""
+
+import os
+import sqlite3
+import weakref
+from urllib.parse import quote
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from application.db.records import position_key
+from application.db.store import EMPLOYEE_FIELDS, UPDATABLE_FIELDS, EmployeeStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    position TEXT NOT NULL,
+    position_key TEXT NOT NULL,
+    salary REAL NOT NULL,
+    hire_date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS employees_position_key ON employees (position_key);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO counters (name, value) VALUES ('next_employee_id', 1);
+"""
+
+_SELECT_ROW = "SELECT id, name, position, salary, hire_date FROM employees"
+_INSERT_ROW = (
+    "INSERT INTO employees (id, name, position, position_key, salary, hire_date) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_GET_NEXT_ID = "SELECT value FROM counters WHERE name = 'next_employee_id'"
+_SET_NEXT_ID = "UPDATE counters SET value = ? WHERE name = 'next_employee_id'"
+
+# Столбцы для UPDATE; position обновляется вместе с ключом поиска
+_UPDATE_COLUMNS = {
+    'name': "name = ?",
+    'position': "position = ?, position_key = ?",
+    'salary': "salary = ?"
+}
+
+
+def _row_to_dict(row: Sequence) -> Dict:
+    """Преобразовать строку выборки в словарь записи"""
+    return dict(zip(EMPLOYEE_FIELDS, row))
+
+
+class SQLiteEmployeeStore(EmployeeStore):
+    """
+    Хранилище сотрудников в базе SQLite
+
+    Соединение можно использовать из разных потоков; очередность операций
+    обеспечивает блокировка модуля application.db.people.
+
+    Args:
+        path: Путь к файлу базы (':memory:' - база в памяти)
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._wal = path != ':memory:' and self._conn.execute("PRAGMA journal_mode=WAL").fetchone()[0] == 'wal'
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def snapshot(self) -> 'SQLiteEmployeeStore':
+        """
+        Хранилище только для чтения с открытой транзакцией чтения
+
+        Снимок читает базу через отдельное соединение. В режиме WAL его
+        транзакция видит версию данных на момент создания снимка, а запись
+        через основное соединение продолжается. Данные не копируются;
+        соединение закрывается, когда на снимок не остается ссылок.
+
+        Базу в памяти другое соединение не видит, поэтому ее снимок -
+        копия, снятая резервным копированием SQLite, за O(n).
+        """
+        copy = SQLiteEmployeeStore.__new__(SQLiteEmployeeStore)
+        copy._wal = self._wal
+        if not self._wal:
+            copy.path = ':memory:'
+            copy._conn = sqlite3.connect(':memory:', check_same_thread=False)
+            self._conn.backup(copy._conn)
+            return copy
+
+        copy.path = self.path
+        copy._conn = sqlite3.connect(
+            f"file:{quote(os.path.abspath(self.path))}?mode=ro", uri=True, check_same_thread=False, isolation_level=None
+        )
+        weakref.finalize(copy, copy._conn.close)
+        # Версия данных закрепляется первым чтением в транзакции
+        copy._conn.execute("BEGIN")
+        copy.next_id()
+        return copy
+
+    def close(self) -> None:
+        """Закрыть соединение с базой"""
+        self._conn.close()
+
+    def next_id(self) -> int:
+        return self._conn.execute(_GET_NEXT_ID).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+
+    def get(self, employee_id: int) -> Optional[Dict]:
+        row = self._conn.execute(_SELECT_ROW + " WHERE id = ?", (employee_id,)).fetchone()
+        return _row_to_dict(row) if row is not None else None
+
+    def all(self) -> List[Dict]:
+        return [_row_to_dict(row) for row in self._conn.execute(_SELECT_ROW + " ORDER BY id")]
+
+    def by_position(self, position: str) -> List[Dict]:
+        rows = self._conn.execute(
+            _SELECT_ROW + " WHERE position_key = ? ORDER BY id", (position_key(position),)
+        )
+        return [_row_to_dict(row) for row in rows]
+
+    def _select_columns(self, fields: Sequence[str]) -> sqlite3.Cursor:
+        """Курсор по указанным полям всех сотрудников"""
+        for field in fields:
+            if field not in EMPLOYEE_FIELDS:
+                raise KeyError(field)
+        return self._conn.execute(f"SELECT {', '.join(fields)} FROM employees ORDER BY id")
+
+    def columns(self, *fields: str) -> Dict[str, Sequence]:
+        rows = self._select_columns(fields).fetchall()
+        if not rows:
+            return {field: [] for field in fields}
+        return {field: list(values) for field, values in zip(fields, zip(*rows))}
+
+    def column_chunks(self, fields: Sequence[str], chunk_size: int) -> Iterator[Dict[str, Sequence]]:
+        cursor = self._select_columns(fields)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield {field: list(values) for field, values in zip(fields, zip(*rows))}
+
+    def insert(self, name: str, position: str, salary: float, hire_date: str) -> Dict:
+        with self._conn:
+            employee_id = self.next_id()
+            self._conn.execute(
+                _INSERT_ROW, (employee_id, name, position, position_key(position), salary, hire_date)
+            )
+            self._conn.execute(_SET_NEXT_ID, (employee_id + 1,))
+        return {
+            'id': employee_id,
+            'name': name,
+            'position': position,
+            'salary': salary,
+            'hire_date': hire_date
+        }
+
+    def insert_many(self, rows: Sequence[Tuple[str, str, float]], hire_date: str) -> range:
+        with self._conn:
+            first_id = self.next_id()
+            ids = range(first_id, first_id + len(rows))
+            self._conn.executemany(_INSERT_ROW, (
+                (employee_id, name, position, position_key(position), salary, hire_date)
+                for employee_id, (name, position, salary) in zip(ids, rows)
+            ))
+            self._conn.execute(_SET_NEXT_ID, (ids.stop,))
+        return ids
+
+    def _execute_update(self, employee_id: int, fields: Dict) -> bool:
+        """Выполнить UPDATE одной записи; True если сотрудник найден"""
+        assignments = []
+        params = []
+        for field, value in fields.items():
+            if field not in UPDATABLE_FIELDS:
+                raise KeyError(field)
+            assignments.append(_UPDATE_COLUMNS[field])
+            params.append(value)
+            if field == 'position':
+                params.append(position_key(value))
+
+        if not assignments:
+            return self.get(employee_id) is not None
+
+        cursor = self._conn.execute(
+            f"UPDATE employees SET {', '.join(assignments)} WHERE id = ?",
+            (*params, employee_id)
+        )
+        return cursor.rowcount > 0
+
+    def update(self, employee_id: int, fields: Dict) -> Optional[Dict]:
+        with self._conn:
+            found = self._execute_update(employee_id, fields)
+        return self.get(employee_id) if found else None
+
+    def update_many(self, updates: Dict[int, Dict]) -> List[int]:
+        with self._conn:
+            return [employee_id for employee_id, fields in updates.items()
+                    if self._execute_update(employee_id, fields)]
+
+    def delete(self, employee_id: int) -> Optional[Dict]:
+        with self._conn:
+            employee = self.get(employee_id)
+            if employee is not None:
+                self._conn.execute("DELETE FROM employees WHERE id = ?", (employee_id,))
+        return employee
+
+    def delete_many(self, employee_ids: Iterable[int]) -> List[int]:
+        with self._conn:
+            return [employee_id for employee_id in employee_ids
+                    if self._conn.execute("DELETE FROM employees WHERE id = ?", (employee_id,)).rowcount]
+
+    def clear(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM employees")
+            self._conn.execute(_SET_NEXT_ID, (1,))
+
+    def load(self, rows: Iterable[Dict], next_id: int) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM employees")
+            self._conn.executemany(_INSERT_ROW, (
+                (row['id'], row['name'], row['position'], position_key(row['position']),
+                 row['salary'], row['hire_date'])
+                for row in rows
+            ))
+            self._conn.execute(_SET_NEXT_ID, (next_id,))
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Базовый интерфейс хранилища сотрудников
+
+Модуль application.db.people проверяет входные данные и делегирует
+хранение объекту-хранилищу. Хранилище наследуется от EmployeeStore и
+обязано реализовать его абстрактные методы; остальные методы имеют
+реализации по умолчанию.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Sequence as SequenceABC
+from itertools import islice
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+# Поля, которые разрешено изменять через update_employee_data
+UPDATABLE_FIELDS = ('name', 'position', 'salary')
+
+# Все поля записи сотрудника
+EMPLOYEE_FIELDS = ('id', 'name', 'position', 'salary', 'hire_date')
+
+
+class EmployeesView(SequenceABC):
+    """
+    Последовательность записей сотрудников только для чтения
+
+    Записи отдаются как MappingProxyType без копирования, итерация не создает
+    новых объектов. Доступ по индексу выполняется за O(1): при первом
+    обращении записи один раз собираются в кортеж. Последующие изменения
+    хранилища представление не видят; независимые изменяемые копии
+    возвращает copy().
+
+    Args:
+        rows: Словарь id -> запись только для чтения
+    """
+
+    __slots__ = ('_rows', '_sequence')
+
+    def __init__(self, rows: Mapping[int, Mapping]):
+        self._rows = rows
+        self._sequence: Optional[Tuple[Mapping, ...]] = None
+
+    def _records(self) -> Tuple[Mapping, ...]:
+        """Записи кортежем в порядке добавления"""
+        if self._sequence is None:
+            self._sequence = tuple(self._rows.values())
+        return self._sequence
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[Mapping]:
+        return iter(self._rows.values())
+
+    def __getitem__(self, index):
+        records = self._records()
+        if isinstance(index, slice):
+            return list(records[index])
+        try:
+            return records[index]
+        except IndexError:
+            raise IndexError("Индекс вне диапазона") from None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._records())!r})"
+
+    def get(self, employee_id: int) -> Optional[Mapping]:
+        """Запись сотрудника по ID или None"""
+        return self._rows.get(employee_id)
+
+    def copy(self) -> List[Dict]:
+        """Независимые изменяемые копии всех записей"""
+        return [dict(row) for row in self._rows.values()]
+
+
+class EmployeesSnapshot(SequenceABC):
+    """
+    Согласованный снимок сотрудников, не меняющийся при последующих записях
+
+    Оборачивает замороженную копию хранилища: последовательность записей
+    только для чтения плюс колоночные методы хранилища.
+
+    Args:
+        store: Копия хранилища, которую больше никто не изменяет
+        version: Номер версии данных, с которой сделан снимок
+    """
+
+    __slots__ = ('_store', '_view', 'version')
+
+    def __init__(self, store: 'EmployeeStore', version: int):
+        self._store = store
+        self._view: Optional[EmployeesView] = None
+        self.version = version
+
+    def _rows(self) -> EmployeesView:
+        # Представление строится при первом обращении: расчетам по колонкам оно не нужно
+        if self._view is None:
+            self._view = self._store.view()
+        return self._view
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __iter__(self) -> Iterator[Mapping]:
+        return iter(self._rows())
+
+    def __getitem__(self, index):
+        return self._rows()[index]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(version={self.version}, employees={len(self)})"
+
+    def get(self, employee_id: int) -> Optional[Mapping]:
+        """Запись сотрудника по ID или None"""
+        return self._rows().get(employee_id)
+
+    def copy(self) -> List[Dict]:
+        """Независимые изменяемые копии всех записей"""
+        return self._store.all()
+
+    def by_position(self, position: str) -> List[Dict]:
+        """Копии записей с указанной должностью"""
+        return self._store.by_position(position)
+
+    def columns(self, *fields: str) -> Dict[str, Sequence]:
+        """Значения указанных полей по всем сотрудникам снимка"""
+        return self._store.columns(*fields)
+
+    def column_chunks(self, fields: Sequence[str], chunk_size: int) -> Iterator[Dict[str, Sequence]]:
+        """Колонки указанных полей порциями не более chunk_size сотрудников"""
+        return self._store.column_chunks(fields, chunk_size)
+
+
+class EmployeeStore(ABC):
+    """Интерфейс хранилища сотрудников"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Количество сотрудников"""
+
+    @abstractmethod
+    def get(self, employee_id: int) -> Optional[Dict]:
+        """Копия записи сотрудника или None"""
+
+    @abstractmethod
+    def all(self) -> List[Dict]:
+        """Копии всех записей в порядке добавления"""
+
+    def view(self) -> EmployeesView:
+        """
+        Записи только для чтения в порядке добавления
+
+        Реализация по умолчанию строит снимок из all(); хранилища, которые
+        держат записи в памяти, отдают их без копирования.
+        """
+        return EmployeesView({row['id']: MappingProxyType(row) for row in self.all()})
+
+    def rows(self) -> List[Mapping]:
+        """
+        Новый список записей только для чтения в порядке добавления
+
+        В отличие от view(), не закрепляет текущую версию данных: список
+        независим, а записи неизменяемы, поэтому последующие изменения
+        хранилища не нужно отделять от него копированием.
+        """
+        return list(self.view())
+
+    def snapshot(self) -> 'EmployeeStore':
+        """
+        Копия хранилища, которую не затронут последующие изменения
+
+        Реализация по умолчанию копирует все записи в MemoryEmployeeStore.
+        Хранилища в памяти переопределяют метод: копия разделяет с ними
+        данные, а копирование откладывается до первой записи (copy-on-write).
+        """
+        from application.db.memory_store import MemoryEmployeeStore
+        return MemoryEmployeeStore(self.all())
+
+    @abstractmethod
+    def by_position(self, position: str) -> List[Dict]:
+        """Копии записей с указанной должностью (без учета регистра)"""
+
+    @abstractmethod
+    def columns(self, *fields: str) -> Dict[str, Sequence]:
+        """Значения указанных полей по всем сотрудникам, без создания словарей"""
+
+    def column_chunks(self, fields: Sequence[str], chunk_size: int) -> Iterator[Dict[str, Sequence]]:
+        """Колонки указанных полей порциями не более chunk_size сотрудников"""
+        rows = iter(self.all())
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield {field: [row[field] for row in chunk] for field in fields}
+
+    @abstractmethod
+    def next_id(self) -> int:
+        """ID, который получит следующий добавленный сотрудник"""
+
+    @abstractmethod
+    def insert(self, name: str, position: str, salary: float, hire_date: str) -> Dict:
+        """Добавить проверенную запись, выделив ей новый ID"""
+
+    def insert_many(self, rows: Sequence[Tuple[str, str, float]], hire_date: str) -> range:
+        """
+        Добавить пакет проверенных записей (имя, должность, оклад)
+
+        ID выделяются одним непрерывным диапазоном, который и возвращается.
+        Реализация по умолчанию добавляет записи по одной.
+        """
+        ids = [self.insert(name, position, salary, hire_date)['id'] for name, position, salary in rows]
+        return range(ids[0], ids[-1] + 1) if ids else range(0)
+
+    @abstractmethod
+    def update(self, employee_id: int, fields: Dict) -> Optional[Dict]:
+        """Применить проверенные поля; вернуть копию записи или None"""
+
+    def update_many(self, updates: Dict[int, Dict]) -> List[int]:
+        """Применить проверенные поля к нескольким сотрудникам; вернуть найденные ID"""
+        return [employee_id for employee_id, fields in updates.items()
+                if self.update(employee_id, fields) is not None]
+
+    @abstractmethod
+    def delete(self, employee_id: int) -> Optional[Dict]:
+        """Удалить сотрудника; вернуть удаленную запись или None"""
+
+    def delete_many(self, employee_ids: Iterable[int]) -> List[int]:
+        """Удалить нескольких сотрудников; вернуть ID удаленных"""
+        return [employee_id for employee_id in employee_ids if self.delete(employee_id) is not None]
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Удалить всех сотрудников и начать нумерацию ID с 1"""
+
+    @abstractmethod
+    def load(self, rows: Iterable[Dict], next_id: int) -> None:
+        """Заменить содержимое хранилища готовыми записями"""
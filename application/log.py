@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Журналирование сообщений модулей бухгалтерии
+
+Модули пакета application пишут сообщения в логгеры с именами вида
+'application.salary'. Сообщения передаются корневому логгеру, поэтому
+приложение настраивает их вывод и уровень обычными средствами logging:
+пакет уровень своего логгера не задает. Вывод в stdout без префиксов, как
+раньше выводились print, включается set_console_output() - он же включает
+уровень INFO. set_quiet() отключает сообщения полностью: вызовы ниже
+установленного уровня завершаются на проверке уровня и не форматируют
+аргументы.
+"""
+
+import logging
+import sys
+
+# Уровень выше CRITICAL: логгер не пропускает ни одного сообщения
+QUIET_LEVEL = logging.CRITICAL + 1
+
+logger = logging.getLogger('application')
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Обработчик, который пишет в текущий sys.stdout (в том числе подмененный)"""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def _configure() -> None:
+    """Настройка логгера пакета: без собственного вывода, уровень задает приложение"""
+    logger.addHandler(logging.NullHandler())
+
+
+def _console_handlers() -> list:
+    """Обработчики вывода в stdout, добавленные set_console_output()"""
+    return [handler for handler in logger.handlers if isinstance(handler, _StdoutHandler)]
+
+
+def _active_level() -> int:
+    """Уровень вне тихого режима: INFO при выводе в stdout, иначе - уровень приложения"""
+    return logging.INFO if _console_handlers() else logging.NOTSET
+
+
+def set_console_output(enabled: bool = True) -> None:
+    """
+    Включить или выключить вывод сообщений в stdout без префиксов
+
+    Вне тихого режима включает для логгера пакета уровень INFO, а при
+    выключении возвращает уровень, заданный приложением. Если корневой
+    логгер тоже настроен на вывод, сообщения будут выведены дважды:
+    приложению достаточно одного из способов.
+
+    Args:
+        enabled: True - выводить сообщения модулей бухгалтерии в stdout
+    """
+    handlers = _console_handlers()
+    if enabled and not handlers:
+        handler = _StdoutHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+    elif not enabled:
+        for handler in handlers:
+            logger.removeHandler(handler)
+
+    if not is_quiet():
+        logger.setLevel(_active_level())
+
+
+def set_quiet(quiet: bool = True) -> None:
+    """
+    Включить или выключить тихий режим
+
+    Args:
+        quiet: True - не выводить сообщения модулей бухгалтерии
+    """
+    logger.setLevel(QUIET_LEVEL if quiet else _active_level())
+
+
+def is_quiet() -> bool:
+    """
+    Проверить, включен ли тихий режим
+
+    Returns:
+        bool: True если сообщения отключены
+    """
+    return logger.level >= QUIET_LEVEL
+
+
+_configure()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Денежные суммы в целых копейках
+
+Расчеты ведутся в копейках (int и array('q')), поэтому суммы любых
+размеров точны. Ставки применяются как точные десятичные дроби с
+округлением половины копейки вверх (ROUND_HALF_UP). Пакетные функции
+работают через map по массивам, без Decimal на каждую строку; Decimal
+используется только для значений, которые не являются целым числом копеек.
+"""
+
+import math
+from array import array
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+from itertools import repeat
+from numbers import Real
+from operator import add, floordiv, mul, truediv
+from typing import Sequence, Tuple, Union
+
+KOPECKS_PER_RUBLE = 100
+
+# Наибольшая сумма в копейках, которую вмещает array('q')
+MAX_KOPECKS = 2 ** 63 - 1
+
+_KOPECK = Decimal('0.01')
+
+Amount = Union[int, float, Decimal]
+
+
+def _decimal_to_kopecks(amount: Decimal) -> int:
+    """Округлить десятичную сумму до копейки (половина - вверх)"""
+    return int(amount.quantize(_KOPECK, rounding=ROUND_HALF_UP) * KOPECKS_PER_RUBLE)
+
+
+def to_kopecks(amount: Amount) -> int:
+    """
+    Перевести сумму в рублях в целые копейки
+
+    Float понимается как десятичное число из его записи (repr): 0.125
+    округляется до 0.13, а 1.005 - до 1.01.
+
+    Raises:
+        ValueError: Для бесконечности и NaN
+    """
+    if isinstance(amount, int):
+        return amount * KOPECKS_PER_RUBLE
+    if isinstance(amount, Decimal):
+        if not amount.is_finite():
+            raise ValueError("Сумма должна быть конечным числом")
+        return _decimal_to_kopecks(amount)
+
+    amount = float(amount)
+    if not math.isfinite(amount):
+        raise ValueError("Сумма должна быть конечным числом")
+    # Быстрый путь: сумма уже является целым числом копеек
+    kopecks = round(amount * KOPECKS_PER_RUBLE)
+    if kopecks / KOPECKS_PER_RUBLE == amount:
+        return kopecks
+    return _decimal_to_kopecks(Decimal(repr(amount)))
+
+
+def to_rubles(kopecks: int) -> float:
+    """Сумма в рублях (ближайший float к точному значению)"""
+    return kopecks / KOPECKS_PER_RUBLE
+
+
+@lru_cache(maxsize=256)
+def rate_ratio(rate: Amount) -> Tuple[int, int]:
+    """
+    Ставка в виде точной дроби (числитель, знаменатель)
+
+    Float берется по его десятичной записи: 0.13 -> (13, 100).
+    """
+    if isinstance(rate, int):
+        return rate, 1
+    if isinstance(rate, float):
+        if not math.isfinite(rate):
+            raise ValueError("Ставка должна быть конечным числом")
+        rate = Decimal(repr(rate))
+    elif not isinstance(rate, Decimal):
+        raise TypeError("Ставка должна быть числом")
+    return rate.as_integer_ratio()
+
+
+def apply_ratio(kopecks: int, numerator: int, denominator: int) -> int:
+    """Доля numerator / denominator от суммы в копейках, округленная до копейки (половина - от нуля)"""
+    product = kopecks * numerator
+    rounded = (2 * abs(product) + denominator) // (2 * denominator)
+    return rounded if product >= 0 else -rounded
+
+
+def apply_rate(kopecks: int, rate: Amount) -> int:
+    """Доля rate от суммы в копейках, округленная до копейки (половина - от нуля)"""
+    return apply_ratio(kopecks, *rate_ratio(rate))
+
+
+def to_kopecks_array(amounts: Sequence[Real]) -> array:
+    """
+    Перевести пакет сумм в рублях в array('q') копеек
+
+    Значения, которые уже являются целым числом копеек, переводятся
+    на уровне C; остальные - по одному через to_kopecks.
+
+    Raises:
+        ValueError: Для бесконечности и NaN
+    """
+    if isinstance(amounts, array) and amounts.typecode == 'q':
+        raise TypeError("Массив 'q' уже содержит копейки")
+
+    values = amounts if isinstance(amounts, array) and amounts.typecode == 'd' else array('d', amounts)
+    try:
+        kopecks = array('q', map(round, map(mul, values, repeat(float(KOPECKS_PER_RUBLE)))))
+    except (ValueError, OverflowError):
+        kopecks = None
+
+    if kopecks is not None and array('d', map(truediv, kopecks, repeat(KOPECKS_PER_RUBLE))) == values:
+        return kopecks
+
+    return array('q', map(to_kopecks, values))
+
+
+def to_rubles_array(kopecks: Sequence[int]) -> array:
+    """Перевести array('q') копеек в array('d') рублей"""
+    return array('d', map(truediv, kopecks, repeat(KOPECKS_PER_RUBLE)))
+
+
+def apply_ratio_array(kopecks: Sequence[int], numerators: Union[int, Sequence[int]], denominator: int) -> array:
+    """
+    Доля numerator / denominator от каждой суммы в копейках с округлением половины вверх
+
+    Args:
+        kopecks: Неотрицательные суммы в копейках
+        numerators: Общий неотрицательный числитель или числитель для каждой суммы
+        denominator: Общий знаменатель
+    """
+    # round_half_up(k * n / d) = (2 * k * n + d) // (2 * d) для k, n >= 0
+    if isinstance(numerators, int):
+        doubled = map(mul, kopecks, repeat(2 * numerators))
+    else:
+        doubled = map(mul, map(mul, kopecks, numerators), repeat(2))
+    return array('q', map(floordiv, map(add, doubled, repeat(denominator)), repeat(2 * denominator)))
+
+
+def apply_rate_array(kopecks: Sequence[int], rate: Amount) -> array:
+    """
+    Доля rate от каждой суммы в копейках с округлением половины вверх
+
+    Суммы и ставка должны быть неотрицательными.
+    """
+    numerator, denominator = rate_ratio(rate)
+    if numerator < 0:
+        raise ValueError("Ставка должна быть неотрицательной")
+    return apply_ratio_array(kopecks, numerator, denominator)
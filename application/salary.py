@@ -4,68 +4,424 @@
 Модуль для расчета зарплаты сотрудников (адаптированный для тестирования)
 """
 
+import csv
+import io
+import logging
+import math
+import os
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from decimal import Decimal
+from itertools import repeat
+from multiprocessing.shared_memory import SharedMemory
+from operator import add, sub
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, TextIO, Tuple, Union
+
+from application.bonuses import BonusPolicy
+from application.money import (
+    KOPECKS_PER_RUBLE, MAX_KOPECKS, apply_rate, to_kopecks, to_kopecks_array, to_rubles, to_rubles_array
+)
+from application.taxes import DEFAULT_CATEGORY, TaxRules
+
+logger = logging.getLogger(__name__)
+
+BONUS_RATE = 0.1  # 10% премия по умолчанию
+INCOME_TAX_RATE = 0.13  # 13% подоходный налог
+SOCIAL_TAX_RATE = 0.22  # 22% социальные взносы
+
+# Действующие правила налогообложения; по умолчанию - плоские ставки выше
+_tax_rules = TaxRules({
+    DEFAULT_CATEGORY: {
+        'income_tax': [(0, INCOME_TAX_RATE)],
+        'social_tax': [(0, SOCIAL_TAX_RATE)]
+    }
+})
+
+# Действующая политика премий; по умолчанию - BONUS_RATE для всех
+_bonus_policy = BonusPolicy(BONUS_RATE * 100)
+
+# Меньше этого количества сотрудников расчет в процессах не окупает запуск пула
+PARALLEL_MIN_EMPLOYEES = 50000
+
+# Порций на процесс: неравномерная загрузка процессов сглаживается
+_CHUNKS_PER_WORKER = 4
+
+# Блок разделяемой памяти расчета в процессах: колонки по count значений
+# array('d') или array('q') (8 байт) подряд в порядке _BLOCK_COLUMNS
+_BLOCK_ITEM_SIZE = 8
+_BLOCK_COLUMNS = ('salary', 'base_salary', 'bonus', 'total', 'numerator')
+
+# Подключенный в процессе пула блок: (блок, count, политика, есть ли числители)
+_payroll_block: Optional[Tuple[SharedMemory, int, BonusPolicy, bool]] = None
+
+# Колонки CSV-отчета по зарплате
+CSV_REPORT_COLUMNS = [
+    'employee_id', 'name', 'base_salary', 'bonus', 'total',
+    'income_tax', 'social_tax', 'net_salary', 'total_taxes'
+]
+
+
+# Последний расчет по базе сотрудников для каждого вида salary_details:
+# details_as_columns -> (ключ, результат). Ключ включает версию данных,
+# поэтому любое изменение сотрудников делает запись устаревшей
+_salary_cache: Dict[bool, Tuple[Tuple, Dict]] = {}
+_salary_cache_stats = {'hits': 0, 'misses': 0}
+_salary_cache_lock = threading.Lock()
+
+
+class InvalidSalaryError(ValueError):
+    """Некорректные значения в пакете зарплат; indices - их позиции"""
+
+    def __init__(self, message: str, indices: List[int]):
+        super().__init__(f"{message} (позиции: {indices[:10]}{'...' if len(indices) > 10 else ''})")
+        self.indices = indices
+
+
+def calculate_payroll_columns(salaries: Sequence[float], ids: Optional[Sequence[int]] = None,
+                              positions: Optional[Sequence[str]] = None,
+                              policy: Optional[BonusPolicy] = None) -> Dict:
+    """
+    Пакетный расчет премий и итогов по колонке окладов
+
+    Оклады переводятся в копейки, премия округляется до копейки, итоги
+    складываются в целых числах и поэтому точны. Вычисления выполняются
+    через map по массивам, без Python-цикла и без словаря на каждого
+    сотрудника.
+
+    Args:
+        salaries: Базовые оклады сотрудников
+        ids: ID сотрудников (нужны политике с персональными процентами)
+        positions: Должности сотрудников (нужны политике с процентами по должностям)
+        policy: Политика премий (None - действующая, см. set_bonus_policy)
+
+    Returns:
+        dict: Колонки 'base_salary', 'bonus', 'total' в рублях, те же колонки
+            в копейках ('base_kopecks', 'bonus_kopecks', 'total_kopecks')
+            и суммы 'total_salary', 'average_salary'
+
+    Raises:
+        InvalidSalaryError: Если оклад не является конечным числом или оклад либо
+            итог не помещаются в array('q') копеек (все позиции в атрибуте indices)
+    """
+    if policy is None:
+        policy = _bonus_policy
+    numerators = _bonus_numerators(policy, len(salaries), ids, positions)
+    try:
+        columns, total_kopecks = _payroll_chunk(salaries, policy, numerators)
+    except (ValueError, OverflowError) as error:
+        raise _invalid_payroll_error(salaries, ids, positions, policy) from error
+    return _payroll_columns(columns, total_kopecks)
+
+
+def _invalid_payroll_error(salaries: Sequence[float], ids: Optional[Sequence[int]],
+                           positions: Optional[Sequence[str]], policy: BonusPolicy) -> InvalidSalaryError:
+    """Ошибка с позициями окладов, которые нельзя рассчитать в копейках (медленный путь)"""
+    indices = []
+    for index, salary in enumerate(salaries):
+        try:
+            base = to_kopecks(salary)
+        except ValueError:
+            indices.append(index)
+            continue
+        bonus = policy.bonus(base, None if ids is None else ids[index],
+                             None if positions is None else positions[index])
+        if max(abs(base), abs(base + bonus)) > MAX_KOPECKS:
+            indices.append(index)
+    return InvalidSalaryError("Оклад и итог должны быть конечными числами в пределах array('q') копеек", indices)
+
+
+def _bonus_numerators(policy: BonusPolicy, count: int, ids: Optional[Sequence[int]],
+                      positions: Optional[Sequence[str]]) -> Optional[array]:
+    """Числители процентов премии для пакета (None - единый процент)"""
+    for column in (ids, positions):
+        if column is not None and len(column) != count:
+            raise ValueError("Длины колонок сотрудников не совпадают")
+    return policy.numerators(ids, positions)
+
+
+def _payroll_kopecks(base: array, policy: BonusPolicy, numerators: Optional[array]) -> Tuple[array, array]:
+    """Колонки премий и итогов в копейках"""
+    bonuses = policy.bonus_array(base, numerators)
+    return bonuses, array('q', map(add, base, bonuses))
+
+
+def _payroll_chunk(salaries: Sequence[float], policy: BonusPolicy,
+                   numerators: Optional[array]) -> Tuple[Dict[str, array], int]:
+    """Колонки расчета порции окладов (в рублях и копейках) и сумма итогов в копейках"""
+    base = to_kopecks_array(salaries)
+    bonuses, totals = _payroll_kopecks(base, policy, numerators)
+    columns = {
+        'base_salary': to_rubles_array(base),
+        'bonus': to_rubles_array(bonuses),
+        'total': to_rubles_array(totals),
+        'base_kopecks': base,
+        'bonus_kopecks': bonuses,
+        'total_kopecks': totals
+    }
+    return columns, sum(totals)
+
+
+def _payroll_columns(columns: Dict[str, array], total_kopecks: int) -> Dict:
+    """Результат calculate_payroll_columns: колонки и суммы"""
+    count = len(columns['total'])
+    return {
+        **columns,
+        'total_salary': to_rubles(total_kopecks),
+        'average_salary': total_kopecks / (KOPECKS_PER_RUBLE * count) if count else 0
+    }
+
+
+def _block_bytes(block: SharedMemory, column: str, count: int, start: int, stop: int) -> memoryview:
+    """Байты строк [start, stop) колонки блока разделяемой памяти"""
+    offset = _BLOCK_ITEM_SIZE * count * _BLOCK_COLUMNS.index(column)
+    return block.buf[offset + _BLOCK_ITEM_SIZE * start:offset + _BLOCK_ITEM_SIZE * stop]
+
+
+def _read_block(block: SharedMemory, column: str, count: int, start: int, stop: int, typecode: str) -> array:
+    """Скопировать строки [start, stop) колонки блока в массив"""
+    values = array(typecode)
+    values.frombytes(_block_bytes(block, column, count, start, stop))
+    return values
+
+
+def _write_block(block: SharedMemory, column: str, count: int, start: int, values: array) -> None:
+    """Записать массив в колонку блока начиная со строки start"""
+    _block_bytes(block, column, count, start, start + len(values))[:] = memoryview(values).cast('B')
+
 
+def _attach_payroll_block(name: str, count: int, policy: BonusPolicy, has_numerators: bool) -> None:
+    """Инициализатор процесса пула: подключить блок и запомнить политику (передается один раз)"""
+    global _payroll_block
+    _payroll_block = (SharedMemory(name=name), count, policy, has_numerators)
 
-def calculate_salary(employees: Optional[List[Dict]] = None) -> Dict:
+
+def _payroll_block_chunk(start: int, stop: int) -> int:
+    """
+    Рассчитать строки [start, stop) подключенного блока в процессе пула
+
+    Оклады и числители читаются из блока, колонки в рублях записываются
+    в него же; родителю возвращается только сумма итогов в копейках.
+    """
+    block, count, policy, has_numerators = _payroll_block
+    salaries = _read_block(block, 'salary', count, start, stop, 'd')
+    numerators = _read_block(block, 'numerator', count, start, stop, 'q') if has_numerators else None
+    base = to_kopecks_array(salaries)
+    bonuses, totals = _payroll_kopecks(base, policy, numerators)
+    for column, values in (('base_salary', base), ('bonus', bonuses), ('total', totals)):
+        _write_block(block, column, count, start, to_rubles_array(values))
+    return sum(totals)
+
+
+def _parallel_payroll_columns(salaries: Sequence[float], workers: int, ids: Optional[Sequence[int]] = None,
+                              positions: Optional[Sequence[str]] = None,
+                              policy: Optional[BonusPolicy] = None) -> Dict:
+    """
+    Расчет calculate_payroll_columns порциями в ProcessPoolExecutor
+
+    Оклады и числители процентов премии кладутся в один блок разделяемой
+    памяти; процессы получают только границы порций, сами читают строки
+    из блока и пишут в него колонки в рублях. Назад по IPC возвращаются
+    только целые суммы порций, поэтому результат совпадает с
+    последовательным расчетом при любом разбиении на порции.
+
+    Returns:
+        dict: Колонки 'base_salary', 'bonus', 'total' в рублях и суммы
+            'total_salary', 'average_salary' (колонок в копейках нет)
+    """
+    if policy is None:
+        policy = _bonus_policy
+    numerators = _bonus_numerators(policy, len(salaries), ids, positions)
+    if not salaries:
+        return calculate_payroll_columns(salaries, ids, positions, policy)
+
+    count = len(salaries)
+    values = salaries if isinstance(salaries, array) and salaries.typecode == 'd' else array('d', salaries)
+    block_columns = len(_BLOCK_COLUMNS) if numerators is not None else len(_BLOCK_COLUMNS) - 1
+    block = SharedMemory(create=True, size=_BLOCK_ITEM_SIZE * count * block_columns)
+    try:
+        _write_block(block, 'salary', count, 0, values)
+        if numerators is not None:
+            _write_block(block, 'numerator', count, 0, numerators)
+
+        chunk_size = -(-count // (workers * _CHUNKS_PER_WORKER))
+        starts = range(0, count, chunk_size)
+        stops = [min(start + chunk_size, count) for start in starts]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_payroll_block,
+                                 initargs=(block.name, count, policy, numerators is not None)) as executor:
+            try:
+                total_kopecks = sum(executor.map(_payroll_block_chunk, starts, stops))
+            except (ValueError, OverflowError) as error:
+                raise _invalid_payroll_error(salaries, ids, positions, policy) from error
+
+        columns = {
+            column: _read_block(block, column, count, 0, count, 'd') for column in ('base_salary', 'bonus', 'total')
+        }
+    finally:
+        block.close()
+        block.unlink()
+
+    return _payroll_columns(columns, total_kopecks)
+
+
+def calculate_salary(employees: Optional[Sequence[Mapping]] = None, details_as_columns: bool = False,
+                     workers: Optional[int] = None) -> Dict:
     """
     Функция для расчета зарплаты сотрудников
 
+    Расчет по базе сотрудников (employees=None) кэшируется до ближайшего
+    изменения данных: повторный вызов не пересчитывает зарплату, а
+    возвращает копию готового результата. Кэш никому не отдается, поэтому
+    вызывающий может менять свой результат. Копия колонок (details_as_columns)
+    - копирование массивов целиком; копия строк создает словарь на каждого
+    сотрудника, поэтому для больших баз используйте колонки. Премии
+    начисляются по действующей политике (см. set_bonus_policy).
+
     Args:
-        employees: Список сотрудников для расчета
+        employees: Список (или представление) сотрудников для расчета
+        details_as_columns: Вернуть salary_details колонками (словарь массивов)
+            вместо списка словарей
+        workers: Количество процессов для расчета (0 - по числу ядер).
+            От PARALLEL_MIN_EMPLOYEES сотрудников премии, итоги и суммы
+            считаются порциями в ProcessPoolExecutor; результат тот же,
+            что и при последовательном расчете. Для больших баз используйте
+            вместе с details_as_columns=True
 
     Returns:
         dict: Результат расчета зарплаты
     """
-    if employees is None:
-        from application.db.people import get_employees
-        employees = get_employees()
+    if workers is not None and (not isinstance(workers, int) or workers < 0):
+        raise ValueError("Количество процессов должно быть неотрицательным целым числом")
 
     calculation_date = datetime.now().strftime('%d.%m.%Y')
+    policy = _bonus_policy
 
-    # Имитируем расчет зарплаты
-    total_salary = 0
-    salary_details = []
+    if employees is None:
+        from application.db.people import get_employees_snapshot, get_employees_version
+
+        # Политика неизменяема, ее замена дает новый ключ
+        key = (get_employees_version(), calculation_date, policy)
+        with _salary_cache_lock:
+            cached = _salary_cache.get(details_as_columns)
+            if cached is not None and cached[0] == key:
+                _salary_cache_stats['hits'] += 1
+                result = _detached_result(cached[1])
+            else:
+                _salary_cache_stats['misses'] += 1
+                result = None
+
+        if result is None:
+            # Закрепляем снимок данных: изменения во время расчета его не затрагивают.
+            # Колонки читаются напрямую, без создания словаря на каждого сотрудника
+            snapshot = get_employees_snapshot()
+            fields = ('id', 'name', 'salary', 'position') if policy.uses_positions else ('id', 'name', 'salary')
+            columns = snapshot.columns(*fields)
+            result = _payroll_result(
+                columns['id'], columns['name'], columns['salary'], columns.get('position'), policy,
+                calculation_date, details_as_columns, workers
+            )
+            with _salary_cache_lock:
+                _salary_cache[details_as_columns] = ((snapshot.version, calculation_date, policy), result)
+            result = _detached_result(result)
+    else:
+        ids = [employee['id'] for employee in employees]
+        names = [employee['name'] for employee in employees]
+        salaries = [employee.get('salary', 100000) for employee in employees]  # Базовая зарплата
+        positions = [employee.get('position', '') for employee in employees] if policy.uses_positions else None
+        result = _payroll_result(ids, names, salaries, positions, policy, calculation_date, details_as_columns,
+                                 workers)
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("🧮 Выполняется расчет зарплаты...")
+        logger.info("   - Обработка базовых окладов")
+        logger.info("   - Расчет премий и надбавок")
+        logger.info("   - Вычисление налогов и удержаний")
+        logger.info("   - Дата расчета: %s", calculation_date)
+        logger.info("✅ Расчет зарплаты завершен!")
 
-    for employee in employees:
-        base_salary = employee.get('salary', 100000)  # Базовая зарплата
-        bonus = base_salary * 0.1  # 10% премия
-        total = base_salary + bonus
+    return result
 
-        salary_details.append({
-            'employee_id': employee['id'],
-            'name': employee['name'],
-            'base_salary': base_salary,
-            'bonus': bonus,
-            'total': total
-        })
 
-        total_salary += total
+def _payroll_result(ids: Sequence[int], names: Sequence[str], salaries: Sequence[float],
+                    positions: Optional[Sequence[str]], policy: BonusPolicy, calculation_date: str,
+                    details_as_columns: bool, workers: Optional[int]) -> Dict:
+    """Собрать результат calculate_salary по колонкам сотрудников"""
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if workers is not None and workers > 1 and len(salaries) >= PARALLEL_MIN_EMPLOYEES:
+        payroll = _parallel_payroll_columns(salaries, workers, ids, positions, policy)
+    else:
+        payroll = calculate_payroll_columns(salaries, ids, positions, policy)
+
+    if details_as_columns:
+        salary_details = {
+            'employee_id': ids,
+            'name': names,
+            'base_salary': payroll['base_salary'],
+            'bonus': payroll['bonus'],
+            'total': payroll['total']
+        }
+    else:
+        salary_details = [
+            {
+                'employee_id': employee_id,
+                'name': name,
+                'base_salary': base_salary,
+                'bonus': bonus,
+                'total': total
+            }
+            for employee_id, name, base_salary, bonus, total in zip(
+                ids, names, payroll['base_salary'], payroll['bonus'], payroll['total']
+            )
+        ]
 
-    result = {
+    return {
         'calculation_date': calculation_date,
-        'total_employees': len(employees),
+        'total_employees': len(ids),
         'salary_details': salary_details,
-        'total_salary': total_salary,
-        'average_salary': total_salary / len(employees) if employees else 0,
+        'total_salary': payroll['total_salary'],
+        'average_salary': payroll['average_salary'],
         'status': 'calculated'
     }
 
-    print("🧮 Выполняется расчет зарплаты...")
-    print("   - Обработка базовых окладов")
-    print("   - Расчет премий и надбавок")
-    print("   - Вычисление налогов и удержаний")
-    print(f"   - Дата расчета: {calculation_date}")
-    print("✅ Расчет зарплаты завершен!")
 
-    return result
+def _detached_result(result: Dict) -> Dict:
+    """Копия кэшированного результата: колонки копируются срезом, строки - dict.copy через map"""
+    details = result['salary_details']
+    if isinstance(details, dict):
+        details = {column: values[:] for column, values in details.items()}
+    else:
+        details = list(map(dict.copy, details))
+    return {**result, 'salary_details': details}
+
+
+def get_salary_cache_stats() -> Dict[str, int]:
+    """
+    Получить счетчики кэша calculate_salary
+
+    Returns:
+        dict: hits - ответы из кэша, misses - полные расчеты
+    """
+    with _salary_cache_lock:
+        return dict(_salary_cache_stats)
+
+
+def clear_salary_cache() -> None:
+    """Очистить кэш calculate_salary и обнулить его счетчики"""
+    with _salary_cache_lock:
+        _salary_cache.clear()
+        _salary_cache_stats['hits'] = 0
+        _salary_cache_stats['misses'] = 0
 
 
 def calculate_individual_salary(base_salary: float, bonus_percent: float = 0.0) -> Dict:
     """
     Расчет зарплаты для конкретного сотрудника
 
+    Суммы считаются в целых копейках, премия округляется до копейки
+    (половина копейки - вверх).
+
     Args:
         base_salary: Базовая зарплата
         bonus_percent: Процент премии
@@ -76,57 +432,257 @@ def calculate_individual_salary(base_salary: float, bonus_percent: float = 0.0)
     if not isinstance(base_salary, (int, float)) or base_salary <= 0:
         raise ValueError("Базовая зарплата должна быть положительным числом")
 
-    if not isinstance(bonus_percent, (int, float)) or bonus_percent < 0:
+    if not isinstance(bonus_percent, (int, float)) or not 0 <= bonus_percent < math.inf:
         raise ValueError("Процент премии должен быть неотрицательным числом")
 
-    bonus = base_salary * (bonus_percent / 100)
-    total = base_salary + bonus
+    # Целые (в том числе bool) переводятся точно, float - по десятичной записи
+    if isinstance(bonus_percent, int):
+        percent = Decimal(int(bonus_percent))
+    else:
+        percent = Decimal(repr(bonus_percent))
+    base = to_kopecks(base_salary)
+    bonus = apply_rate(base, percent / 100)
 
     return {
-        'base_salary': base_salary,
+        'base_salary': to_rubles(base),
         'bonus_percent': bonus_percent,
-        'bonus_amount': bonus,
-        'total_salary': total
+        'bonus_amount': to_rubles(bonus),
+        'total_salary': to_rubles(base + bonus)
     }
 
 
-def calculate_taxes(gross_salary: float) -> Dict:
+def get_bonus_policy() -> BonusPolicy:
+    """
+    Получить действующую политику премий
+
+    Returns:
+        BonusPolicy: Проценты премии по умолчанию, по должностям и по сотрудникам
+    """
+    return _bonus_policy
+
+
+def set_bonus_policy(policy: BonusPolicy) -> BonusPolicy:
+    """
+    Заменить политику премий (таблицы компилируются при создании BonusPolicy)
+
+    Args:
+        policy: Новая политика
+
+    Returns:
+        BonusPolicy: Предыдущая политика
+    """
+    global _bonus_policy
+
+    if not isinstance(policy, BonusPolicy):
+        raise TypeError("Политика должна быть объектом BonusPolicy")
+
+    from application.db.people import set_totals_bonus_policy
+
+    previous, _bonus_policy = _bonus_policy, policy
+    set_totals_bonus_policy(policy)
+    return previous
+
+
+def get_tax_rules() -> TaxRules:
+    """
+    Получить действующие правила налогообложения
+
+    Returns:
+        TaxRules: Шкалы налогов по категориям
+    """
+    return _tax_rules
+
+
+def set_tax_rules(rules: TaxRules) -> TaxRules:
+    """
+    Заменить правила налогообложения (шкалы компилируются при создании TaxRules)
+
+    Args:
+        rules: Новые правила
+
+    Returns:
+        TaxRules: Предыдущие правила
+    """
+    global _tax_rules
+
+    if not isinstance(rules, TaxRules):
+        raise TypeError("Правила должны быть объектом TaxRules")
+
+    previous, _tax_rules = _tax_rules, rules
+    return previous
+
+
+def calculate_taxes(gross_salary: float, category: Optional[str] = None) -> Dict:
     """
     Расчет налогов с зарплаты
 
+    Налоги считаются по шкалам действующих правил (см. set_tax_rules)
+    в целых копейках, каждый налог округляется до копейки (половина
+    копейки - вверх).
+
     Args:
         gross_salary: Валовая зарплата
+        category: Категория налогообложения (None - категория по умолчанию)
 
     Returns:
-        dict: Детали налогообложения
+        dict: Детали налогообложения; tax_rate - ставка подоходного налога
+            на ступени шкалы, в которую попадает зарплата
     """
     if not isinstance(gross_salary, (int, float)) or gross_salary < 0:
         raise ValueError("Зарплата должна быть неотрицательным числом")
 
-    income_tax_rate = 0.13  # 13% подоходный налог
-    social_tax_rate = 0.22  # 22% социальные взносы
+    gross = to_kopecks(gross_salary)
+    income_schedule, social_schedule = _tax_rules.schedules(category)
+    income_tax = income_schedule.tax(gross)
+    social_tax = social_schedule.tax(gross)
 
-    income_tax = gross_salary * income_tax_rate
-    social_tax = gross_salary * social_tax_rate
-    net_salary = gross_salary - income_tax
-    total_taxes = income_tax + social_tax
+    return {
+        'gross_salary': to_rubles(gross),
+        'income_tax': to_rubles(income_tax),
+        'social_tax': to_rubles(social_tax),
+        'net_salary': to_rubles(gross - income_tax),
+        'total_taxes': to_rubles(income_tax + social_tax),
+        'tax_rate': income_schedule.marginal_rate(gross)
+    }
+
+
+def _validate_gross_salaries(gross_salaries: Sequence[float]) -> array:
+    """Проверить пакет зарплат и вернуть его как array('q') копеек"""
+    if not hasattr(gross_salaries, '__len__'):
+        gross_salaries = list(gross_salaries)
+
+    is_array = isinstance(gross_salaries, array) and gross_salaries.typecode == 'd'
+    valid = is_array or all(map(isinstance, gross_salaries, repeat((int, float))))
+
+    # Быстрый путь: проверка типов и минимума выполняется на уровне C,
+    # NaN, бесконечность и слишком большие суммы отсеивает перевод в копейки
+    if valid and (not gross_salaries or min(gross_salaries) >= 0):
+        try:
+            return to_kopecks_array(gross_salaries)
+        except (ValueError, OverflowError):
+            pass
+
+    indices = [
+        i for i, gross in enumerate(gross_salaries)
+        if not isinstance(gross, (int, float)) or not 0 <= gross < math.inf or to_kopecks(gross) > MAX_KOPECKS
+    ]
+    raise InvalidSalaryError("Зарплата должна быть неотрицательным конечным числом в пределах array('q') копеек",
+                             indices)
+
+
+def calculate_taxes_batch(gross_salaries: Sequence[float],
+                          categories: Optional[Sequence[Optional[str]]] = None) -> Dict:
+    """
+    Пакетный расчет налогов; результаты совпадают с calculate_taxes поэлементно
+
+    Ступени шкал ищутся двоичным поиском по скомпилированным таблицам,
+    без условий на каждого сотрудника.
+
+    Args:
+        gross_salaries: Последовательность или массив валовых зарплат
+        categories: Категория налогообложения каждого сотрудника (None - по умолчанию)
+
+    Returns:
+        dict: Массивы 'gross_salary', 'income_tax', 'social_tax', 'net_salary', 'total_taxes'
+            и список 'tax_rate' - ставка подоходного налога по ступени каждого сотрудника
+
+    Raises:
+        InvalidSalaryError: Если есть некорректные значения (все позиции в атрибуте indices)
+    """
+    gross = _validate_gross_salaries(gross_salaries)
+    income_tax, social_tax, tax_rate = _tax_rules.taxes_array(gross, categories, with_rates=True)
 
     return {
-        'gross_salary': gross_salary,
-        'income_tax': income_tax,
-        'social_tax': social_tax,
-        'net_salary': net_salary,
-        'total_taxes': total_taxes,
-        'tax_rate': income_tax_rate
+        'gross_salary': to_rubles_array(gross),
+        'income_tax': to_rubles_array(income_tax),
+        'social_tax': to_rubles_array(social_tax),
+        'net_salary': to_rubles_array(map(sub, gross, income_tax)),
+        'total_taxes': to_rubles_array(map(add, income_tax, social_tax)),
+        'tax_rate': tax_rate
     }
 
 
-def get_salary_report(format_type: str = 'summary') -> Dict:
+def _salary_csv_chunks(chunk_size: int) -> Iterator[Tuple[str, int]]:
+    """Порции CSV-отчета: (текст, количество строк сотрудников)"""
+    from application.db.people import get_employees_snapshot
+
+    # Все порции берутся из одной версии данных и считаются по одной политике
+    snapshot = get_employees_snapshot()
+    policy = _bonus_policy
+    fields = ('id', 'name', 'salary', 'position') if policy.uses_positions else ('id', 'name', 'salary')
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(CSV_REPORT_COLUMNS)
+
+    for chunk in snapshot.column_chunks(fields, chunk_size):
+        payroll = calculate_payroll_columns(chunk['salary'], chunk['id'], chunk.get('position'), policy)
+        totals = payroll['total_kopecks']
+        income_tax, social_tax = _tax_rules.taxes_array(totals)
+        writer.writerows(zip(
+            chunk['id'], chunk['name'], payroll['base_salary'], payroll['bonus'], payroll['total'],
+            to_rubles_array(income_tax), to_rubles_array(social_tax),
+            to_rubles_array(map(sub, totals, income_tax)), to_rubles_array(map(add, income_tax, social_tax))
+        ))
+
+        yield buffer.getvalue(), len(chunk['id'])
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        # Пустая база: отдаем хотя бы заголовок
+        yield buffer.getvalue(), 0
+
+
+def iter_salary_csv(chunk_size: int = 10000) -> Iterator[str]:
+    """
+    Потоковая генерация CSV-отчета по зарплате
+
+    Налоги считаются с итоговой суммы (оклад + премия). В памяти находится
+    не больше одной порции из chunk_size сотрудников. Все порции берутся из
+    одного снимка данных (см. get_employees_snapshot).
+
+    Args:
+        chunk_size: Количество сотрудников в одной порции
+
+    Returns:
+        iterator: Фрагменты CSV-текста; первый начинается с заголовка
+    """
+    for text, _ in _salary_csv_chunks(chunk_size):
+        yield text
+
+
+def write_salary_csv(output: TextIO, chunk_size: int = 10000) -> int:
+    """
+    Записать CSV-отчет по зарплате в файлоподобный объект порциями
+
+    Args:
+        output: Объект с методом write (файл, StringIO, сокет и т.п.)
+        chunk_size: Количество сотрудников в одной порции
+
+    Returns:
+        int: Количество записанных строк сотрудников
+    """
+    flush = getattr(output, 'flush', None)
+    rows_written = 0
+
+    for text, rows in _salary_csv_chunks(chunk_size):
+        output.write(text)
+        if flush is not None:
+            flush()
+        rows_written += rows
+
+    return rows_written
+
+
+def get_salary_report(format_type: str = 'summary', output: Optional[TextIO] = None) -> Dict:
     """
     Функция для генерации отчета по зарплате
 
     Args:
         format_type: Тип отчета ('summary', 'detailed', 'csv')
+        output: Для формата 'csv' - файлоподобный объект, в который
+            потоково записываются строки отчета
 
     Returns:
         dict: Данные отчета
@@ -146,8 +702,12 @@ def get_salary_report(format_type: str = 'summary') -> Dict:
         report_data['includes'] = ['employee_details', 'tax_breakdown', 'bonus_calculation']
     elif format_type == 'summary':
         report_data['includes'] = ['total_amount', 'employee_count']
+    elif format_type == 'csv':
+        report_data['columns'] = list(CSV_REPORT_COLUMNS)
+        if output is not None:
+            report_data['rows_written'] = write_salary_csv(output)
 
-    print("📊 Отчет по зарплате сгенерирован")
+    logger.info("📊 Отчет по зарплате сгенерирован")
     return report_data
 
 
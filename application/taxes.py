@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Правила расчета налогов: прогрессивные шкалы, пределы взносов, категории
+
+Шкала задается списком пар (порог, ставка): ставка действует на часть
+зарплаты выше порога до следующего порога. Плоская ставка - шкала из одной
+пары (0, ставка); предел базы взносов - пара (предел, 0) или пониженная
+ставка выше предела.
+
+При создании шкала компилируется в таблицы: пороги в копейках, налог,
+накопленный до каждого порога, и ставки в виде целых числителей с общим
+знаменателем. Расчет для пакета зарплат ищет ступень двоичным поиском
+(bisect через map) и считает налог в целых числах, без цепочки if на
+каждого сотрудника.
+"""
+
+import math
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from itertools import compress, repeat
+from operator import add, eq, itemgetter, mul, sub
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+from application.money import apply_rate, apply_rate_array, apply_ratio, apply_ratio_array, rate_ratio, to_kopecks
+
+# Виды налогов в правилах
+TAX_KINDS = ('income_tax', 'social_tax')
+
+DEFAULT_CATEGORY = 'standard'
+
+Brackets = Iterable[Tuple[float, float]]
+
+
+class TaxSchedule:
+    """
+    Скомпилированная шкала одного налога
+
+    Args:
+        brackets: Пары (порог в рублях, ставка); первый порог - 0,
+            пороги возрастают, ставки неотрицательны
+    """
+
+    __slots__ = ('brackets', '_upper', '_thresholds', '_numerators', '_cumulative', '_denominator')
+
+    def __init__(self, brackets: Brackets):
+        self.brackets = tuple((threshold, rate) for threshold, rate in brackets)
+        if not self.brackets:
+            raise ValueError("Шкала налога должна содержать хотя бы одну ступень")
+
+        thresholds = [to_kopecks(threshold) for threshold, _ in self.brackets]
+        if thresholds[0] != 0:
+            raise ValueError("Первая ступень шкалы должна начинаться с 0")
+        if any(low >= high for low, high in zip(thresholds, thresholds[1:])):
+            raise ValueError("Пороги шкалы должны строго возрастать")
+
+        ratios = [rate_ratio(rate) for _, rate in self.brackets]
+        if any(numerator < 0 for numerator, _ in ratios):
+            raise ValueError("Ставки налога должны быть неотрицательными")
+
+        # Ставки приводятся к общему знаменателю: налог считается в целых числах
+        denominator = math.lcm(*(denominator for _, denominator in ratios))
+        numerators = [numerator * (denominator // rate_denominator) for numerator, rate_denominator in ratios]
+
+        # Налог (умноженный на знаменатель), накопленный к началу каждой ступени
+        cumulative = [0]
+        for i in range(1, len(thresholds)):
+            cumulative.append(cumulative[-1] + numerators[i - 1] * (thresholds[i] - thresholds[i - 1]))
+
+        self._thresholds = thresholds
+        self._upper = array('q', thresholds[1:])
+        self._numerators = numerators
+        self._cumulative = cumulative
+        self._denominator = denominator
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self.brackets)!r})"
+
+    def _step(self, gross: int) -> int:
+        """Номер ступени, в которую попадает сумма в копейках"""
+        return bisect_right(self._upper, gross)
+
+    def tax(self, gross: int) -> int:
+        """Налог в копейках с суммы в копейках (половина копейки - вверх)"""
+        if len(self._thresholds) == 1:
+            return apply_rate(gross, self.brackets[0][1])
+
+        i = self._step(gross)
+        amount = self._cumulative[i] + self._numerators[i] * (gross - self._thresholds[i])
+        return apply_ratio(amount, 1, self._denominator)
+
+    def tax_array(self, gross: Sequence[int]) -> array:
+        """Налог для пакета неотрицательных сумм в копейках, array('q')"""
+        if len(self._thresholds) == 1:
+            return apply_rate_array(gross, self.brackets[0][1])
+
+        steps = list(map(bisect_right, repeat(self._upper), gross))
+        excess = map(sub, gross, map(self._thresholds.__getitem__, steps))
+        amounts = map(
+            add,
+            map(self._cumulative.__getitem__, steps),
+            map(mul, map(self._numerators.__getitem__, steps), excess)
+        )
+        return apply_ratio_array(amounts, 1, self._denominator)
+
+    def marginal_rate(self, gross: int) -> float:
+        """Ставка ступени, в которую попадает сумма в копейках"""
+        return self.brackets[self._step(gross)][1]
+
+    def marginal_rate_array(self, gross: Sequence[int]) -> list:
+        """Ставка ступени для пакета сумм в копейках (как у marginal_rate)"""
+        rates = [rate for _, rate in self.brackets]
+        if len(rates) == 1:
+            return rates * len(gross)
+        return list(map(rates.__getitem__, map(bisect_right, repeat(self._upper), gross)))
+
+
+class TaxRules:
+    """
+    Набор шкал по категориям сотрудников
+
+    Args:
+        categories: Категория -> {'income_tax': шкала, 'social_tax': шкала}
+        default_category: Категория для сотрудников без явной категории
+
+    Пример:
+        TaxRules({
+            'standard': {
+                'income_tax': [(0, 0.13), (200000, 0.15)],
+                'social_tax': [(0, 0.22), (160000, 0.10)]
+            },
+            'nonresident': {'income_tax': [(0, 0.30)], 'social_tax': [(0, 0.22)]}
+        })
+    """
+
+    def __init__(self, categories: Mapping[str, Mapping[str, Brackets]],
+                 default_category: str = DEFAULT_CATEGORY):
+        self._schedules: Dict[str, Tuple[TaxSchedule, ...]] = {}
+        for category, schedules in categories.items():
+            missing = [kind for kind in TAX_KINDS if kind not in schedules]
+            if missing:
+                raise ValueError(f"Для категории '{category}' не заданы шкалы: {', '.join(missing)}")
+            self._schedules[category] = tuple(TaxSchedule(schedules[kind]) for kind in TAX_KINDS)
+
+        if default_category not in self._schedules:
+            raise ValueError(f"Категория по умолчанию '{default_category}' не описана")
+        self.default_category = default_category
+
+    @property
+    def categories(self) -> Tuple[str, ...]:
+        """Описанные категории"""
+        return tuple(self._schedules)
+
+    def schedules(self, category: Optional[str] = None) -> Tuple[TaxSchedule, TaxSchedule]:
+        """
+        Шкалы (подоходный налог, социальные взносы) для категории
+
+        Raises:
+            ValueError: Для неизвестной категории
+        """
+        try:
+            return self._schedules[self.default_category if category is None else category]
+        except KeyError:
+            raise ValueError(f"Неизвестная категория налогообложения: {category}") from None
+
+    def taxes_array(self, gross: array, categories: Optional[Sequence[Optional[str]]] = None,
+                    with_rates: bool = False) -> Tuple[Sequence, ...]:
+        """
+        Подоходный налог и взносы в копейках для пакета сумм
+
+        Args:
+            gross: Суммы в копейках, array('q')
+            categories: Категория каждого сотрудника (None - по умолчанию)
+            with_rates: Добавить третьим элементом список ставок подоходного
+                налога по ступени каждого сотрудника (как TaxSchedule.marginal_rate)
+
+        Returns:
+            (налог, взносы) или (налог, взносы, ставки) при with_rates
+        """
+        if categories is None:
+            return self._group_taxes(self.schedules(), gross, with_rates)
+
+        if len(categories) != len(gross):
+            raise ValueError("Количество категорий не совпадает с количеством зарплат")
+
+        # Категории сотрудников (None - по умолчанию) считаются на уровне C;
+        # неизвестная категория дает ValueError до расчета
+        resolved = list(map({None: self.default_category}.get, categories, categories))
+        groups = {category: self.schedules(category) for category in Counter(resolved)}
+        if len(groups) == 1:
+            return self._group_taxes(groups.popitem()[1], gross, with_rates)
+
+        # Суммы каждой категории выбираются через compress и считаются своими
+        # таблицами. Результаты собираются обратно за один проход: сотрудник
+        # берет следующее значение из итератора своей категории, порядок внутри
+        # категории при выборке сохранен
+        parts = {}
+        for category, schedules in groups.items():
+            part = array('q', compress(gross, map(eq, resolved, repeat(category))))
+            parts[category] = tuple(map(iter, self._group_taxes(schedules, part, with_rates)))
+
+        result = [array('q', map(next, map(itemgetter(0), map(parts.__getitem__, resolved)))),
+                  array('q', map(next, map(itemgetter(1), map(parts.__getitem__, resolved))))]
+        if with_rates:
+            result.append(list(map(next, map(itemgetter(2), map(parts.__getitem__, resolved)))))
+        return tuple(result)
+
+    @staticmethod
+    def _group_taxes(schedules: Tuple[TaxSchedule, TaxSchedule], gross: array,
+                     with_rates: bool) -> Tuple[Sequence, ...]:
+        """Налоги (и ставки) пакета сумм одной категории"""
+        income, social = schedules
+        if with_rates:
+            return income.tax_array(gross), social.tax_array(gross), income.marginal_rate_array(gross)
+        return income.tax_array(gross), social.tax_array(gross)
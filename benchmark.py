@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Замеры производительности хранилищ сотрудников и расчета зарплаты
+"""
+
+import math
+import os
+import sys
+import time
+import tracemalloc
+from array import array
+from fractions import Fraction
+from itertools import repeat
+from operator import add, mul
+
+from application import set_quiet
+from application.db.columnar_store import ColumnarEmployeeStore
+from application.db.memory_store import MemoryEmployeeStore
+from application.db.sqlite_store import SQLiteEmployeeStore
+from application.db.people import (
+    add_employee, add_employees_bulk, clear_employees_db, set_employee_store
+)
+from application.salary import BONUS_RATE, calculate_payroll_columns, calculate_salary, clear_salary_cache
+
+
+def generate_rows(count):
+    """Сгенерировать записи сотрудников для замеров"""
+    positions = ['Менеджер', 'Программист', 'Аналитик', 'Бухгалтер', 'Дизайнер']
+    for i in range(1, count + 1):
+        yield {
+            'id': i,
+            'name': f"Сотрудник {i}",
+            'position': positions[i % len(positions)],
+            'salary': 100000.0 + i % 1000 * 100,
+            'hire_date': '2023-01-15'
+        }
+
+
+def measure_store(store_class, count):
+    """Память на сотрудника и время calculate_salary для хранилища"""
+    rows = list(generate_rows(count))
+
+    tracemalloc.start()
+    store = store_class(rows, count + 1)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+
+    previous = set_employee_store(store)
+    try:
+        start = time.perf_counter()
+        calculate_salary()
+        elapsed = time.perf_counter() - start
+    finally:
+        set_employee_store(previous)
+
+    return memory / count, elapsed
+
+
+def float_payroll_total(salaries):
+    """Прежний расчет премий и итогов в float, для сравнения"""
+    bonuses = array('d', map(mul, salaries, repeat(BONUS_RATE)))
+    return math.fsum(array('d', map(add, salaries, bonuses)))
+
+
+def measure_money(count):
+    """Время и точность расчета итогов в float и в копейках"""
+    salaries = array('d', (100000.0 + i % 1000 * 100 + i % 7 * 0.1 for i in range(count)))
+
+    start = time.perf_counter()
+    float_total = float_payroll_total(salaries)
+    float_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    total_kopecks = sum(calculate_payroll_columns(salaries)['total_kopecks'])
+    kopecks_elapsed = time.perf_counter() - start
+
+    error = abs(Fraction(float_total) - Fraction(total_kopecks, 100))
+    return float_elapsed, kopecks_elapsed, float(error)
+
+
+def measure_parallel(count, workers):
+    """Время calculate_salary в одном процессе и в пуле процессов"""
+    previous = set_employee_store(ColumnarEmployeeStore(generate_rows(count), count + 1))
+    try:
+        timings = []
+        for mode in (None, workers):
+            clear_salary_cache()
+            start = time.perf_counter()
+            calculate_salary(details_as_columns=True, workers=mode)
+            timings.append(time.perf_counter() - start)
+    finally:
+        set_employee_store(previous)
+
+    return timings
+
+
+def measure_bulk_insert(store_class, count):
+    """Время добавления сотрудников по одному и одним пакетом"""
+    rows = [
+        {'name': row['name'], 'position': row['position'], 'salary': row['salary']}
+        for row in generate_rows(count)
+    ]
+
+    previous = set_employee_store(store_class())
+    try:
+        start = time.perf_counter()
+        for row in rows:
+            add_employee(row['name'], row['position'], row['salary'])
+        loop_elapsed = time.perf_counter() - start
+
+        clear_employees_db()
+        start = time.perf_counter()
+        add_employees_bulk(rows)
+        bulk_elapsed = time.perf_counter() - start
+    finally:
+        set_employee_store(previous)
+
+    return loop_elapsed, bulk_elapsed
+
+
+def main():
+    """Основная функция замеров"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    set_quiet()
+
+    print(f"📏 Замеры на {count} сотрудниках")
+    print("-" * 40)
+
+    for store_class in (MemoryEmployeeStore, ColumnarEmployeeStore):
+        bytes_per_employee, elapsed = measure_store(store_class, count)
+        print(f"{store_class.__name__}:")
+        print(f"   Память на сотрудника: {bytes_per_employee:.0f} байт")
+        print(f"   calculate_salary: {elapsed:.3f} сек")
+
+    float_elapsed, kopecks_elapsed, error = measure_money(count)
+    print("\n💰 Итоги по окладам: float и копейки")
+    print("-" * 40)
+    print(f"   float: {float_elapsed:.3f} сек")
+    print(f"   Копейки (int64): {kopecks_elapsed:.3f} сек")
+    print(f"   Ошибка итога в float: {error:.3g} руб.")
+
+    workers = os.cpu_count() or 1
+    sequential_elapsed, parallel_elapsed = measure_parallel(count, workers)
+    print(f"\n⚙️ calculate_salary в процессах ({workers} шт.)")
+    print("-" * 40)
+    print(f"   Один процесс: {sequential_elapsed:.3f} сек")
+    print(f"   Пул процессов: {parallel_elapsed:.3f} сек")
+
+    import_count = min(count, 50_000)
+    print(f"\n📥 Импорт {import_count} сотрудников")
+    print("-" * 40)
+
+    for store_class in (MemoryEmployeeStore, ColumnarEmployeeStore, SQLiteEmployeeStore):
+        loop_elapsed, bulk_elapsed = measure_bulk_insert(store_class, import_count)
+        print(f"{store_class.__name__}:")
+        print(f"   add_employee в цикле: {loop_elapsed:.3f} сек")
+        print(f"   add_employees_bulk: {bulk_elapsed:.3f} сек")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,8 +5,10 @@
 """
 
 from datetime import datetime
+from application import set_console_output
 from application.salary import calculate_salary, get_salary_report
 from application.db.people import get_employees, update_employee_data
+from application.db.records import Employee, check_employee_id, check_position
 
 
 def main():
@@ -23,7 +25,7 @@ def main():
 
     # Получаем список сотрудников
     print("Получаем список сотрудников...")
-    employees = get_employees()
+    employees = get_employees(copy=True)
     result['operations'].append({
         'operation': 'get_employees',
         'result': employees,
@@ -60,7 +62,12 @@ def get_program_info():
 
 
 def validate_employee_data(employee):
-    """Валидация данных сотрудника"""
+    """Валидация данных сотрудника (поля записи Employee уже проверены, нужен только ID)"""
+    if isinstance(employee, Employee):
+        if employee.id is None:
+            return False, "Отсутствует обязательное поле: id"
+        return True, "Данные корректны"
+
     if not isinstance(employee, dict):
         return False, "Данные сотрудника должны быть словарем"
 
@@ -69,17 +76,17 @@ def validate_employee_data(employee):
         if field not in employee:
             return False, f"Отсутствует обязательное поле: {field}"
 
-    if not isinstance(employee['id'], int) or employee['id'] <= 0:
-        return False, "ID должен быть положительным числом"
-
-    if not isinstance(employee['name'], str) or not employee['name'].strip():
-        return False, "Имя должно быть непустой строкой"
-
-    if not isinstance(employee['position'], str) or not employee['position'].strip():
-        return False, "Должность должна быть непустой строкой"
+    try:
+        check_employee_id(employee['id'])
+        if not isinstance(employee['name'], str) or not employee['name'].strip():
+            return False, "Имя должно быть непустой строкой"
+        check_position(employee['position'])
+    except ValueError as error:
+        return False, str(error)
 
     return True, "Данные корректны"
 
 
 if __name__ == '__main__':
+    set_console_output()
     main()
\ No newline at end of file
@@ -32,6 +32,11 @@ def check_dependencies():
         'unittest', 'requests', 'selenium', 'webdriver_manager'
     ]
 
+    # Без необязательных модулей часть тестов пропускается, но запуск возможен
+    optional_modules = [
+        'aiohttp'
+    ]
+
     missing_modules = []
 
     for module in required_modules:
@@ -42,6 +47,13 @@ def check_dependencies():
             print(f"❌ {module} - НЕ УСТАНОВЛЕН")
             missing_modules.append(module)
 
+    for module in optional_modules:
+        try:
+            __import__(module)
+            print(f"✅ {module}")
+        except ImportError:
+            print(f"⚠️ {module} - не установлен, зависящие от него тесты будут пропущены")
+
     if missing_modules:
         print(f"\n⚠️ Отсутствующие модули: {', '.join(missing_modules)}")
         print("Установите зависимости: pip install -r requirements_tests.txt")
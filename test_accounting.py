@@ -4,24 +4,68 @@
 Unit-тесты для программы "Бухгалтерия"
 """
 
+import csv
+import io
+import json
+import logging
+import math
 import unittest
 from unittest.mock import patch, MagicMock
 import sys
 import os
+import pickle
+import sqlite3
+import tempfile
+from array import array
+from decimal import Decimal
+import threading
+import time
 
 # Добавляем путь к проекту
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from main import main, get_program_info, validate_employee_data
+from application import set_console_output, set_quiet, is_quiet
 from application.salary import (
     calculate_salary, calculate_individual_salary, calculate_taxes,
-    get_salary_report, validate_salary_data
+    get_salary_report, validate_salary_data, calculate_payroll_columns,
+    calculate_taxes_batch, InvalidSalaryError, iter_salary_csv, CSV_REPORT_COLUMNS,
+    get_salary_cache_stats, clear_salary_cache, get_tax_rules, set_tax_rules,
+    get_bonus_policy, set_bonus_policy
 )
+from application.bonuses import BonusPolicy
+from application.taxes import TaxRules, TaxSchedule
 from application.db.people import (
-    get_employees, get_employee_by_id, add_employee, remove_employee,
+    get_employees, get_employee_by_id, add_employee, add_employee_record, remove_employee,
     update_employee_data, get_employees_by_position, get_employees_count,
-    clear_employees_db, reset_employees_db
+    clear_employees_db, reset_employees_db, get_employee_columns,
+    set_employee_store, add_employees_bulk, InvalidEmployeeDataError,
+    update_employees_bulk, remove_employees_bulk, get_employees_view,
+    employees_transaction, get_employees_snapshot, get_employees_version,
+    get_salary_totals, get_employee_store
 )
+from application.db.memory_store import PAGE_SIZE, MemoryEmployeeStore
+from application.db.records import (
+    MAX_BONUS_PERCENT, MAX_SALARY, Employee, validate_employee_columns, validate_employees
+)
+from application.db.columnar_store import ColumnarEmployeeStore
+from application.db.rwlock import ReadWriteLock
+from application.money import (
+    to_kopecks, to_rubles, apply_rate, to_kopecks_array, apply_rate_array, to_rubles_array, apply_ratio,
+    apply_ratio_array
+)
+from application.db.sqlite_store import SQLiteEmployeeStore
+from application.db.store import EmployeeStore
+from application.db.aggregates import SalaryTotals
+
+
+def setUpModule():
+    """Сообщения модулей в тестах не нужны"""
+    set_quiet()
+
+
+def tearDownModule():
+    set_quiet(False)
 
 
 class TestMainModule(unittest.TestCase):
@@ -72,6 +116,10 @@ class TestMainModule(unittest.TestCase):
         self.assertFalse(is_valid)
         self.assertIn("положительным числом", message)
 
+        # Пустое имя
+        invalid_employee = {'id': 1, 'name': '  ', 'position': 'Менеджер'}
+        self.assertEqual(validate_employee_data(invalid_employee), (False, "Имя должно быть непустой строкой"))
+
     @patch('builtins.print')
     def test_main_function(self, mock_print):
         """Тест основной функции программы"""
@@ -83,6 +131,8 @@ class TestMainModule(unittest.TestCase):
         self.assertIn('end_time', result)
         self.assertIn('operations', result)
         self.assertEqual(len(result['operations']), 2)
+        # Результат - обычные словари и списки
+        self.assertEqual(json.loads(json.dumps(result)), result)
 
 
 class TestSalaryModule(unittest.TestCase):
@@ -92,8 +142,7 @@ class TestSalaryModule(unittest.TestCase):
         """Подготовка перед каждым тестом"""
         reset_employees_db()
 
-    @patch('builtins.print')
-    def test_calculate_salary(self, mock_print):
+    def test_calculate_salary(self):
         """Тест расчета зарплаты"""
         result = calculate_salary()
 
@@ -104,8 +153,7 @@ class TestSalaryModule(unittest.TestCase):
         self.assertEqual(result['total_employees'], 3)
         self.assertGreater(result['total_salary'], 0)
 
-    @patch('builtins.print')
-    def test_calculate_salary_with_custom_employees(self, mock_print):
+    def test_calculate_salary_with_custom_employees(self):
         """Тест расчета зарплаты с пользовательским списком"""
         custom_employees = [
             {'id': 1, 'name': 'Тест', 'position': 'Тестер', 'salary': 50000}
@@ -116,6 +164,170 @@ class TestSalaryModule(unittest.TestCase):
         self.assertEqual(result['total_employees'], 1)
         self.assertEqual(result['salary_details'][0]['base_salary'], 50000)
 
+    def test_calculate_salary_cache(self):
+        """Тест кэша расчета зарплаты по версии данных"""
+        clear_salary_cache()
+        first = calculate_salary()
+        second = calculate_salary()
+
+        self.assertEqual(get_salary_cache_stats(), {'hits': 1, 'misses': 1})
+        self.assertEqual(second, first)
+
+        # Любое изменение базы делает кэш устаревшим
+        changes = [
+            lambda: update_employee_data(1, salary=130000.0),
+            lambda: add_employee("Тест", "Тестер"),
+            lambda: remove_employee(2),
+            clear_employees_db,
+            reset_employees_db
+        ]
+        for change in changes:
+            change()
+            result = calculate_salary()
+            self.assertEqual(result['total_employees'], get_employees_count())
+        self.assertEqual(get_salary_cache_stats(), {'hits': 1, 'misses': 1 + len(changes)})
+
+        # Расчет по переданному списку не использует кэш
+        calculate_salary([{'id': 1, 'name': "Тест", 'salary': 1000.0}])
+        self.assertEqual(calculate_salary()['total_salary'], first['total_salary'])
+        self.assertEqual(get_salary_cache_stats(), {'hits': 2, 'misses': 1 + len(changes)})
+
+    def test_calculate_salary_cache_results_are_independent(self):
+        """Тест: результат из кэша - обычные списки и словари, не зависящие от прошлых вызовов"""
+        first = calculate_salary()
+        second = calculate_salary()
+        self.assertIs(type(second['salary_details']), list)
+        self.assertIs(type(second['salary_details'][0]), dict)
+        self.assertIsNot(second['salary_details'][0], first['salary_details'][0])
+
+        first['salary_details'][0]['total'] = 0
+        first['salary_details'].clear()
+        self.assertEqual(calculate_salary(), second)
+        self.assertEqual(json.loads(json.dumps(second)), second)
+        self.assertEqual(pickle.loads(pickle.dumps(second)), second)
+
+        columns = calculate_salary(details_as_columns=True)
+        columns['salary_details']['total'][0] = 0
+        columns['salary_details']['name'].append("Лишний")
+        details = calculate_salary(details_as_columns=True)['salary_details']
+        self.assertEqual(details['total'][0], second['salary_details'][0]['total'])
+        self.assertEqual(len(details['name']), second['total_employees'])
+        self.assertEqual(pickle.loads(pickle.dumps(details)), details)
+
+        # Расчет по переданному списку тоже возвращает обычные словари
+        custom = calculate_salary([{'id': 1, 'name': "Тест", 'salary': 1000.0}])
+        self.assertEqual(json.loads(json.dumps(custom))['salary_details'], custom['salary_details'])
+
+    @patch('application.salary.PARALLEL_MIN_EMPLOYEES', 0)
+    def test_calculate_salary_in_processes(self):
+        """Тест: расчет в процессах совпадает с последовательным до бита"""
+        employees = [
+            {'id': i, 'name': f"Сотрудник {i}", 'salary': 1e9 if i % 97 == 0 else 0.1 * i + 1e-7}
+            for i in range(1, 2001)
+        ]
+        sequential = calculate_salary(employees, details_as_columns=True)
+
+        for workers in (2, 3):
+            parallel = calculate_salary(employees, details_as_columns=True, workers=workers)
+            self.assertEqual(parallel['total_salary'], sequential['total_salary'])
+            self.assertEqual(parallel['average_salary'], sequential['average_salary'])
+            for column in ('employee_id', 'base_salary', 'bonus', 'total'):
+                self.assertEqual(list(parallel['salary_details'][column]),
+                                 list(sequential['salary_details'][column]))
+
+        with self.assertRaises(ValueError):
+            calculate_salary(employees, workers=-1)
+
+    def test_calculate_salary_details_as_columns(self):
+        """Тест расчета зарплаты с деталями в виде колонок"""
+        rows_result = calculate_salary()
+        columns_result = calculate_salary(details_as_columns=True)
+
+        details = columns_result['salary_details']
+        self.assertEqual(list(details['employee_id']), [1, 2, 3])
+        self.assertEqual(list(details['total']), [row['total'] for row in rows_result['salary_details']])
+        self.assertEqual(columns_result['total_salary'], rows_result['total_salary'])
+        self.assertAlmostEqual(columns_result['total_salary'], 495000.0)
+        self.assertAlmostEqual(columns_result['average_salary'], 165000.0)
+
+    def test_calculate_payroll_columns(self):
+        """Тест пакетного расчета премий и итогов"""
+        payroll = calculate_payroll_columns([100000, 50000.5])
+
+        self.assertEqual(list(payroll['bonus']), [100000 * 0.1, 50000.5 * 0.1])
+        self.assertEqual(list(payroll['total']), [110000.0, 50000.5 + 50000.5 * 0.1])
+
+        empty = calculate_payroll_columns([])
+        self.assertEqual(empty['total_salary'], 0)
+        self.assertEqual(empty['average_salary'], 0)
+
+    def test_calculate_payroll_columns_overflow(self):
+        """Тест: оклады и итоги вне array('q') копеек дают InvalidSalaryError с позициями"""
+        # 8.5e16 рублей помещаются в копейках, но не вместе с премией 10%
+        with self.assertRaises(InvalidSalaryError) as context:
+            calculate_payroll_columns([1e20, 100000, 8.5e16, math.nan])
+        self.assertEqual(context.exception.indices, [0, 2, 3])
+
+    @patch('application.salary.PARALLEL_MIN_EMPLOYEES', 0)
+    def test_calculate_salary_in_processes_overflow(self):
+        """Тест: переполнение в процессах дает ту же ошибку, что и последовательный расчет"""
+        employees = [{'id': i, 'name': f"Сотрудник {i}", 'salary': 1000.0} for i in range(1, 101)]
+        employees[42]['salary'] = 1e20
+        with self.assertRaises(InvalidSalaryError) as context:
+            calculate_salary(employees, details_as_columns=True, workers=2)
+        self.assertEqual(context.exception.indices, [42])
+
+    @patch('application.salary.PARALLEL_MIN_EMPLOYEES', 0)
+    def test_bonus_policy(self):
+        """Тест премий по должностям и персональных премий"""
+        clear_salary_cache()
+        self.assertEqual(list(calculate_salary(details_as_columns=True)['salary_details']['bonus']),
+                         [12000, 18000, 15000])
+
+        policy = BonusPolicy(10, positions={'программист': 15, 'Аналитик': 12.5}, employees={1: 20})
+        previous = set_bonus_policy(policy)
+        try:
+            self.assertIs(get_bonus_policy(), policy)
+            result = calculate_salary(details_as_columns=True)
+            self.assertEqual(list(result['salary_details']['bonus']), [24000, 27000, 18750])
+            self.assertEqual(result['total_salary'], 450000 + 69750)
+            self.assertEqual(get_salary_cache_stats()['misses'], 2)
+
+            rows = list(csv.DictReader(io.StringIO(''.join(iter_salary_csv()))))
+            self.assertEqual([float(row['bonus']) for row in rows], [24000, 27000, 18750])
+
+            employees = [
+                {'id': i, 'name': f"Сотрудник {i}", 'position': ('Программист', 'Тестер')[i % 2],
+                 'salary': 1000.05 * i}
+                for i in range(1, 101)
+            ]
+            sequential = calculate_salary(employees, details_as_columns=True)
+            parallel = calculate_salary(employees, details_as_columns=True, workers=2)
+            self.assertEqual(list(parallel['salary_details']['bonus']), list(sequential['salary_details']['bonus']))
+            self.assertEqual(sequential['salary_details']['bonus'][1], 300.02)  # 300.015 - половина копейки вверх
+            self.assertEqual(sequential['salary_details']['bonus'][0], 200.01)  # персональные 20%
+
+            self.assertEqual(policy.percent(3, 'АНАЛИТИК'), 12.5)
+            self.assertEqual(policy.percent(1, 'Аналитик'), 20)
+            self.assertEqual(policy.bonus(100001, position='Аналитик'), 12500)
+            with self.assertRaises(ValueError):
+                calculate_payroll_columns([1000.0], ids=[1])
+        finally:
+            set_bonus_policy(previous)
+
+    def test_bonus_policy_invalid(self):
+        """Тест проверки политики премий"""
+        for kwargs in ({'default_percent': -1}, {'positions': {'Тестер': math.nan}},
+                       {'positions': {'Тестер': 5, 'ТЕСТЕР': 7}}, {'employees': {1: MAX_BONUS_PERCENT + 0.5}}):
+            with self.assertRaises(ValueError):
+                BonusPolicy(**kwargs)
+        with self.assertRaises(TypeError):
+            BonusPolicy(employees={1: '10'})
+        with self.assertRaises(TypeError):
+            set_bonus_policy({'default_percent': 10})
+        with self.assertRaises(ValueError):
+            calculate_payroll_columns([1000.0, 2000.0], ids=[1], positions=['Тестер'] * 2)
+
     def test_calculate_individual_salary(self):
         """Тест расчета индивидуальной зарплаты"""
         result = calculate_individual_salary(100000, 15)
@@ -133,6 +345,16 @@ class TestSalaryModule(unittest.TestCase):
         with self.assertRaises(ValueError):
             calculate_individual_salary(100000, -5)
 
+        for percent in (math.inf, math.nan, "10"):
+            with self.assertRaises(ValueError):
+                calculate_individual_salary(100000, percent)
+
+    def test_calculate_individual_salary_int_percent(self):
+        """Тест: целый процент (в том числе bool) переводится точно"""
+        self.assertEqual(calculate_individual_salary(100000, True)['bonus_amount'], 1000)
+        self.assertEqual(calculate_individual_salary(100000, False)['bonus_amount'], 0)
+        self.assertEqual(calculate_individual_salary(100000, 10 ** 6)['bonus_amount'], 10 ** 9)
+
     def test_calculate_taxes(self):
         """Тест расчета налогов"""
         result = calculate_taxes(100000)
@@ -147,8 +369,30 @@ class TestSalaryModule(unittest.TestCase):
         with self.assertRaises(ValueError):
             calculate_taxes(-1000)
 
-    @patch('builtins.print')
-    def test_get_salary_report(self, mock_print):
+    def test_calculate_taxes_batch_matches_scalar(self):
+        """Тест совпадения пакетного расчета налогов с поштучным"""
+        salaries = [100000, 0, 123456.78, 99999.99]
+        batch = calculate_taxes_batch(salaries)
+
+        for i, gross in enumerate(salaries):
+            scalar = calculate_taxes(gross)
+            for field in ('income_tax', 'social_tax', 'net_salary', 'total_taxes', 'tax_rate'):
+                self.assertEqual(batch[field][i], scalar[field])
+
+    def test_calculate_taxes_batch_invalid_input(self):
+        """Тест пакетного расчета налогов с некорректными данными"""
+        with self.assertRaises(InvalidSalaryError) as context:
+            calculate_taxes_batch([100000, -1, "50000", 20000, -5])
+
+        self.assertEqual(context.exception.indices, [1, 2, 4])
+        self.assertIsInstance(context.exception, ValueError)
+
+        # Суммы, которые не помещаются в array('q') копеек
+        with self.assertRaises(InvalidSalaryError) as context:
+            calculate_taxes_batch([1e20, 100000, 2 ** 62])
+        self.assertEqual(context.exception.indices, [0, 2])
+
+    def test_get_salary_report(self):
         """Тест генерации отчета по зарплате"""
         result = get_salary_report('summary')
 
@@ -157,6 +401,78 @@ class TestSalaryModule(unittest.TestCase):
         self.assertIn('report_date', result)
         self.assertIn('report_id', result)
 
+    def test_get_salary_report_csv_streams_rows(self):
+        """Тест потоковой записи CSV-отчета"""
+        output = io.StringIO()
+        result = get_salary_report('csv', output=output)
+
+        self.assertEqual(result['rows_written'], 3)
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        self.assertEqual(rows[0], result['columns'])
+        self.assertEqual(len(rows), 4)
+
+        first = dict(zip(rows[0], rows[1]))
+        self.assertEqual(first['employee_id'], '1')
+        self.assertEqual(float(first['total']), 120000.0 + 120000.0 * 0.1)
+        self.assertEqual(float(first['income_tax']), calculate_taxes(float(first['total']))['income_tax'])
+
+    def test_iter_salary_csv_chunks(self):
+        """Тест разбиения CSV-отчета на порции"""
+        chunks = list(iter_salary_csv(chunk_size=2))
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(chunks[0].startswith('employee_id,'))
+        self.assertEqual(chunks[1].count('\n'), 1)
+
+        clear_employees_db()
+        self.assertEqual(list(iter_salary_csv()), [','.join(CSV_REPORT_COLUMNS) + '\n'])
+
+    def test_quiet_mode_suppresses_messages(self):
+        """Тест вывода сообщений через logging, вывода в stdout и тихого режима"""
+        set_quiet(False)
+        try:
+            self.assertFalse(is_quiet())
+            with self.assertLogs('application', level='INFO') as logs:
+                calculate_salary()
+            self.assertIn("INFO:application.salary:✅ Расчет зарплаты завершен!", logs.output)
+
+            # В stdout сообщения выводятся только после set_console_output()
+            with patch('sys.stdout', new_callable=io.StringIO) as stdout:
+                calculate_salary()
+            self.assertEqual(stdout.getvalue(), "")
+
+            set_console_output()
+            with patch('sys.stdout', new_callable=io.StringIO) as stdout:
+                calculate_salary()
+            self.assertIn("✅ Расчет зарплаты завершен!\n", stdout.getvalue())
+
+            set_quiet()
+            self.assertTrue(is_quiet())
+            with patch('sys.stdout', new_callable=io.StringIO) as stdout:
+                calculate_salary()
+                get_employees()
+                add_employee("Тест", "Тестер")
+                get_salary_report()
+            self.assertEqual(stdout.getvalue(), "")
+        finally:
+            set_console_output(False)
+            set_quiet()
+
+    def test_logging_level_is_left_to_application(self):
+        """Тест: вне тихого режима и без вывода в stdout уровень задает приложение"""
+        package_logger = logging.getLogger('application')
+        set_quiet(False)
+        try:
+            self.assertEqual(package_logger.level, logging.NOTSET)
+            with patch.object(logging.getLogger(), 'level', logging.ERROR):
+                self.assertEqual(package_logger.getEffectiveLevel(), logging.ERROR)
+
+            set_console_output()
+            self.assertEqual(package_logger.level, logging.INFO)
+            set_console_output(False)
+            self.assertEqual(package_logger.level, logging.NOTSET)
+        finally:
+            set_quiet()
+
     def test_get_salary_report_invalid_format(self):
         """Тест генерации отчета с неправильным форматом"""
         with self.assertRaises(ValueError):
@@ -173,6 +489,134 @@ class TestSalaryModule(unittest.TestCase):
         self.assertFalse(is_valid)
 
 
+class TestMoneyModule(unittest.TestCase):
+    """Тесты денежной арифметики в копейках"""
+
+    def test_to_kopecks_rounds_half_up(self):
+        """Тест перевода сумм в копейки"""
+        self.assertEqual(to_kopecks(100000), 10000000)
+        self.assertEqual(to_kopecks(0.1), 10)
+        self.assertEqual(to_kopecks(0.125), 13)
+        self.assertEqual(to_kopecks(1.005), 101)
+        self.assertEqual(to_kopecks(Decimal('2.675')), 268)
+        self.assertEqual(to_rubles(268), 2.68)
+        for value in (math.inf, math.nan):
+            with self.assertRaises(ValueError):
+                to_kopecks(value)
+
+    def test_apply_rate_rounds_half_up(self):
+        """Тест округления доли до копейки"""
+        self.assertEqual(apply_rate(50, 0.13), 7)  # 6.5 коп.
+        self.assertEqual(apply_rate(-50, 0.13), -7)
+        self.assertEqual(apply_rate(1234, 0.1), 123)
+        self.assertEqual(apply_rate(1235, Decimal('0.1')), 124)
+
+    def test_apply_ratio_array_matches_scalar(self):
+        """Тест: пакетная доля с общим и поштучными числителями совпадает с поштучной"""
+        kopecks = array('q', [0, 1, 50, 1234, 1235, 10 ** 12])
+        numerators = array('q', [3, 13, 13, 1, 7, 0])
+        self.assertEqual(list(apply_ratio_array(kopecks, 13, 100)), [apply_ratio(k, 13, 100) for k in kopecks])
+        self.assertEqual(list(apply_ratio_array(kopecks, numerators, 20)),
+                         [apply_ratio(k, n, 20) for k, n in zip(kopecks, numerators)])
+        self.assertEqual(apply_ratio_array([50], 13, 100)[0], 7)  # 6.5 коп.
+
+    def test_batch_matches_scalar(self):
+        """Тест совпадения пакетных функций с поштучными"""
+        amounts = [0.0, 0.1, 0.125, 1.005, 99999.99, 123456.78, 5]
+        kopecks = to_kopecks_array(amounts)
+
+        self.assertEqual(list(kopecks), [to_kopecks(amount) for amount in amounts])
+        self.assertEqual(list(apply_rate_array(kopecks, 0.13)), [apply_rate(k, 0.13) for k in kopecks])
+        self.assertEqual(list(to_rubles_array(kopecks)), [to_rubles(k) for k in kopecks])
+        with self.assertRaises(ValueError):
+            to_kopecks_array([1.0, math.nan])
+
+    def test_totals_do_not_drift(self):
+        """Тест: суммы в копейках не накапливают ошибку округления"""
+        payroll = calculate_payroll_columns([0.1] * 100000)
+
+        self.assertEqual(payroll['total_salary'], 11000.0)
+        self.assertNotEqual(math.fsum(array('d', [0.1 * 1.1]) * 100000), 11000.0)
+        self.assertEqual(calculate_taxes(0.5)['income_tax'], 0.07)
+
+
+class TestTaxRules(unittest.TestCase):
+    """Тесты правил налогообложения"""
+
+    def setUp(self):
+        """Подключаем прогрессивную шкалу, предел взносов и вторую категорию"""
+        self.previous_rules = set_tax_rules(TaxRules({
+            'standard': {
+                'income_tax': [(0, 0.13), (200000, 0.15)],
+                'social_tax': [(0, 0.22), (160000, 0.10)]
+            },
+            'capped': {
+                'income_tax': [(0, 0.13)],
+                'social_tax': [(0, 0.22), (160000, 0)]
+            }
+        }))
+
+    def tearDown(self):
+        """Возвращаем прежние правила"""
+        set_tax_rules(self.previous_rules)
+
+    def test_progressive_brackets(self):
+        """Тест прогрессивной шкалы и пониженной ставки взносов выше предела"""
+        result = calculate_taxes(300000)
+
+        self.assertEqual(result['income_tax'], 200000 * 0.13 + 100000 * 0.15)
+        self.assertEqual(result['social_tax'], 160000 * 0.22 + 140000 * 0.10)
+        self.assertEqual(result['net_salary'], 300000 - 41000)
+        self.assertEqual(result['tax_rate'], 0.15)
+        self.assertEqual(calculate_taxes(100000)['income_tax'], 13000)
+        self.assertEqual(calculate_taxes(0.05)['income_tax'], 0.01)
+
+    def test_categories(self):
+        """Тест шкал по категориям сотрудников"""
+        self.assertEqual(calculate_taxes(300000, category='capped')['social_tax'], 35200)
+        with self.assertRaises(ValueError):
+            calculate_taxes(300000, category='unknown')
+
+        batch = calculate_taxes_batch([300000, 300000, 50000], ['capped', None, 'capped'])
+        self.assertEqual(list(batch['social_tax']), [35200, 49200, 11000])
+        self.assertEqual(list(batch['income_tax']), [39000, 41000, 6500])
+        with self.assertRaises(ValueError):
+            calculate_taxes_batch([300000], ['capped', 'capped'])
+
+    def test_batch_matches_scalar(self):
+        """Тест совпадения пакетного расчета по шкалам с поштучным"""
+        salaries = [0, 0.05, 159999.99, 160000, 160000.01, 199999.99, 199999.995, 200000, 200000.01, 1234567.89]
+        batch = calculate_taxes_batch(salaries)
+
+        for i, gross in enumerate(salaries):
+            scalar = calculate_taxes(gross)
+            for field in ('income_tax', 'social_tax', 'net_salary', 'total_taxes', 'tax_rate'):
+                self.assertEqual(batch[field][i], scalar[field])
+        self.assertEqual(batch['tax_rate'][5:9], [0.13, 0.15, 0.15, 0.15])
+
+    def test_batch_tax_rate_matches_scalar_by_category(self):
+        """Тест ставки по ступени в пакетном расчете с категориями"""
+        salaries = [199999.99, 200000, 200000.01, 200000.01, 50000]
+        categories = [None, 'capped', 'standard', 'capped', None]
+        batch = calculate_taxes_batch(salaries, categories)
+
+        for i, (gross, category) in enumerate(zip(salaries, categories)):
+            self.assertEqual(batch['tax_rate'][i], calculate_taxes(gross, category=category)['tax_rate'])
+        self.assertEqual(batch['tax_rate'], [0.13, 0.13, 0.15, 0.13, 0.13])
+        self.assertEqual(calculate_taxes_batch([300000], ['capped'])['tax_rate'], [0.13])
+
+    def test_invalid_schedules(self):
+        """Тест проверки шкал при компиляции"""
+        for brackets in ([], [(100, 0.1)], [(0, 0.1), (0, 0.2)], [(0, -0.1)]):
+            with self.assertRaises(ValueError):
+                TaxSchedule(brackets)
+        with self.assertRaises(ValueError):
+            TaxRules({'standard': {'income_tax': [(0, 0.13)]}})
+        with self.assertRaises(TypeError):
+            set_tax_rules({'standard': {}})
+        self.assertIsInstance(get_tax_rules(), TaxRules)
+
+
 class TestPeopleModule(unittest.TestCase):
     """Тесты модуля сотрудников"""
 
@@ -180,8 +624,7 @@ class TestPeopleModule(unittest.TestCase):
         """Подготовка перед каждым тестом"""
         reset_employees_db()
 
-    @patch('builtins.print')
-    def test_get_employees(self, mock_print):
+    def test_get_employees(self):
         """Тест получения списка сотрудников"""
         employees = get_employees()
 
@@ -191,8 +634,56 @@ class TestPeopleModule(unittest.TestCase):
         self.assertIn('name', employees[0])
         self.assertIn('position', employees[0])
 
-    @patch('builtins.print')
-    def test_get_employee_by_id(self, mock_print):
+    def test_get_employees_returns_independent_copies(self):
+        """Тест: изменение результата get_employees не затрагивает базу"""
+        employees = get_employees()
+        with self.assertRaises(TypeError):
+            employees[0]['salary'] = 1.0
+        employees.clear()
+
+        copies = get_employees(copy=True)
+        copies[0]['salary'] = 1.0
+
+        self.assertEqual(get_employee_by_id(1)['salary'], 120000.0)
+        self.assertEqual(get_employees_count(), 3)
+
+    def test_get_employees_view(self):
+        """Тест представления сотрудников только для чтения"""
+        view = get_employees_view()
+
+        self.assertEqual(len(view), 3)
+        self.assertEqual([emp['id'] for emp in view], [1, 2, 3])
+        self.assertEqual(view[-1]['name'], "Сидоров С.С.")
+        self.assertEqual([emp['id'] for emp in view[1:]], [2, 3])
+        self.assertEqual(view.get(2)['position'], "Программист")
+        self.assertIsNone(view.get(99))
+        with self.assertRaises(IndexError):
+            view[3]
+        with self.assertRaises(TypeError):
+            view[0]['salary'] = 1.0
+
+        # Расчет зарплаты принимает представление без копирования
+        self.assertEqual(calculate_salary(view)['total_salary'], calculate_salary()['total_salary'])
+
+        copies = view.copy()
+        copies[0]['salary'] = 1.0
+        self.assertEqual(view[0]['salary'], 120000.0)
+
+        update_employee_data(1, salary=130000.0)
+        self.assertEqual(copies[0]['salary'], 1.0)
+        self.assertEqual(get_employees_view()[0]['salary'], 130000.0)
+
+    def test_memory_store_rows_do_not_pin_version(self):
+        """Тест: список записей не закрепляет версию хранилища в памяти"""
+        store = MemoryEmployeeStore(get_employees(copy=True), 4)
+        rows = store.rows()
+        self.assertFalse(store._shared)
+
+        store.update(1, {'salary': 1.0})
+        self.assertEqual(rows[0]['salary'], 120000.0)
+        self.assertEqual(store.rows()[0]['salary'], 1.0)
+
+    def test_get_employee_by_id(self):
         """Тест получения сотрудника по ID"""
         employee = get_employee_by_id(1)
 
@@ -209,8 +700,7 @@ class TestPeopleModule(unittest.TestCase):
         with self.assertRaises(TypeError):
             get_employee_by_id("invalid")
 
-    @patch('builtins.print')
-    def test_add_employee(self, mock_print):
+    def test_add_employee(self):
         """Тест добавления нового сотрудника"""
         initial_count = get_employees_count()
 
@@ -233,8 +723,166 @@ class TestPeopleModule(unittest.TestCase):
         with self.assertRaises(ValueError):
             add_employee("Имя", "Должность", -1000)
 
-    @patch('builtins.print')
-    def test_remove_employee(self, mock_print):
+    def test_salary_limit_is_shared_by_all_paths(self):
+        """Тест: оклад больше MAX_SALARY отклоняется при добавлении, пакете и обновлении"""
+        count = get_employees_count()
+        totals = get_salary_totals()
+        for salary in (MAX_SALARY + 1, 9.0e16, 1e300, 10 ** 400):
+            with self.subTest(salary=salary):
+                with self.assertRaises(ValueError):
+                    add_employee("Имя", "Должность", salary)
+                with self.assertRaises(InvalidEmployeeDataError):
+                    add_employees_bulk([{'name': "Имя", 'position': "Должность", 'salary': salary}])
+                with self.assertRaises(ValueError):
+                    update_employee_data(1, salary=salary)
+                with self.assertRaises(ValueError):
+                    update_employees_bulk({1: {'salary': salary}})
+
+        self.assertEqual(get_employees_count(), count)
+        self.assertEqual(get_salary_totals(), totals)
+
+    def test_salary_at_limit_keeps_payroll_working(self):
+        """Тест: оклад MAX_SALARY с наибольшей премией не ломает расчет зарплаты базы"""
+        previous_policy = set_bonus_policy(BonusPolicy(10, positions={"Директор": MAX_BONUS_PERCENT}))
+        try:
+            employee = add_employee("Предел", "Директор", MAX_SALARY)
+            ids = add_employees_bulk([{'name': "Предел 2", 'position': "Директор", 'salary': MAX_SALARY}])
+
+            result = calculate_salary(details_as_columns=True)
+            self.assertEqual(result['total_employees'], 5)
+            bonuses = dict(zip(result['salary_details']['employee_id'], result['salary_details']['bonus']))
+            self.assertEqual(bonuses[employee['id']], to_rubles(to_kopecks(MAX_SALARY) * MAX_BONUS_PERCENT // 100))
+            self.assertEqual(bonuses[ids[0]], bonuses[employee['id']])
+            rows = list(csv.DictReader(io.StringIO(''.join(iter_salary_csv()))))
+            self.assertEqual(len(rows), 5)
+            self.assertEqual(get_salary_totals()['total_employees'], 5)
+        finally:
+            set_bonus_policy(previous_policy)
+
+    def test_add_employees_bulk(self):
+        """Тест пакетного добавления сотрудников"""
+        with self.assertLogs('application', level='INFO') as logs:
+            ids = add_employees_bulk([
+                {'name': " Первый ", 'position': "Дизайнер", 'salary': 90000},
+                {'name': "Второй", 'position': "дизайнер"}
+            ])
+        self.assertEqual(logs.output, ["INFO:application.db.people:➕ Добавлено сотрудников: 2"])
+
+        self.assertEqual(list(ids), [4, 5])
+        self.assertEqual(get_employees_count(), 5)
+        self.assertEqual(get_employee_by_id(4)['name'], "Первый")
+        self.assertEqual(get_employee_by_id(5)['salary'], 100000.0)
+        self.assertEqual(len(get_employees_by_position("Дизайнер")), 2)
+        self.assertEqual(add_employee("Третий", "Тестер")['id'], 6)
+
+    def test_add_employees_bulk_is_atomic(self):
+        """Тест отказа всего пакета при некорректных записях"""
+        with self.assertRaises(InvalidEmployeeDataError) as context:
+            add_employees_bulk([
+                {'name': "Первый", 'position': "Дизайнер"},
+                {'name': "", 'position': "Дизайнер"},
+                "не словарь",
+                {'name': "Четвертый", 'position': "Дизайнер", 'salary': -1}
+            ])
+
+        self.assertEqual([index for index, _ in context.exception.errors], [1, 2, 3])
+        self.assertEqual(get_employees_count(), 3)
+
+    def test_add_employees_bulk_failed_totals_change_nothing(self):
+        """Тест: если итоги пакета не считаются, хранилище не трогается вовсе"""
+        store = get_employee_store()
+        totals = get_salary_totals()
+        with patch.object(SalaryTotals, 'delta', side_effect=OverflowError), \
+                patch.object(type(store), 'insert_many') as insert_many:
+            with self.assertRaises(OverflowError):
+                add_employees_bulk([{'name': "Первый", 'position': "Дизайнер"}])
+        insert_many.assert_not_called()
+
+        self.assertEqual(get_employees_count(), 3)
+        self.assertEqual(get_salary_totals(), totals)
+        # ID не израсходованы
+        self.assertEqual(add_employees_bulk([{'name': "Первый", 'position': "Дизайнер"}]), range(4, 5))
+
+    def test_add_employees_bulk_personal_bonus_uses_new_ids(self):
+        """Тест: итоги пакета считаются по ID, которые выделит вставка"""
+        remove_employee(3)
+        previous_policy = set_bonus_policy(BonusPolicy(10, employees={4: 50}))
+        try:
+            ids = add_employees_bulk([{'name': "Первый", 'position': "Дизайнер", 'salary': 1000},
+                                      {'name': "Второй", 'position': "Дизайнер", 'salary': 1000}])
+            self.assertEqual(ids, range(4, 6))
+            self.assertEqual(get_salary_totals()['by_position']["Дизайнер"]['total_bonus'], 600)
+        finally:
+            set_bonus_policy(previous_policy)
+
+    def test_employee_record(self):
+        """Тест проверенной записи сотрудника"""
+        employee = Employee(" Тестов Т.Т. ", "Тестер ", 90000)
+        self.assertEqual(employee, Employee("Тестов Т.Т.", "Тестер", 90000.0))
+        self.assertEqual(employee.salary, 90000.0)
+        with self.assertRaises(AttributeError):
+            employee.salary = 1
+        for args in (("", "Тестер"), ("Тест", None), ("Тест", "Тестер", math.nan), ("Тест", "Тестер", 1, 0)):
+            with self.assertRaises(ValueError):
+                Employee(*args)
+
+        added = add_employee_record(employee)
+        self.assertEqual((added['name'], added['position'], added['salary']), ("Тестов Т.Т.", "Тестер", 90000.0))
+        with self.assertRaises(TypeError):
+            add_employee_record({'name': "Тест", 'position': "Тестер"})
+        with self.assertRaises(TypeError):
+            add_employee("Тест")
+        with self.assertRaises(ValueError):
+            add_employee(employee, "Тестер")
+        ids = add_employees_bulk([employee, {'name': "Второй", 'position': "Тестер"}])
+        self.assertEqual(get_employee_by_id(ids[0])['name'], "Тестов Т.Т.")
+        self.assertTrue(validate_employee_data(Employee("Тест", "Тестер", id=7))[0])
+        self.assertEqual(validate_employee_data(Employee("Тест", "Тестер")),
+                         (False, "Отсутствует обязательное поле: id"))
+        self.assertEqual(Employee.from_dict({'name': "Тест", 'position': "Тестер", 'id': 7}).id, 7)
+
+    def test_validate_employees_reports_all_errors(self):
+        """Тест: пакетная проверка собирает все ошибки всех строк"""
+        with self.assertRaises(InvalidEmployeeDataError) as context:
+            validate_employees([
+                {'name': " ", 'position': "Тестер", 'salary': -5},
+                Employee("Тест", "Тестер"),
+                {'position': "", 'salary': math.inf, 'id': '3'},
+                None
+            ])
+
+        errors = context.exception.errors
+        self.assertEqual([index for index, _ in errors], [0, 0, 2, 2, 2, 2, 3])
+        self.assertIn("Зарплата", errors[1][1])
+        self.assertIn("ID", errors[5][1])
+
+        records = validate_employees([{'name': " Тест", 'position': "Тестер"}])
+        self.assertEqual(records, [Employee("Тест", "Тестер")])
+
+    def test_validate_employee_columns(self):
+        """Тест: проверка по колонкам дает те же значения и ошибки, что validate_employees"""
+        rows = [{'name': " Тест ", 'position': "Тестер", 'salary': 1000}, {'name': "Второй", 'position': " QA"}]
+        self.assertEqual(validate_employee_columns(rows), (["Тест", "Второй"], ["Тестер", "QA"], [1000.0, 100000.0]))
+        self.assertEqual(validate_employee_columns(iter([Employee("Тест", "Тестер", 5.5)] + rows[1:])),
+                         (["Тест", "Второй"], ["Тестер", "QA"], [5.5, 100000.0]))
+        self.assertEqual(validate_employee_columns([]), ([], [], []))
+
+        invalid = [
+            [{'name': "", 'position': "Тестер"}],
+            [{'name': "Тест", 'position': 1}],
+            [{'name': "Тест", 'position': "Тестер", 'salary': math.nan}],
+            [{'name': "Тест", 'position': "Тестер", 'salary': 0}],
+            [{'name': "Тест", 'position': "Тестер", 'salary': 1e300}],
+            [{'name': "Тест", 'position': "Тестер", 'id': -1}],
+            [None]
+        ]
+        for batch in invalid:
+            with self.subTest(batch=batch):
+                with self.assertRaises(InvalidEmployeeDataError) as context:
+                    validate_employee_columns(batch)
+                self.assertEqual([index for index, _ in context.exception.errors], [0])
+
+    def test_remove_employee(self):
         """Тест удаления сотрудника"""
         initial_count = get_employees_count()
 
@@ -256,8 +904,18 @@ class TestPeopleModule(unittest.TestCase):
         with self.assertRaises(TypeError):
             remove_employee("invalid")
 
-    @patch('builtins.print')
-    def test_update_employee_data(self, mock_print):
+    def test_remove_employee_keeps_order_and_lookup(self):
+        """Тест согласованности индекса по ID после добавления и удаления"""
+        new_employee = add_employee("Тест", "Тестер")
+        self.assertTrue(remove_employee(2))
+
+        ids = [employee['id'] for employee in get_employees()]
+        self.assertEqual(ids, [1, 3, new_employee['id']])
+        self.assertEqual(get_employee_by_id(new_employee['id'])['name'], "Тест")
+        self.assertIsNone(get_employee_by_id(2))
+        self.assertIsNone(update_employee_data(2, name="Петров"))
+
+    def test_update_employee_data(self):
         """Тест обновления данных сотрудника"""
         updated = update_employee_data(1, name="Иванов Иван Иванович", salary=130000)
 
@@ -277,8 +935,69 @@ class TestPeopleModule(unittest.TestCase):
         with self.assertRaises(ValueError):
             update_employee_data(1, salary=-1000)
 
-    @patch('builtins.print')
-    def test_get_employees_by_position(self, mock_print):
+    def test_update_employees_bulk(self):
+        """Тест пакетного обновления сотрудников"""
+        updated = update_employees_bulk({
+            1: {'salary': 125000, 'unknown': 'игнорируется'},
+            2: {'position': "Архитектор"},
+            999: {'name': "Нет такого"}
+        })
+
+        self.assertEqual(updated, [1, 2])
+        self.assertEqual(get_employee_by_id(1)['salary'], 125000)
+        self.assertEqual(len(get_employees_by_position("архитектор")), 1)
+        self.assertEqual(get_employees_by_position("Программист"), [])
+
+    def test_update_employees_bulk_invalid(self):
+        """Тест отказа пакетного обновления при некорректных полях"""
+        with self.assertRaises(InvalidEmployeeDataError) as context:
+            update_employees_bulk({1: {'name': "Новое имя"}, 2: {'salary': -1}, 3: {'name': ""}})
+
+        self.assertEqual([employee_id for employee_id, _ in context.exception.errors], [2, 3])
+        self.assertEqual(get_employee_by_id(1)['name'], "Иванов И.И.")
+
+        with self.assertRaises(TypeError):
+            update_employees_bulk({"1": {'name': "Имя"}})
+
+    def test_update_employees_bulk_failed_totals_change_nothing(self):
+        """Тест: если итоги новых значений не считаются, не меняются ни хранилище, ни итоги"""
+        totals = get_salary_totals()
+        with patch.object(SalaryTotals, 'delta', side_effect=OverflowError):
+            with self.assertRaises(OverflowError):
+                update_employees_bulk({1: {'name': "Новое имя"}, 2: {'position': "Аналитик"}})
+
+        self.assertEqual(get_employee_by_id(1)['name'], "Иванов И.И.")
+        self.assertEqual(get_employee_by_id(2)['position'], "Программист")
+        self.assertEqual(get_salary_totals(), totals)
+
+    def test_remove_employees_bulk(self):
+        """Тест пакетного удаления сотрудников"""
+        add_employees_bulk([{'name': f"Сотрудник {i}", 'position': "Тестер"} for i in range(5)])
+
+        removed = remove_employees_bulk([1, 5, 6, 7, 999])
+
+        self.assertEqual(removed, [1, 5, 6, 7])
+        self.assertEqual([emp['id'] for emp in get_employees()], [2, 3, 4, 8])
+        self.assertEqual([emp['id'] for emp in get_employees_by_position("Тестер")], [4, 8])
+
+        with self.assertRaises(TypeError):
+            remove_employees_bulk([2, "3"])
+        self.assertEqual(get_employees_count(), 4)
+
+    def test_get_employees_by_position_keeps_id_order_after_update(self):
+        """Тест: после смены должности сотрудники должности идут в порядке ID"""
+        first = add_employee("Первый", "Dev")['id']
+        second = add_employee("Второй", "QA")['id']
+        update_employee_data(first, position="QA")
+        self.assertEqual([emp['id'] for emp in get_employees_by_position("QA")], [first, second])
+
+        update_employees_bulk({first: {'position': "Dev"}, second: {'position': "Dev"}})
+        update_employee_data(first, position="QA")
+        update_employee_data(first, position="Dev")
+        self.assertEqual([emp['id'] for emp in get_employees_by_position("dev")], [first, second])
+        self.assertEqual([emp['id'] for emp in get_employees_snapshot().by_position("Dev")], [first, second])
+
+    def test_get_employees_by_position(self):
         """Тест получения сотрудников по должности"""
         programmers = get_employees_by_position("Программист")
 
@@ -290,6 +1009,21 @@ class TestPeopleModule(unittest.TestCase):
         designers = get_employees_by_position("Дизайнер")
         self.assertEqual(len(designers), 0)
 
+    def test_get_employees_by_position_index_updates(self):
+        """Тест поддержки индекса по должности при изменениях"""
+        new_employee = add_employee("Тест", "Программист")
+        update_employee_data(2, position="Архитектор")
+
+        programmers = get_employees_by_position("пРОГРАММИСТ")
+        self.assertEqual([emp['id'] for emp in programmers], [new_employee['id']])
+        self.assertEqual(len(get_employees_by_position("архитектор")), 1)
+
+        remove_employee(new_employee['id'])
+        self.assertEqual(get_employees_by_position("Программист"), [])
+
+        reset_employees_db()
+        self.assertEqual(len(get_employees_by_position("Программист")), 1)
+
     def test_get_employees_by_position_invalid_type(self):
         """Тест поиска по должности с неправильным типом"""
         with self.assertRaises(TypeError):
@@ -305,15 +1039,13 @@ class TestPeopleModule(unittest.TestCase):
         new_count = get_employees_count()
         self.assertEqual(new_count, 4)
 
-    @patch('builtins.print')
-    def test_clear_employees_db(self, mock_print):
+    def test_clear_employees_db(self):
         """Тест очистки базы данных"""
         clear_employees_db()
         count = get_employees_count()
         self.assertEqual(count, 0)
 
-    @patch('builtins.print')
-    def test_reset_employees_db(self, mock_print):
+    def test_reset_employees_db(self):
         """Тест сброса базы данных"""
         # Изменяем базу
         add_employee("Тест", "Тестер")
@@ -324,6 +1056,420 @@ class TestPeopleModule(unittest.TestCase):
         count = get_employees_count()
         self.assertEqual(count, 3)
 
+    def test_employee_store_interface(self):
+        """Тест: хранилище обязано реализовать абстрактные методы EmployeeStore"""
+        class IncompleteStore(EmployeeStore):
+            def __len__(self):
+                return 0
+
+        with self.assertRaises(TypeError):
+            IncompleteStore()
+
+        class DelegatingStore(EmployeeStore):
+            """Только абстрактные методы; пакетные операции - реализации по умолчанию"""
+
+            def __init__(self):
+                self.inner = MemoryEmployeeStore()
+
+            def __len__(self):
+                return len(self.inner)
+
+            def get(self, employee_id):
+                return self.inner.get(employee_id)
+
+            def all(self):
+                return self.inner.all()
+
+            def by_position(self, position):
+                return self.inner.by_position(position)
+
+            def columns(self, *fields):
+                return self.inner.columns(*fields)
+
+            def next_id(self):
+                return self.inner.next_id()
+
+            def insert(self, name, position, salary, hire_date):
+                return self.inner.insert(name, position, salary, hire_date)
+
+            def update(self, employee_id, fields):
+                return self.inner.update(employee_id, fields)
+
+            def delete(self, employee_id):
+                return self.inner.delete(employee_id)
+
+            def clear(self):
+                self.inner.clear()
+
+            def load(self, rows, next_id):
+                self.inner.load(rows, next_id)
+
+        store = DelegatingStore()
+        ids = store.insert_many([("Тест", "Тестер", 1000.0), ("Второй", "QA", 2000.0)], '2024-01-01')
+        self.assertEqual(list(ids), [1, 2])
+        self.assertEqual(store.update_many({2: {'salary': 3000.0}, 9: {'salary': 1.0}}), [2])
+        self.assertEqual([row['name'] for row in store.view()], ["Тест", "Второй"])
+        self.assertEqual(list(store.column_chunks(('salary',), 1)), [{'salary': [1000.0]}, {'salary': [3000.0]}])
+        self.assertEqual(store.delete_many([1, 9]), [1])
+        self.assertEqual(len(store.snapshot()), 1)
+
+    def test_snapshot_is_isolated_from_writes(self):
+        """Тест: снимок не видит изменений, сделанных после него"""
+        snapshot = get_employees_snapshot()
+        version = get_employees_version()
+        self.assertEqual(snapshot.version, version)
+
+        update_employee_data(1, salary=1000.0, position="Программист")
+        add_employee("Новый", "Тестер")
+        remove_employee(3)
+
+        self.assertGreater(get_employees_version(), version)
+        self.assertEqual(len(snapshot), 3)
+        self.assertEqual([emp['id'] for emp in snapshot], [1, 2, 3])
+        self.assertEqual(snapshot.get(1)['salary'], 120000.0)
+        self.assertEqual(list(snapshot.columns('salary')['salary']), [120000.0, 180000.0, 150000.0])
+        self.assertEqual(len(snapshot.by_position("Программист")), 1)
+
+        current = get_employees_snapshot()
+        self.assertEqual([emp['id'] for emp in current], [1, 2, 4])
+        self.assertEqual(current.get(1)['salary'], 1000.0)
+
+    def test_memory_store_snapshots_share_pages(self):
+        """Тест: снимки хранилища в памяти разделяют неизмененные страницы"""
+        count = 3 * PAGE_SIZE + 10
+        store = MemoryEmployeeStore(
+            reversed([{'id': i, 'name': f"Сотрудник {i}", 'position': "Тестер", 'salary': float(i),
+                       'hire_date': '2024-01-01'} for i in range(1, count + 1)])
+        )
+        snapshot = store.snapshot()
+        view = store.view()
+
+        store.update(2, {'salary': 1.0, 'position': "Аналитик"})
+        store.delete_many(range(PAGE_SIZE + 1, 2 * PAGE_SIZE + 1))
+        new_id = store.insert("Новый", "Тестер", 5.0, '2024-01-02')['id']
+
+        # Изменены только первая и последняя страницы, вторая удалена целиком
+        self.assertIs(store._pages[1], snapshot._pages[2])
+        self.assertEqual(new_id, count + 1)
+        self.assertEqual(len(store), count - PAGE_SIZE + 1)
+        self.assertEqual(store.get(2)['salary'], 1.0)
+        self.assertIsNone(store.get(PAGE_SIZE + 1))
+        self.assertEqual(store.get(2 * PAGE_SIZE + 1)['id'], 2 * PAGE_SIZE + 1)
+        self.assertEqual([row['id'] for row in store.by_position("аналитик")], [2])
+
+        for rows in (snapshot.all(), list(view)):
+            self.assertEqual([row['id'] for row in rows], list(range(1, count + 1)))
+            self.assertEqual(rows[1]['salary'], 2.0)
+        self.assertIsNone(snapshot.get(new_id))
+        self.assertEqual(snapshot.get(PAGE_SIZE + 1)['id'], PAGE_SIZE + 1)
+        self.assertEqual(len(snapshot.by_position("Тестер")), count)
+        self.assertEqual(snapshot.by_position("Аналитик"), [])
+
+    def test_salary_totals_follow_writes(self):
+        """Тест: итоги по окладам совпадают с пересчетом после любых изменений"""
+        def recomputed():
+            employees = get_employees()
+            payroll = calculate_salary()
+            positions = {}
+            for employee, details in zip(employees, payroll['salary_details']):
+                group = positions.setdefault(employee['position'], [0, 0, 0])
+                group[0] += 1
+                group[1] += to_kopecks(details['base_salary'])
+                group[2] += to_kopecks(details['total'])
+            return payroll, {
+                position: (count, to_rubles(base), to_rubles(total))
+                for position, (count, base, total) in positions.items()
+            }
+
+        def assert_consistent():
+            totals = get_salary_totals()
+            payroll, positions = recomputed()
+            self.assertEqual(totals['total_employees'], payroll['total_employees'])
+            self.assertEqual(totals['total_salary'], payroll['total_salary'])
+            self.assertEqual(totals['average_salary'], payroll['average_salary'])
+            self.assertEqual(
+                {position: (group['employees'], group['total_base_salary'], group['total_salary'])
+                 for position, group in totals['by_position'].items()},
+                positions
+            )
+
+        totals = get_salary_totals()
+        self.assertEqual(totals['total_employees'], 3)
+        self.assertEqual(totals['total_base_salary'], 450000.0)
+        self.assertEqual(totals['total_bonus'], 45000.0)
+        self.assertEqual(totals['total_salary'], calculate_salary()['total_salary'])
+        self.assertEqual(totals['average_salary'], 165000.0)
+
+        add_employee("Новый", "Программист", 90000.5)
+        update_employee_data(1, salary=125000.25)
+        update_employee_data(3, position="Программист")
+        assert_consistent()
+
+        ids = add_employees_bulk([{'name': "Пакет", 'position': "Тестер", 'salary': 0.1}] * 10)
+        update_employees_bulk({ids[0]: {'salary': 0.2}, ids[1]: {'position': "Аналитик"}})
+        assert_consistent()
+
+        remove_employee(2)
+        remove_employees_bulk([ids[2], ids[2], 999])
+        assert_consistent()
+
+        # Замена политики премий пересчитывает итоги
+        previous = set_bonus_policy(BonusPolicy(5, positions={'Тестер': 20}, employees={1: 0}))
+        try:
+            assert_consistent()
+        finally:
+            set_bonus_policy(previous)
+        assert_consistent()
+
+        clear_employees_db()
+        self.assertEqual(get_salary_totals(), {
+            'total_employees': 0, 'total_base_salary': 0.0, 'total_bonus': 0.0, 'total_salary': 0.0,
+            'average_salary': 0, 'by_position': {}
+        })
+
+    def test_salary_csv_reads_single_version(self):
+        """Тест: изменения во время выгрузки CSV не попадают в отчет"""
+        chunks = iter_salary_csv(chunk_size=1)
+        first = next(chunks)
+        add_employee("Новый", "Тестер")
+        remove_employee(3)
+
+        rows = list(csv.DictReader(io.StringIO(first + ''.join(chunks))))
+        self.assertEqual([row['employee_id'] for row in rows], ['1', '2', '3'])
+
+    def test_concurrent_updates_are_not_lost(self):
+        """Стресс-тест: параллельные изменения не теряются, ID не повторяются"""
+        threads_count = 32
+        iterations = 20
+        added_ids = []
+        errors = []
+        start = threading.Barrier(threads_count)
+
+        def writer():
+            try:
+                start.wait()
+                for _ in range(iterations):
+                    with employees_transaction():
+                        salary = get_employee_by_id(1)['salary']
+                        update_employee_data(1, salary=salary + 1)
+                    added_ids.append(add_employee("Поток", "Тестер")['id'])
+            except Exception as error:
+                errors.append(error)
+
+        def reader():
+            try:
+                start.wait()
+                for _ in range(iterations):
+                    result = calculate_salary()
+                    self.assertEqual(result['total_employees'], len(result['salary_details']))
+                    get_employees_by_position("Тестер")
+            except Exception as error:
+                errors.append(error)
+
+        was_quiet = is_quiet()
+        set_quiet()
+        try:
+            threads = [threading.Thread(target=writer if i % 2 else reader) for i in range(threads_count)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            set_quiet(was_quiet)
+
+        writers = threads_count // 2
+        self.assertEqual(errors, [])
+        self.assertEqual(get_employee_by_id(1)['salary'], 120000.0 + writers * iterations)
+        self.assertEqual(len(set(added_ids)), writers * iterations)
+        self.assertEqual(get_employees_count(), 3 + writers * iterations)
+
+
+class TestReadWriteLock(unittest.TestCase):
+    """Тесты блокировки чтения/записи"""
+
+    def test_readers_share_and_writer_excludes(self):
+        """Тест: читатели работают одновременно, писатель ждет их завершения"""
+        lock = ReadWriteLock()
+        both_reading = threading.Barrier(2, timeout=5)
+        events = []
+
+        def reader():
+            with lock.read():
+                both_reading.wait()
+                events.append('read')
+
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in readers:
+            thread.start()
+        for thread in readers:
+            thread.join()
+
+        with lock.write():
+            # Повторный захват в потоке-писателе не блокируется
+            with lock.read(), lock.write():
+                events.append('write')
+
+        self.assertEqual(events, ['read', 'read', 'write'])
+        with self.assertRaises(RuntimeError):
+            lock.release_write()
+
+    def test_nested_read_while_writer_waits(self):
+        """Тест: повторное чтение в том же потоке не ждет писателя, который ждет этот поток"""
+        lock = ReadWriteLock()
+        events = []
+
+        def writer():
+            with lock.write():
+                events.append('write')
+
+        writer_thread = threading.Thread(target=writer, daemon=True)
+
+        def reader():
+            with lock.read():
+                writer_thread.start()
+                deadline = time.monotonic() + 5
+                while not lock._writers_waiting and time.monotonic() < deadline:
+                    time.sleep(0.001)
+                with lock.read():
+                    events.append('nested read')
+
+        thread = threading.Thread(target=reader, daemon=True)
+        thread.start()
+        thread.join(5)
+        writer_thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(writer_thread.is_alive())
+        self.assertEqual(events, ['nested read', 'write'])
+
+
+class TestPeopleModuleColumnar(TestPeopleModule):
+    """Тесты модуля сотрудников на колоночном хранилище"""
+
+    def setUp(self):
+        """Подключаем колоночное хранилище"""
+        self.previous_store = set_employee_store(ColumnarEmployeeStore())
+        reset_employees_db()
+
+    def tearDown(self):
+        """Возвращаем прежнее хранилище"""
+        set_employee_store(self.previous_store)
+
+    def test_columns_skip_removed_rows(self):
+        """Тест выдачи колонок после удаления сотрудников"""
+        remove_employee(2)
+        columns = get_employee_columns('id', 'name', 'salary', 'hire_date')
+
+        self.assertEqual(list(columns['id']), [1, 3])
+        self.assertEqual(list(columns['name']), ['Иванов И.И.', 'Сидоров С.С.'])
+        self.assertEqual(list(columns['salary']), [120000.0, 150000.0])
+        self.assertEqual(list(columns['hire_date']), ['2023-01-15', '2023-03-10'])
+
+    def test_string_table_does_not_grow_with_renames(self):
+        """Тест освобождения имен и должностей, на которые не осталось ссылок"""
+        store = get_employee_store()
+        for i in range(1000):
+            update_employee_data(1, name=f"Имя {i}", position=f"Должность {i}")
+
+        self.assertLess(len(store._strings), 100)
+        self.assertEqual(get_employee_by_id(1)['name'], "Имя 999")
+        self.assertEqual([e['id'] for e in get_employees_by_position("должность 999")], [1])
+        self.assertEqual(get_employees_by_position("Менеджер"), [])
+        self.assertEqual([e['name'] for e in get_employees_by_position("Программист")], ["Петров П.П."])
+
+    def test_by_position_after_moves_and_removals(self):
+        """Тест индекса должностей при переводах и удалениях"""
+        update_employee_data(3, position="Программист")
+        update_employee_data(1, position="программист")
+        remove_employee(2)
+        snapshot = get_employees_snapshot()
+        update_employee_data(3, position="Аналитик")
+
+        self.assertEqual([e['id'] for e in get_employees_by_position("ПРОГРАММИСТ")], [1])
+        self.assertEqual([e['id'] for e in snapshot.by_position("Программист")], [1, 3])
+
+    def test_calculate_salary_matches_memory_store(self):
+        """Тест совпадения расчета зарплаты с хранилищем по умолчанию"""
+        add_employee("Тест", "Тестер", 95000)
+        columnar_result = calculate_salary()
+
+        set_employee_store(MemoryEmployeeStore())
+        reset_employees_db()
+        add_employee("Тест", "Тестер", 95000)
+        memory_result = calculate_salary()
+
+        self.assertEqual(columnar_result['total_salary'], memory_result['total_salary'])
+        self.assertEqual(columnar_result['salary_details'], memory_result['salary_details'])
+
+    def test_set_employee_store_invalid_type(self):
+        """Тест подключения объекта, не являющегося хранилищем"""
+        with self.assertRaises(TypeError):
+            set_employee_store([])
+
+
+class TestPeopleModuleSQLite(TestPeopleModule):
+    """Тесты модуля сотрудников на хранилище SQLite"""
+
+    def setUp(self):
+        """Подключаем хранилище SQLite во временном файле"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SQLiteEmployeeStore(os.path.join(self.directory.name, 'people.db'))
+        self.previous_store = set_employee_store(self.store)
+        reset_employees_db()
+
+    def tearDown(self):
+        """Возвращаем прежнее хранилище"""
+        set_employee_store(self.previous_store)
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_snapshot_reads_without_copying(self):
+        """Тест снимка базы в файле: транзакция чтения вместо копии базы"""
+        snapshot = self.store.snapshot()
+        update_employee_data(1, salary=1.0)
+        add_employee("Тест", "Тестер")
+
+        self.assertEqual(snapshot.path, self.store.path)
+        self.assertEqual(len(snapshot), 3)
+        self.assertEqual(snapshot.get(1)['salary'], 120000.0)
+        self.assertEqual(get_employee_by_id(1)['salary'], 1.0)
+        with self.assertRaises(sqlite3.OperationalError):
+            snapshot.insert("Тест", "Тестер", 1000.0, '2024-01-01')
+
+    def test_memory_snapshot_is_isolated(self):
+        """Тест снимка базы в памяти"""
+        store = SQLiteEmployeeStore()
+        set_employee_store(store)
+        reset_employees_db()
+        snapshot = store.snapshot()
+        remove_employee(1)
+
+        self.assertEqual(len(snapshot), 3)
+        self.assertEqual(get_employees_count(), 2)
+        store.close()
+
+    def test_data_persists_between_connections(self):
+        """Тест сохранения данных в файле между запусками"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'people.db')
+
+            store = SQLiteEmployeeStore(path)
+            set_employee_store(store)
+            reset_employees_db()
+            new_employee = add_employee("Тест", "Тестер", 95000)
+            update_employee_data(1, position="Директор")
+            store.close()
+
+            store = SQLiteEmployeeStore(path)
+            set_employee_store(store)
+            try:
+                self.assertEqual(get_employees_count(), 4)
+                self.assertEqual(get_employee_by_id(new_employee['id'])['salary'], 95000)
+                self.assertEqual(len(get_employees_by_position("директор")), 1)
+                self.assertEqual(add_employee("Еще", "Тестер")['id'], new_employee['id'] + 1)
+            finally:
+                store.close()
+
 
 class TestIntegration(unittest.TestCase):
     """Интеграционные тесты"""
@@ -332,8 +1478,7 @@ class TestIntegration(unittest.TestCase):
         """Подготовка перед каждым тестом"""
         reset_employees_db()
 
-    @patch('builtins.print')
-    def test_full_workflow(self, mock_print):
+    def test_full_workflow(self):
         """Тест полного рабочего процесса"""
         # 1. Получаем сотрудников
         employees = get_employees()
@@ -359,8 +1504,7 @@ class TestIntegration(unittest.TestCase):
         self.assertTrue(removed)
         self.assertEqual(get_employees_count(), 3)
 
-    @patch('builtins.print')
-    def test_salary_calculation_integration(self, mock_print):
+    def test_salary_calculation_integration(self):
         """Тест интеграции расчета зарплаты"""
         # Добавляем сотрудника с известной зарплатой
         test_employee = add_employee("Тест", "Тестер", 100000)
@@ -386,7 +1530,9 @@ def run_tests():
     test_suite = unittest.TestSuite()
 
     # Добавляем тесты
-    test_classes = [TestMainModule, TestSalaryModule, TestPeopleModule, TestIntegration]
+    test_classes = [TestMainModule, TestSalaryModule, TestMoneyModule, TestTaxRules, TestPeopleModule,
+                    TestReadWriteLock,
+                    TestPeopleModuleColumnar, TestPeopleModuleSQLite, TestIntegration]
 
     for test_class in test_classes:
         tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
@@ -5,17 +5,220 @@ Unit-тесты для Яндекс.Диск REST API
 """
 
 import unittest
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+try:
+    import aiohttp
+    from aiohttp import web
+except ImportError:  # Нужен только асинхронному клиенту
+    aiohttp = None
+    web = None
 import json
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from itertools import islice
 from unittest.mock import patch, MagicMock
+import threading
 import time
 import os
 
 
+# Необязательный префикс пространства пути: disk:/..., app:/...
+_PATH_SCHEME = re.compile(r'([a-z]+:)(/.*)')
+
+# Методы, повтор которых безопасен, даже если сервер уже выполнил запрос
+_IDEMPOTENT_METHODS = frozenset({'get', 'head', 'options'})
+
+
+def _not_sent(error):
+    """Ошибка requests возникла до отправки запроса: соединение не установлено"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class RetryPolicy:
+    """
+    Политика повторов при временных ошибках
+
+    Пауза перед n-й повторной попыткой - backoff * 2**n, но не больше
+    max_delay; с jitter=True выбирается случайно от 0 до этого значения,
+    чтобы клиенты не повторяли запросы одновременно. Если сервер прислал
+    Retry-After, ждем ровно указанное им время; если оно больше max_delay,
+    запрос не повторяется и вызывающий получает ответ сервера.
+
+    Неидемпотентные запросы (PUT, DELETE, POST) сервер мог выполнить,
+    даже если ответ не дошел, поэтому они повторяются только при кодах
+    unsafe_statuses (сервер сообщил, что запрос не принят) и при ошибках
+    установки соединения, когда запрос еще не был отправлен.
+
+    Args:
+        max_retries (int): Максимум повторов одного запроса
+        backoff (float): Пауза перед первым повтором, секунды
+        max_delay (float): Предел паузы, секунды
+        jitter (bool): Случайная пауза в пределах экспоненциальной
+        statuses (tuple): Коды ответа, при которых запрос повторяется
+        unsafe_statuses (tuple): Коды ответа, при которых повторяются неидемпотентные запросы
+    """
+
+    def __init__(self, max_retries=3, backoff=0.5, max_delay=30.0, jitter=True,
+                 statuses=(429, 500, 502, 503, 504), unsafe_statuses=(429, 503)):
+        if not isinstance(max_retries, int) or max_retries < 0:
+            raise ValueError("Количество повторов должно быть неотрицательным целым числом")
+        if backoff < 0 or max_delay < 0:
+            raise ValueError("Паузы не могут быть отрицательными")
+
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.unsafe_statuses = frozenset(unsafe_statuses)
+
+    def should_retry(self, method, status_code=None, error=None):
+        """
+        Можно ли повторить запрос после ответа status_code или ошибки requests error
+
+        Args:
+            method (str): HTTP-метод в нижнем регистре ('get', 'put', ...)
+            status_code (int): Код ответа сервера
+            error (Exception): Ошибка соединения или таймаут
+        """
+        idempotent = method in _IDEMPOTENT_METHODS
+        if error is not None:
+            return idempotent or _not_sent(error)
+        return status_code in (self.statuses if idempotent else self.unsafe_statuses)
+
+    def delay(self, attempt, retry_after=None):
+        """
+        Пауза перед повтором номер attempt (с 0)
+
+        Args:
+            attempt (int): Номер повтора
+            retry_after (str): Значение заголовка Retry-After (секунды или дата)
+
+        Returns:
+            float или None: Пауза в секундах; None - сервер просит ждать
+                дольше max_delay, повторять запрос не нужно
+        """
+        requested = self._parse_retry_after(retry_after)
+        if requested is not None:
+            return requested if requested <= self.max_delay else None
+
+        delay = min(self.backoff * 2 ** attempt, self.max_delay)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    @staticmethod
+    def _parse_retry_after(value):
+        """Секунды из Retry-After или None, если заголовка нет или он некорректен"""
+        if not isinstance(value, str) or not value.strip():
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            moment = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов ("ведро токенов")
+
+    В ведро поступает rate токенов в секунду, вмещается не больше capacity.
+    Каждый запрос забирает токен; если токенов нет, поток ждет своей
+    очереди. Ожидание идет вне блокировки, поэтому потоки не мешают друг
+    другу, а суммарная частота не превышает rate.
+
+    Args:
+        rate (float): Запросов в секунду
+        capacity (int): Сколько запросов можно выполнить подряд без ожидания
+        clock: Функция текущего времени (для тестов)
+        sleep: Функция ожидания (для тестов)
+    """
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("Частота и емкость ограничителя должны быть положительными")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Получить токен, дождавшись его при необходимости
+
+        Returns:
+            float: Время ожидания, секунды
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Токен резервируется сразу: следующие потоки встают в очередь за ним
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait:
+            self._sleep(wait)
+        return wait
+
+
+# Политика повторов клиента по умолчанию
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+# Таймауты запроса по умолчанию: (установка соединения, чтение ответа), секунды
+DEFAULT_TIMEOUT = (5, 30)
+
+
 class YandexDiskAPI:
-    """Класс для работы с API Яндекс.Диска"""
+    """
+    Класс для работы с API Яндекс.Диска
+
+    Все запросы идут через одну сессию requests: соединения с сервером
+    переиспользуются (keep-alive), а не открываются заново для каждого
+    запроса. Клиент можно использовать как контекстный менеджер - на
+    выходе пул соединений закрывается.
+
+    Ответы 429 и 5xx, а также ошибки соединения повторяются по политике
+    retry (неидемпотентные запросы - только если сервер их точно не
+    выполнил); с rate_limit частота запросов ограничивается на стороне
+    клиента. Каждый запрос ограничен таймаутом timeout. Счетчики повторов
+    и ожиданий возвращает get_metrics().
+
+    Args:
+        token (str): OAuth-токен
+        pool_size (int): Максимум соединений в пуле (одновременных запросов
+            из разных потоков без ожидания)
+        keep_alive (bool): Держать соединения открытыми между запросами
+        retry (RetryPolicy): Политика повторов (None - без повторов)
+        rate_limit (float): Максимум запросов в секунду (None - без ограничения)
+        burst (int): Сколько запросов можно выполнить подряд без ограничения частоты
+        timeout (float или tuple): Таймаут запроса в секундах или пара (установка
+            соединения, чтение ответа); None - ждать без ограничения
+    """
+
+    def __init__(self, token, pool_size=10, keep_alive=True, retry=DEFAULT_RETRY_POLICY, rate_limit=None,
+                 burst=1, timeout=DEFAULT_TIMEOUT):
+        if not isinstance(pool_size, int) or pool_size < 1:
+            raise ValueError("Размер пула соединений должен быть положительным целым числом")
 
-    def __init__(self, token):
         self.token = token
         self.base_url = "https://cloud-api.yandex.net/v1/disk"
         self.headers = {
@@ -23,6 +226,82 @@ class YandexDiskAPI:
             'Content-Type': 'application/json'
         }
 
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+        self.retry = retry
+        self.timeout = timeout
+        self.rate_limiter = TokenBucket(rate_limit, burst) if rate_limit is not None else None
+        self._metrics = {'requests': 0, 'retries': 0, 'retry_wait': 0.0, 'throttle_wait': 0.0}
+        self._metrics_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Закрыть сессию и все соединения пула"""
+        self.session.close()
+
+    def get_metrics(self):
+        """
+        Счетчики клиента
+
+        Returns:
+            dict: requests - отправлено запросов (с повторами), retries - повторов,
+                retry_wait - секунд пауз перед повторами, throttle_wait - секунд
+                ожидания ограничителя частоты
+        """
+        with self._metrics_lock:
+            return dict(self._metrics)
+
+    def _count(self, **values):
+        """Прибавить значения к счетчикам"""
+        with self._metrics_lock:
+            for name, value in values.items():
+                self._metrics[name] += value
+
+    def _send(self, method, url, params):
+        """Отправить запрос через сессию с ограничением частоты и повторами"""
+        send = getattr(self.session, method)
+        max_retries = self.retry.max_retries if self.retry is not None else 0
+        attempt = 0
+
+        while True:
+            if self.rate_limiter is not None:
+                self._count(throttle_wait=self.rate_limiter.acquire())
+            self._count(requests=1)
+
+            try:
+                response = send(url, headers=self.headers, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if attempt >= max_retries or not self.retry.should_retry(method, error=error):
+                    raise
+                delay = self.retry.delay(attempt)
+            else:
+                if attempt >= max_retries or not self.retry.should_retry(method, response.status_code):
+                    return response
+                delay = self.retry.delay(attempt, response.headers.get('Retry-After'))
+                if delay is None:
+                    return response
+
+            self._count(retries=1, retry_wait=delay)
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _result(response):
+        """Код ответа и тело JSON (пустой словарь, если тела нет)"""
+        return {
+            'status_code': response.status_code,
+            'response': response.json() if response.content else {}
+        }
+
     def create_folder(self, path):
         """
         Создать папку на Яндекс.Диске
@@ -36,12 +315,72 @@ class YandexDiskAPI:
         url = f"{self.base_url}/resources"
         params = {'path': path}
 
-        response = requests.put(url, headers=self.headers, params=params)
+        response = self._send('put', url, params)
 
-        return {
-            'status_code': response.status_code,
-            'response': response.json() if response.content else {}
-        }
+        return self._result(response)
+
+    def create_tree(self, paths, max_workers=None):
+        """
+        Создать дерево папок: сначала родители, затем потомки
+
+        Пути вместе со всеми недостающими родителями раскладываются по
+        уровням глубины. Папки одного уровня создаются параллельно, поэтому
+        время работы зависит от глубины дерева, а не от числа папок. Папка,
+        которая уже существует (409 DiskPathPointsToExistentDirectoryError),
+        считается успешно созданной; потомки папки, которую создать не
+        удалось, не запрашиваются. Сетевая ошибка при создании папки
+        записывается в ее результат ('failed') и не прерывает остальное
+        дерево. Префикс пространства пути (disk:/, app:/) сохраняется у
+        всех папок пути.
+
+        Args:
+            paths (list): Пути к папкам
+            max_workers (int): Количество потоков (по умолчанию - размер пула соединений)
+
+        Returns:
+            dict: Путь -> результат create_folder с полем 'outcome':
+                'created', 'exists', 'failed' или 'skipped' (не создан родитель)
+        """
+        # Глубина -> {путь: путь родителя (None у папки верхнего уровня)}
+        levels = {}
+        for path in paths:
+            match = _PATH_SCHEME.fullmatch(path)
+            scheme, path = match.groups() if match else ('', path)
+            parts = [part for part in path.split('/') if part]
+            parent = None
+            for depth in range(1, len(parts) + 1):
+                folder = scheme + '/' + '/'.join(parts[:depth])
+                levels.setdefault(depth, {})[folder] = parent
+                parent = folder
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers or self.pool_size) as executor:
+            for depth in sorted(levels):
+                pending = []
+                for path, parent in levels[depth].items():
+                    if parent is not None and results[parent]['outcome'] not in ('created', 'exists'):
+                        results[path] = {'status_code': None, 'response': {}, 'outcome': 'skipped'}
+                    else:
+                        pending.append(path)
+
+                for path, result in zip(pending, executor.map(self._create_tree_folder, pending)):
+                    if result['status_code'] == 201:
+                        result['outcome'] = 'created'
+                    elif (result['status_code'] == 409
+                          and result['response'].get('error') == 'DiskPathPointsToExistentDirectoryError'):
+                        result['outcome'] = 'exists'
+                    else:
+                        result['outcome'] = 'failed'
+                    results[path] = result
+
+        return results
+
+    def _create_tree_folder(self, path):
+        """create_folder для create_tree: сетевая ошибка возвращается как результат"""
+        try:
+            return self.create_folder(path)
+        except requests.RequestException as error:
+            return {'status_code': None, 'response': {'error': type(error).__name__, 'message': str(error)}}
 
     def get_folder_info(self, path):
         """
@@ -56,12 +395,9 @@ class YandexDiskAPI:
         url = f"{self.base_url}/resources"
         params = {'path': path}
 
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self._send('get', url, params)
 
-        return {
-            'status_code': response.status_code,
-            'response': response.json() if response.content else {}
-        }
+        return self._result(response)
 
     def delete_folder(self, path):
         """
@@ -76,32 +412,177 @@ class YandexDiskAPI:
         url = f"{self.base_url}/resources"
         params = {'path': path, 'permanently': 'true'}
 
-        response = requests.delete(url, headers=self.headers, params=params)
+        response = self._send('delete', url, params)
 
-        return {
-            'status_code': response.status_code,
-            'response': response.json() if response.content else {}
-        }
+        return self._result(response)
 
-    def list_files(self, path="/"):
+    def list_files(self, path="/", limit=None, offset=None, fields=None):
         """
         Получить список файлов и папок
 
         Args:
             path (str): Путь для просмотра
+            limit (int): Количество элементов на странице (по умолчанию - как у API)
+            offset (int): Сколько элементов пропустить
+            fields (list): Поля элементов, которые нужно вернуть (например ['name', 'type'])
 
         Returns:
             dict: Список файлов и папок
         """
         url = f"{self.base_url}/resources"
         params = {'path': path}
+        if limit is not None:
+            params['limit'] = limit
+        if offset:
+            params['offset'] = offset
+        if fields:
+            params['fields'] = ','.join(f'_embedded.items.{field}' for field in fields)
 
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self._send('get', url, params)
 
-        return {
-            'status_code': response.status_code,
-            'response': response.json() if response.content else {}
+        return self._result(response)
+
+    def iter_files(self, path="/", limit=100, fields=None, prefetch=True):
+        """
+        Перебрать элементы папки постранично (limit/offset)
+
+        Элементы выдаются по мере чтения страниц. С prefetch=True следующая
+        страница запрашивается в фоновом потоке, пока вызывающий код
+        обрабатывает текущую.
+
+        Args:
+            path (str): Путь для просмотра
+            limit (int): Размер страницы
+            fields (list): Поля элементов, которые нужно вернуть
+            prefetch (bool): Загружать следующую страницу заранее
+
+        Yields:
+            dict: Элементы _embedded.items
+
+        Raises:
+            requests.HTTPError: Если страница не получена (код ответа не 200)
+        """
+        if not isinstance(limit, int) or limit < 1:
+            raise ValueError("Размер страницы должен быть положительным целым числом")
+
+        def fetch(offset):
+            result = self.list_files(path, limit=limit, offset=offset, fields=fields)
+            if result['status_code'] != 200:
+                raise requests.HTTPError(
+                    f"Не удалось получить список файлов '{path}' (offset={offset}): "
+                    f"{result['status_code']} {result['response'].get('error', '')}".rstrip()
+                )
+            return result['response'].get('_embedded', {}).get('items', [])
+
+        with ThreadPoolExecutor(max_workers=1) if prefetch else nullcontext() as executor:
+            offset = 0
+            items = fetch(offset)
+            while True:
+                # Неполная страница - последняя
+                if len(items) < limit:
+                    yield from items
+                    return
+
+                offset += limit
+                next_items = executor.submit(fetch, offset) if executor is not None else None
+                yield from items
+                items = next_items.result() if next_items is not None else fetch(offset)
+
+
+class AsyncYandexDiskAPI:
+    """
+    Асинхронный клиент API Яндекс.Диска (asyncio + aiohttp)
+
+    Методы те же, что у YandexDiskAPI, и возвращают тот же словарь
+    {'status_code', 'response'}. Одновременно выполняется не больше
+    max_concurrency запросов; соединения переиспользуются одной сессией
+    aiohttp. Используйте как асинхронный контекстный менеджер:
+
+        async with AsyncYandexDiskAPI(token) as api:
+            results = await api.batch(api.create_folder, paths)
+
+    Args:
+        token (str): OAuth-токен
+        max_concurrency (int): Максимум одновременных запросов и соединений
+        base_url (str): Адрес API (для тестов - адрес локального сервера)
+    """
+
+    def __init__(self, token, max_concurrency=10, base_url="https://cloud-api.yandex.net/v1/disk"):
+        if aiohttp is None:
+            raise ImportError("Для AsyncYandexDiskAPI нужен пакет aiohttp")
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            raise ValueError("Количество одновременных запросов должно быть положительным целым числом")
+
+        self.token = token
+        self.base_url = base_url
+        self.headers = {
+            'Authorization': f'OAuth {token}',
+            'Content-Type': 'application/json'
         }
+        self.max_concurrency = max_concurrency
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        self._open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _open(self):
+        """Создать сессию и семафор в текущем цикле событий"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(headers=self.headers, connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def close(self):
+        """Закрыть сессию и все соединения"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request(self, method, params):
+        """Выполнить запрос к /resources с ограничением одновременности"""
+        session = self._open()
+        async with self._semaphore:
+            async with session.request(method, f"{self.base_url}/resources", params=params) as response:
+                body = await response.read()
+                return {
+                    'status_code': response.status,
+                    'response': json.loads(body) if body else {}
+                }
+
+    async def create_folder(self, path):
+        """Создать папку на Яндекс.Диске"""
+        return await self._request('PUT', {'path': path})
+
+    async def get_folder_info(self, path):
+        """Получить информацию о папке"""
+        return await self._request('GET', {'path': path})
+
+    async def delete_folder(self, path):
+        """Удалить папку с Яндекс.Диска"""
+        return await self._request('DELETE', {'path': path, 'permanently': 'true'})
+
+    async def list_files(self, path="/"):
+        """Получить список файлов и папок"""
+        return await self._request('GET', {'path': path})
+
+    async def batch(self, method, paths):
+        """
+        Выполнить метод клиента для каждого пути одновременно
+
+        Args:
+            method: Метод клиента, например api.create_folder
+            paths: Пути к папкам
+
+        Returns:
+            list: Результаты в порядке путей
+        """
+        return await asyncio.gather(*(method(path) for path in paths))
 
 
 class TestYandexDiskAPI(unittest.TestCase):
@@ -114,7 +595,7 @@ class TestYandexDiskAPI(unittest.TestCase):
         self.api = YandexDiskAPI(self.test_token)
         self.test_folder_path = "/test_folder_for_unittest"
 
-    @patch('requests.put')
+    @patch('requests.Session.put')
     def test_create_folder_success(self, mock_put):
         """Тест успешного создания папки"""
         # Мокаем успешный ответ
@@ -142,7 +623,7 @@ class TestYandexDiskAPI(unittest.TestCase):
         called_url = call_args[0][0] if call_args[0] else ""
         self.assertIn('cloud-api.yandex.net', called_url)
 
-    @patch('requests.put')
+    @patch('requests.Session.put')
     def test_create_folder_already_exists(self, mock_put):
         """Тест создания папки, которая уже существует"""
         # Мокаем ответ об ошибке
@@ -164,7 +645,7 @@ class TestYandexDiskAPI(unittest.TestCase):
         self.assertIn('error', result['response'])
         self.assertEqual(result['response']['error'], 'DiskPathPointsToExistentDirectoryError')
 
-    @patch('requests.put')
+    @patch('requests.Session.put')
     def test_create_folder_unauthorized(self, mock_put):
         """Тест создания папки с неправильным токеном"""
         # Мокаем ответ об ошибке авторизации
@@ -186,7 +667,7 @@ class TestYandexDiskAPI(unittest.TestCase):
         self.assertIn('error', result['response'])
         self.assertEqual(result['response']['error'], 'UnauthorizedError')
 
-    @patch('requests.put')
+    @patch('requests.Session.put')
     def test_create_folder_invalid_path(self, mock_put):
         """Тест создания папки с некорректным путем"""
         # Мокаем ответ об ошибке пути
@@ -208,7 +689,7 @@ class TestYandexDiskAPI(unittest.TestCase):
         self.assertIn('error', result['response'])
         self.assertEqual(result['response']['error'], 'DiskPathFormatError')
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_folder_info_success(self, mock_get):
         """Тест успешного получения информации о папке"""
         # Мокаем успешный ответ
@@ -232,7 +713,7 @@ class TestYandexDiskAPI(unittest.TestCase):
         self.assertEqual(result['response']['type'], 'dir')
         self.assertEqual(result['response']['name'], 'test_folder_for_unittest')
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_folder_info_not_found(self, mock_get):
         """Тест получения информации о несуществующей папке"""
         # Мокаем ответ об ошибке
@@ -254,7 +735,7 @@ class TestYandexDiskAPI(unittest.TestCase):
         self.assertIn('error', result['response'])
         self.assertEqual(result['response']['error'], 'DiskNotFoundError')
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_list_files_success(self, mock_get):
         """Тест успешного получения списка файлов"""
         # Мокаем успешный ответ
@@ -302,7 +783,7 @@ class TestYandexDiskAPI(unittest.TestCase):
 
         self.assertTrue(folder_found, "Тестовая папка должна быть в списке файлов")
 
-    @patch('requests.delete')
+    @patch('requests.Session.delete')
     def test_delete_folder_success(self, mock_delete):
         """Тест успешного удаления папки"""
         # Мокаем успешный ответ
@@ -335,6 +816,439 @@ class TestYandexDiskAPI(unittest.TestCase):
         expected_url = "https://cloud-api.yandex.net/v1/disk"
         self.assertEqual(self.api.base_url, expected_url)
 
+    @patch('requests.Session.get')
+    @patch('requests.Session.put')
+    def test_requests_share_session(self, mock_put, mock_get):
+        """Тест: все запросы идут через одну сессию с пулом соединений"""
+        mock_put.return_value = MagicMock(status_code=201, content=False)
+        mock_get.return_value = MagicMock(status_code=200, content=False)
+
+        api = YandexDiskAPI(self.test_token, pool_size=32)
+        adapter = api.session.get_adapter(api.base_url)
+        self.assertIsInstance(adapter, HTTPAdapter)
+        self.assertEqual(adapter._pool_maxsize, 32)
+
+        api.create_folder("/a")
+        api.get_folder_info("/a")
+        api.list_files("/")
+        self.assertEqual(mock_put.call_count, 1)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(api.session.headers['Connection'], 'keep-alive')
+        self.assertEqual(YandexDiskAPI(self.test_token, keep_alive=False).session.headers['Connection'], 'close')
+
+        with self.assertRaises(ValueError):
+            YandexDiskAPI(self.test_token, pool_size=0)
+
+    @patch('requests.Session.close')
+    def test_context_manager_closes_pool(self, mock_close):
+        """Тест закрытия пула соединений при выходе из контекста"""
+        with YandexDiskAPI(self.test_token) as api:
+            self.assertIsInstance(api, YandexDiskAPI)
+            mock_close.assert_not_called()
+        mock_close.assert_called_once()
+
+
+class TestYandexDiskAPIRetries(unittest.TestCase):
+    """Тесты повторов и ограничения частоты запросов"""
+
+    @staticmethod
+    def response(status, headers=None):
+        """Ответ API с пустым телом"""
+        return MagicMock(status_code=status, content=False, headers=headers or {})
+
+    @patch('time.sleep')
+    @patch('requests.Session.put')
+    def test_retries_with_backoff(self, mock_put, mock_sleep):
+        """Тест повторов с экспоненциальной паузой"""
+        mock_put.side_effect = [self.response(503), self.response(429), self.response(201)]
+        api = YandexDiskAPI("test_token_123456", retry=RetryPolicy(backoff=0.5, jitter=False))
+
+        self.assertEqual(api.create_folder("/a")['status_code'], 201)
+        self.assertEqual([call.args[0] for call in mock_sleep.call_args_list], [0.5, 1.0])
+        self.assertEqual(api.get_metrics(), {'requests': 3, 'retries': 2, 'retry_wait': 1.5, 'throttle_wait': 0.0})
+
+    @patch('time.sleep')
+    @patch('requests.Session.get')
+    def test_retry_after_and_exhaustion(self, mock_get, mock_sleep):
+        """Тест заголовка Retry-After и исчерпания попыток"""
+        mock_get.return_value = self.response(429, {'Retry-After': '7'})
+        api = YandexDiskAPI("test_token_123456", retry=RetryPolicy(max_retries=2, max_delay=60))
+
+        self.assertEqual(api.get_folder_info("/a")['status_code'], 429)
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual([call.args[0] for call in mock_sleep.call_args_list], [7.0, 7.0])
+
+        # Ошибки клиента не повторяются
+        mock_get.reset_mock(return_value=True)
+        mock_get.return_value = self.response(404)
+        self.assertEqual(api.get_folder_info("/a")['status_code'], 404)
+        self.assertEqual(mock_get.call_count, 1)
+
+        # Ошибка соединения повторяется, затем пробрасывается
+        mock_get.reset_mock(return_value=True)
+        mock_get.side_effect = requests.ConnectionError("reset")
+        with self.assertRaises(requests.ConnectionError):
+            api.list_files("/")
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(api.get_metrics()['retries'], 4)
+
+    @patch('time.sleep')
+    @patch('requests.Session.delete')
+    @patch('requests.Session.put')
+    def test_unsafe_methods_retry_only_unsent_requests(self, mock_put, mock_delete, mock_sleep):
+        """Тест: PUT и DELETE повторяются, только если сервер точно не выполнил запрос"""
+        api = YandexDiskAPI("test_token_123456", retry=RetryPolicy(max_retries=2, jitter=False))
+
+        # 502 и обрыв после отправки: запрос мог быть выполнен
+        mock_put.return_value = self.response(502)
+        self.assertEqual(api.create_folder("/a")['status_code'], 502)
+        for error in (requests.ConnectionError("reset"), requests.ReadTimeout("read")):
+            mock_delete.side_effect = error
+            with self.assertRaises(type(error)):
+                api.delete_folder("/a")
+        self.assertEqual((mock_put.call_count, mock_delete.call_count), (1, 2))
+
+        # Соединение не установлено: запрос не отправлен и повторяется
+        mock_put.reset_mock(return_value=True)
+        refused = requests.ConnectionError(MagicMock(reason=NewConnectionError(None, "refused")))
+        mock_put.side_effect = [requests.ConnectTimeout("connect"), refused, self.response(201)]
+        self.assertEqual(api.create_folder("/a")['status_code'], 201)
+        self.assertEqual(mock_put.call_count, 3)
+        mock_sleep.assert_called()
+
+    @patch('requests.Session.get')
+    def test_requests_use_timeout(self, mock_get):
+        """Тест: таймаут по умолчанию и заданный передаются в каждый запрос"""
+        mock_get.return_value = self.response(200)
+
+        YandexDiskAPI("test_token_123456").get_folder_info("/a")
+        self.assertEqual(mock_get.call_args[1]['timeout'], DEFAULT_TIMEOUT)
+
+        YandexDiskAPI("test_token_123456", timeout=(1, 2)).get_folder_info("/a")
+        self.assertEqual(mock_get.call_args[1]['timeout'], (1, 2))
+
+    @patch('time.sleep')
+    @patch('requests.Session.get')
+    def test_retry_after_longer_than_max_delay(self, mock_get, mock_sleep):
+        """Тест: Retry-After больше max_delay - ответ возвращается без повторов"""
+        mock_get.return_value = self.response(503, {'Retry-After': '120'})
+        api = YandexDiskAPI("test_token_123456", retry=RetryPolicy(max_retries=3, max_delay=60))
+
+        result = api.get_folder_info("/a")
+
+        self.assertEqual(result['status_code'], 503)
+        self.assertEqual(mock_get.call_count, 1)
+        mock_sleep.assert_not_called()
+        self.assertEqual(api.get_metrics()['retries'], 0)
+
+    def test_retry_delay(self):
+        """Тест расчета паузы: предел, случайная составляющая и дата в Retry-After"""
+        policy = RetryPolicy(backoff=1, max_delay=10)
+        for attempt in range(6):
+            self.assertLessEqual(policy.delay(attempt), min(2 ** attempt, 10))
+        self.assertEqual(RetryPolicy(backoff=1, max_delay=10, jitter=False).delay(5), 10)
+        self.assertEqual(policy.delay(0, '10'), 10)
+        self.assertIsNone(policy.delay(0, '120'))
+        self.assertEqual(policy.delay(0, 'Mon, 01 Jan 2001 00:00:00 GMT'), 0)
+        self.assertLessEqual(policy.delay(0, 'garbage'), 1)
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_retries=-1)
+
+    def test_token_bucket(self):
+        """Тест ограничителя частоты: запас burst, затем rate запросов в секунду"""
+        now = [0.0]
+        waits = []
+
+        def sleep(seconds):
+            waits.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=10, capacity=3, clock=lambda: now[0], sleep=sleep)
+        for _ in range(6):
+            bucket.acquire()
+        self.assertEqual(len(waits), 3)
+        self.assertAlmostEqual(now[0], 0.3)
+
+        now[0] += 10  # простой: ведро наполняется, но не больше capacity
+        for _ in range(3):
+            self.assertEqual(bucket.acquire(), 0)
+        self.assertGreater(bucket.acquire(), 0)
+
+    @patch('requests.Session.put')
+    def test_rate_limit_metrics(self, mock_put):
+        """Тест ограничения частоты запросов клиента"""
+        mock_put.return_value = self.response(201)
+        api = YandexDiskAPI("test_token_123456", rate_limit=100, burst=2)
+
+        started = time.perf_counter()
+        for i in range(6):
+            api.create_folder(f"/f{i}")
+        elapsed = time.perf_counter() - started
+
+        metrics = api.get_metrics()
+        self.assertEqual(metrics['requests'], 6)
+        self.assertGreaterEqual(elapsed, 0.035)
+        self.assertGreater(metrics['throttle_wait'], 0.03)
+
+
+class TestYandexDiskAPITree(unittest.TestCase):
+    """Тесты создания дерева папок"""
+
+    def setUp(self):
+        """Диск, на котором уже есть папка /backup"""
+        self.api = YandexDiskAPI("test_token_123456", pool_size=8, retry=None)
+        self.existing = {'/backup'}
+        self.created = []
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def put_folder(self, url, headers=None, params=None, timeout=None):
+        """Заглушка PUT /resources: 404 без родителя, 409 для существующей папки"""
+        path = params['path']
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+            parent = path.rsplit('/', 1)[0]
+            if path.endswith('broken'):
+                status, body = 500, {'error': 'InternalServerError'}
+            elif parent and parent not in self.existing:
+                status, body = 409, {'error': 'DiskPathDoesntExistsError'}
+            elif path in self.existing:
+                status, body = 409, {'error': 'DiskPathPointsToExistentDirectoryError'}
+            else:
+                self.existing.add(path)
+                self.created.append(path)
+                status, body = 201, {'href': path}
+        return MagicMock(status_code=status, content=True, json=MagicMock(return_value=body))
+
+    @patch('requests.Session.put')
+    def test_create_tree_parent_first(self, mock_put):
+        """Тест порядка создания, существующих папок и пропуска потомков"""
+        mock_put.side_effect = self.put_folder
+        paths = [f'/backup/2024/{month:02d}/photos' for month in range(1, 13)]
+        paths += ['/backup/broken/child', '/docs/']
+
+        results = self.api.create_tree(paths)
+
+        self.assertEqual(results['/backup']['outcome'], 'exists')
+        self.assertEqual(results['/backup/2024']['outcome'], 'created')
+        self.assertEqual(results['/backup/2024/07/photos']['outcome'], 'created')
+        self.assertEqual(results['/docs']['outcome'], 'created')
+        self.assertEqual(results['/backup/broken']['outcome'], 'failed')
+        self.assertEqual(results['/backup/broken']['status_code'], 500)
+        self.assertEqual(results['/backup/broken/child']['outcome'], 'skipped')
+        self.assertEqual(len(results), 2 + 12 * 2 + 2 + 1)
+
+        for path in self.created:
+            parent = path.rsplit('/', 1)[0]
+            self.assertTrue(not parent or parent == '/backup' or self.created.index(parent) < self.created.index(path))
+        self.assertNotIn('/backup/broken/child', [call[1]['params']['path'] for call in mock_put.call_args_list])
+        self.assertEqual({call[1]['timeout'] for call in mock_put.call_args_list}, {DEFAULT_TIMEOUT})
+
+    @patch('requests.Session.put')
+    def test_create_tree_time_scales_with_depth(self, mock_put):
+        """Тест: папки одного уровня создаются параллельно"""
+        mock_put.side_effect = self.put_folder
+        paths = [f'/wide/{i}' for i in range(32)]
+
+        started = time.perf_counter()
+        results = self.api.create_tree(paths)
+        elapsed = time.perf_counter() - started
+
+        self.assertTrue(all(result['outcome'] == 'created' for result in results.values()))
+        self.assertEqual(self.max_in_flight, 8)
+        # 2 уровня: 1 запрос + 32 запроса по 8 одновременно (последовательно было бы 33 * 0.02 с)
+        self.assertLess(elapsed, 33 * 0.02 / 2)
+
+    @patch('requests.Session.put')
+    def test_create_tree_network_error(self, mock_put):
+        """Тест: сетевая ошибка отмечает папку как failed и не прерывает дерево"""
+        def put_folder(url, headers=None, params=None, timeout=None):
+            if params['path'].startswith('/offline'):
+                raise requests.exceptions.ConnectionError("Connection refused")
+            return self.put_folder(url, headers=headers, params=params, timeout=timeout)
+
+        mock_put.side_effect = put_folder
+        results = self.api.create_tree(['/offline/child', '/docs/2024'])
+
+        self.assertEqual(results['/offline']['outcome'], 'failed')
+        self.assertIsNone(results['/offline']['status_code'])
+        self.assertEqual(results['/offline']['response']['error'], 'ConnectionError')
+        self.assertEqual(results['/offline/child']['outcome'], 'skipped')
+        self.assertEqual(results['/docs/2024']['outcome'], 'created')
+
+    @patch('requests.Session.put')
+    def test_create_tree_keeps_path_scheme(self, mock_put):
+        """Тест: префикс disk:/ сохраняется у всех папок пути"""
+        mock_put.return_value = MagicMock(status_code=201, content=True, json=MagicMock(return_value={}))
+
+        results = self.api.create_tree(['disk:/x/y', 'app:/z'])
+
+        self.assertEqual(list(results), ['disk:/x', 'app:/z', 'disk:/x/y'])
+        self.assertTrue(all(result['outcome'] == 'created' for result in results.values()))
+        self.assertEqual(sorted(call[1]['params']['path'] for call in mock_put.call_args_list),
+                         ['app:/z', 'disk:/x', 'disk:/x/y'])
+
+
+class TestYandexDiskAPIPagination(unittest.TestCase):
+    """Тесты постраничного перебора файлов"""
+
+    def setUp(self):
+        """Папка из 250 элементов, отдаваемая страницами"""
+        self.api = YandexDiskAPI("test_token_123456")
+        self.items = [{'name': f'file_{i}.txt', 'type': 'file'} for i in range(250)]
+        self.offsets = []
+        self.second_page_requested = threading.Event()
+
+    def get_page(self, url, headers=None, params=None, timeout=None):
+        """Заглушка GET /resources с limit/offset"""
+        offset = params.get('offset', 0)
+        limit = params.get('limit', 20)
+        self.offsets.append(offset)
+        if offset == params.get('limit'):
+            self.second_page_requested.set()
+        return MagicMock(status_code=200, content=True, json=MagicMock(return_value={
+            'type': 'dir',
+            '_embedded': {'items': self.items[offset:offset + limit], 'limit': limit, 'offset': offset}
+        }))
+
+    @patch('requests.Session.get')
+    def test_iter_files_pages(self, mock_get):
+        """Тест перебора всех страниц и проекции полей"""
+        mock_get.side_effect = self.get_page
+
+        for prefetch in (True, False):
+            self.offsets.clear()
+            names = [item['name'] for item in self.api.iter_files('/big', limit=100, fields=['name'],
+                                                                  prefetch=prefetch)]
+            self.assertEqual(names, [item['name'] for item in self.items])
+            self.assertEqual(self.offsets, [0, 100, 200])
+
+        params = mock_get.call_args[1]['params']
+        self.assertEqual(params['fields'], '_embedded.items.name')
+        self.assertEqual(params['path'], '/big')
+        self.assertEqual(mock_get.call_args[1]['timeout'], DEFAULT_TIMEOUT)
+
+        # Страница ровно из limit элементов требует еще одного запроса
+        self.items = self.items[:200]
+        self.offsets.clear()
+        self.assertEqual(len(list(self.api.iter_files('/big', limit=100))), 200)
+        self.assertEqual(self.offsets, [0, 100, 200])
+
+    @patch('requests.Session.get')
+    def test_iter_files_prefetches_and_stops_early(self, mock_get):
+        """Тест: следующая страница загружается, пока обрабатывается текущая"""
+        mock_get.side_effect = self.get_page
+
+        files = self.api.iter_files('/big', limit=100)
+        self.assertEqual(next(files)['name'], 'file_0.txt')
+        self.assertTrue(self.second_page_requested.wait(1))
+        files.close()
+
+        self.offsets.clear()
+        self.assertEqual(len(list(islice(self.api.iter_files('/big', limit=100, prefetch=False), 5))), 5)
+        self.assertEqual(self.offsets, [0])
+
+    @patch('requests.Session.get')
+    def test_iter_files_error(self, mock_get):
+        """Тест ошибки при получении страницы"""
+        mock_get.return_value = MagicMock(status_code=404, content=True, json=MagicMock(
+            return_value={'error': 'DiskNotFoundError'}
+        ))
+
+        with self.assertRaises(requests.HTTPError) as context:
+            list(self.api.iter_files('/missing'))
+        self.assertIn('DiskNotFoundError', str(context.exception))
+        with self.assertRaises(ValueError):
+            list(self.api.iter_files('/', limit=0))
+
+
+@unittest.skipUnless(aiohttp, "Пропускаем тесты асинхронного клиента: не установлен aiohttp")
+class TestAsyncYandexDiskAPI(unittest.IsolatedAsyncioTestCase):
+    """Тесты асинхронного клиента на локальном сервере-заглушке (без сети)"""
+
+    async def asyncSetUp(self):
+        """Запускаем заглушку API на свободном порту"""
+        self.folders = {'/'}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.peers = set()
+
+        app = web.Application()
+        app.router.add_route('*', '/v1/disk/resources', self.handle_resources)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        self.base_url = f"http://127.0.0.1:{port}/v1/disk"
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+
+    async def handle_resources(self, request):
+        """Заглушка /resources: PUT создает папку, GET читает, DELETE удаляет"""
+        if request.headers.get('Authorization') != 'OAuth test_token':
+            return web.json_response({'error': 'UnauthorizedError'}, status=401)
+
+        self.peers.add(request.transport.get_extra_info('peername'))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            path = request.query['path']
+            if request.method == 'PUT':
+                if path in self.folders:
+                    return web.json_response({'error': 'DiskPathPointsToExistentDirectoryError'}, status=409)
+                self.folders.add(path)
+                return web.json_response({'href': f"{self.base_url}/resources?path={path}"}, status=201)
+            if path not in self.folders:
+                return web.json_response({'error': 'DiskNotFoundError'}, status=404)
+            if request.method == 'DELETE':
+                self.folders.discard(path)
+                return web.Response(status=204)
+            return web.json_response({'name': path.rsplit('/', 1)[-1], 'type': 'dir'})
+        finally:
+            self.in_flight -= 1
+
+    async def test_folder_lifecycle(self):
+        """Тест четырех методов и формы результата"""
+        async with AsyncYandexDiskAPI('test_token', base_url=self.base_url) as api:
+            created = await api.create_folder('/backup')
+            self.assertEqual(created['status_code'], 201)
+            self.assertIn('href', created['response'])
+            self.assertEqual((await api.create_folder('/backup'))['status_code'], 409)
+
+            info = await api.get_folder_info('/backup')
+            self.assertEqual(info, {'status_code': 200, 'response': {'name': 'backup', 'type': 'dir'}})
+            self.assertEqual((await api.list_files())['status_code'], 200)
+
+            self.assertEqual(await api.delete_folder('/backup'), {'status_code': 204, 'response': {}})
+            self.assertEqual((await api.get_folder_info('/backup'))['response']['error'], 'DiskNotFoundError')
+
+        async with AsyncYandexDiskAPI('wrong', base_url=self.base_url) as api:
+            self.assertEqual((await api.create_folder('/x'))['status_code'], 401)
+
+    async def test_batch_is_bounded_and_reuses_connections(self):
+        """Тест ограничения одновременных запросов и переиспользования соединений"""
+        paths = [f'/folder_{i}' for i in range(40)]
+        async with AsyncYandexDiskAPI('test_token', max_concurrency=4, base_url=self.base_url) as api:
+            results = await api.batch(api.create_folder, paths)
+            results += await api.batch(api.delete_folder, paths)
+
+        self.assertEqual([result['status_code'] for result in results], [201] * 40 + [204] * 40)
+        self.assertGreater(self.max_in_flight, 1)
+        self.assertLessEqual(self.max_in_flight, 4)
+        self.assertLessEqual(len(self.peers), 4)
+        self.assertEqual(self.folders, {'/'})
+
+        with self.assertRaises(ValueError):
+            AsyncYandexDiskAPI('test_token', max_concurrency=0)
+
 
 class TestYandexDiskAPIIntegration(unittest.TestCase):
     """Интеграционные тесты для API (требуют настоящий токен)"""
@@ -391,6 +1305,10 @@ def run_api_tests():
     # Добавляем юнит-тесты (с моками)
     unit_tests = unittest.TestLoader().loadTestsFromTestCase(TestYandexDiskAPI)
     test_suite.addTests(unit_tests)
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestYandexDiskAPIRetries))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestYandexDiskAPITree))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestYandexDiskAPIPagination))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestAsyncYandexDiskAPI))
 
     # Добавляем интеграционные тесты (только если есть токен)
     if os.environ.get('YANDEX_DISK_TOKEN'):